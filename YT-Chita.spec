@@ -63,8 +63,8 @@ a = Analysis(
         'clr', 'pythonnet',
         'webview', 'yt_dlp', 'httptools', 'h11', 'python_multipart', 'multipart',
         'email.mime.multipart', 'email.mime.text', 'email.mime.message',
-        'typing_extensions', 'aiofiles', 'requests', 'charset_normalizer', 'httplib2',
-        'google.auth', 'google.auth.transport.requests', 'google_auth_oauthlib', 'googleapiclient', 'googleapiclient.discovery'
+        'typing_extensions', 'aiofiles', 'requests', 'charset_normalizer',
+        'httpx', 'httpcore', 'h2', 'hpack', 'hyperframe'
     ] + (['AppKit', 'Foundation', 'WebKit', 'objc', 'PyObjCTools'] if is_macos else []),
     hookspath=[],
     hooksconfig={},
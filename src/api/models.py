@@ -31,6 +31,57 @@ class DownloadExtractRequest(BaseModel):
     playlist_name: Optional[str] = Field(default=None, description="Playlist name for folder structure")
 
 
+class DownloadJobItem(BaseModel):
+    """Single video in a download job"""
+    video_id: str = Field(..., description="YouTube video ID")
+    title: Optional[str] = Field(default=None, description="Video title (for display)")
+    channel_name: Optional[str] = Field(default=None, description="Channel name for folder structure")
+    playlist_name: Optional[str] = Field(default=None, description="Playlist name for folder structure")
+    duration: Optional[int] = Field(default=None, description="Video length in seconds (for shortest-first scheduling)")
+    priority: Optional[int] = Field(default=None, description="Item priority, overrides the job priority")
+
+
+class DownloadJobRequest(BaseModel):
+    """Request to submit a batch of videos to the server-side download queue"""
+    items: List[DownloadJobItem] = Field(..., description="Videos to download, in order")
+    quality: str = Field(default="720p", description="Preferred quality (360p, 720p, 1080p, audio)")
+    priority: int = Field(default=0, description="Job priority (higher runs first, under every policy)")
+
+
+class SchedulingRequest(BaseModel):
+    """Request to change the download scheduling policy"""
+    policy: str = Field(..., description="fifo, shortest or fair")
+
+
+class DeadLetterRetryRequest(BaseModel):
+    """Request to retry dead-lettered download items"""
+    ids: Optional[List[int]] = Field(default=None, description="Dead-letter IDs to retry (omit for all)")
+
+
+class SubscriptionRequest(BaseModel):
+    """Request to register a channel or playlist for automatic sync"""
+    url: str = Field(..., description="YouTube channel or playlist URL")
+    quality: str = Field(default="720p", description="Quality for new uploads (360p, 720p, 1080p, audio, best)")
+    include_shorts: bool = Field(default=False, description="Include Shorts (≤180s)")
+    interval_hours: Optional[float] = Field(default=None, gt=0, description="Hours between syncs (default: 24)")
+    max_videos: Optional[int] = Field(default=None, ge=1, description="Maximum videos fetched per sync")
+
+
+class SubscriptionUpdateRequest(BaseModel):
+    """Request to change a subscription's settings (omitted fields are kept)"""
+    quality: Optional[str] = None
+    include_shorts: Optional[bool] = None
+    interval_hours: Optional[float] = Field(default=None, gt=0)
+    max_videos: Optional[int] = Field(default=None, ge=1)
+    enabled: Optional[bool] = None
+
+
+class BandwidthRequest(BaseModel):
+    """Request to change bandwidth limits at runtime"""
+    limit: int = Field(default=0, ge=0, description="Total cap for all downloads in bytes/s (0 = unlimited)")
+    per_download_limit: int = Field(default=0, ge=0, description="Cap for each download in bytes/s (0 = unlimited)")
+
+
 # Response Models
 
 class VideoInfo(BaseModel):
@@ -127,6 +178,14 @@ class APIKeyResponse(BaseModel):
     message: str
 
 
+class BandwidthResponse(BaseModel):
+    """Current bandwidth limits"""
+    success: bool
+    limit: int = 0
+    per_download_limit: int = 0
+    message: Optional[str] = None
+
+
 class ErrorResponse(BaseModel):
     """Error response"""
     success: bool = False
@@ -4,9 +4,12 @@ API Routes
 FastAPI route handlers for all endpoints
 """
 
+import functools
 import logging
-from collections import Counter
-from fastapi import APIRouter, HTTPException
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 import asyncio
 import json
@@ -15,16 +18,25 @@ from .models import (
     ChannelAnalyzeRequest, ChannelAnalyzeResponse,
     PlaylistAnalyzeRequest, PlaylistAnalyzeResponse,
     DownloadExtractRequest, DownloadExtractResponse,
+    DownloadJobRequest, DeadLetterRetryRequest,
+    SubscriptionRequest, SubscriptionUpdateRequest,
     HealthResponse, UpdateResponse, ErrorResponse,
     APIKeyRequest, APIKeyResponse,
+    BandwidthRequest, BandwidthResponse, SchedulingRequest,
     VideoInfo, PlaylistInfo
 )
 from services.youtube_api import YouTubeAPIService
+from services.analyzer import SourceAnalyzer
+from services.bandwidth import BandwidthLimiter
 from services.downloader import YTBulkDownloader
 from services.duplicate_filter import DuplicateFilter
+from services.download_queue import DownloadJobQueue, download_with_archive
+from services.job_store import JobStore
+from services.subscription_store import SubscriptionStore
+from services.subscription_sync import SubscriptionSyncer
+from services.process_executor import ProcessDownloadExecutor
 from services.updater import YtdlpUpdater
 from utils.config import Config
-from utils.validators import is_valid_youtube_url, normalize_input, extract_video_id, extract_playlist_id
 from utils.key_manager import load_api_key_from_file, save_api_key_to_file, delete_api_key_from_file
 
 logger = logging.getLogger(__name__)
@@ -33,9 +45,16 @@ router = APIRouter(prefix="/api")
 
 # Service instances (will be initialized with API key)
 youtube_service: YouTubeAPIService = None
-downloader = YTBulkDownloader()
+bandwidth_limiter = BandwidthLimiter(Config.BANDWIDTH_LIMIT, Config.PER_DOWNLOAD_BANDWIDTH_LIMIT)
+downloader = YTBulkDownloader(bandwidth_limiter=bandwidth_limiter)
 duplicate_filter = DuplicateFilter()
 updater = YtdlpUpdater()
+# "process" 모드: yt-dlp 작업을 워커 프로세스 풀에서 실행 (GIL 분리)
+download_executor = ProcessDownloadExecutor(downloader) if Config.DOWNLOAD_EXECUTOR == "process" else downloader
+# 작업 DB는 open_stores()에서 연결 (import만으로 DOWNLOADS_DIR에 DB 파일이 생기지 않도록)
+download_queue = DownloadJobQueue(downloader, duplicate_filter, executor=download_executor)
+# 채널/재생목록 분석 전용 스레드 풀 (이벤트 루프 밖에서 실행)
+analysis_executor = ThreadPoolExecutor(max_workers=Config.ANALYSIS_WORKERS, thread_name_prefix="analysis")
 
 
 def initialize_services(api_key: str = None):
@@ -52,6 +71,47 @@ def initialize_services(api_key: str = None):
         logger.warning("YouTube API key not set - some features will be limited")
 
 
+def _analyzer() -> SourceAnalyzer:
+    """Analyzer bound to the current API client (the key can change at runtime)"""
+    return SourceAnalyzer(youtube_service, downloader, duplicate_filter)
+
+
+async def _run_analysis(func, *args):
+    """
+    Run an analysis on the dedicated analysis pool
+
+    API paging, yt-dlp extraction and archive/file checks are blocking; on
+    the event loop a large channel would stall progress streams and
+    /api/health for the whole analysis. A separate pool also keeps analyses
+    from competing with download threads for asyncio's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(analysis_executor, functools.partial(func, *args))
+
+
+# 구독 채널/재생목록 자동 동기화 (서버 시작 시 스케줄러 시작)
+subscription_syncer = SubscriptionSyncer(None, download_queue, _analyzer)
+
+
+def open_stores():
+    """Open the job and subscription databases (server startup, before the queue starts)"""
+    if download_queue.store is None:
+        download_queue.store = JobStore()
+    if subscription_syncer.store is None:
+        subscription_syncer.store = SubscriptionStore()
+
+
+def _video_infos(videos) -> list:
+    return [
+        VideoInfo(
+            id=v['id'],
+            title=v['title'],
+            published_at=v.get('publishedAt')
+        )
+        for v in videos
+    ]
+
+
 @router.get("/settings", response_model=APIKeyResponse)
 async def get_settings():
     """Get current settings (API key status)"""
@@ -105,10 +165,44 @@ async def delete_api_key():
     )
 
 
+@router.get("/settings/bandwidth", response_model=BandwidthResponse)
+async def get_bandwidth():
+    """Get current bandwidth limits (bytes/s, 0 = unlimited)"""
+    return BandwidthResponse(success=True, **bandwidth_limiter.get_limits())
+
+
+@router.post("/settings/bandwidth", response_model=BandwidthResponse)
+async def set_bandwidth(request: BandwidthRequest):
+    """Change bandwidth limits at runtime — applies to running downloads immediately"""
+    bandwidth_limiter.set_limits(request.limit, request.per_download_limit)
+    return BandwidthResponse(
+        success=True,
+        message="대역폭 제한이 변경되었습니다.",
+        **bandwidth_limiter.get_limits()
+    )
+
+
+@router.get("/settings/scheduling")
+async def get_scheduling():
+    """Get download scheduling policy and queue depth per priority"""
+    return {"success": True, **download_queue.get_scheduler_status()}
+
+
+@router.post("/settings/scheduling")
+async def set_scheduling(request: SchedulingRequest):
+    """Change download scheduling policy (fifo / shortest / fair); queued items are reordered"""
+    try:
+        download_queue.set_policy(request.policy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, **download_queue.get_scheduler_status()}
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    ytdlp_version = updater.get_current_version()
+    # yt-dlp 버전 확인은 하위 프로세스 실행 → 이벤트 루프 밖에서
+    ytdlp_version = await asyncio.to_thread(updater.get_current_version)
 
     return HealthResponse(
         status="healthy",
@@ -121,7 +215,7 @@ async def health_check():
 @router.post("/updater/check", response_model=UpdateResponse)
 async def check_update():
     """Check for yt-dlp updates"""
-    current = updater.get_current_version()
+    current = await asyncio.to_thread(updater.get_current_version)
 
     return UpdateResponse(
         success=True,
@@ -133,7 +227,7 @@ async def check_update():
 @router.post("/updater/update", response_model=UpdateResponse)
 async def perform_update():
     """Update yt-dlp to latest version"""
-    success, message = updater.check_and_update()
+    success, message = await asyncio.to_thread(updater.check_and_update)
 
     return UpdateResponse(
         success=success,
@@ -155,289 +249,52 @@ async def analyze_channel(request: ChannelAnalyzeRequest):
     4. Check for already downloaded files
     5. Return analysis results
     """
-    # Normalize and validate URL
-    request.url = normalize_input(request.url)
-    if not is_valid_youtube_url(request.url):
-        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
-
     try:
-        channel_id = None
-        channel_name = ''
-        videos = []
-        use_fallback = not youtube_service
-
-        if not use_fallback:
-            # Try YouTube Data API first
-            channel_id = youtube_service.extract_channel_id(request.url)
-
-            if not channel_id:
-                # Extract username and fetch channel ID
-                username = youtube_service.extract_username(request.url)
-                if username:
-                    channel_id = youtube_service.get_channel_id_from_username(username)
-
-            if channel_id:
-                channel_name = youtube_service.get_channel_title(channel_id) or channel_id
-                logger.info(f"Analyzing channel via API: {channel_id} ({channel_name})")
-                videos = youtube_service.get_channel_videos(channel_id, request.max_videos)
-            else:
-                use_fallback = True
-
-        if use_fallback:
-            # Fallback to yt-dlp
-            logger.info(f"Using yt-dlp fallback for channel analysis: {request.url}")
-            videos, channel_meta = downloader.get_channel_videos(request.url, request.max_videos)
-            channel_name = channel_meta.get('channel', '')
-
-            # Extract channel_id from URL for download path
-            channel_id = YouTubeAPIService.extract_channel_id(request.url) or YouTubeAPIService.extract_username(request.url) or "unknown_channel"
-
-        if not videos:
+        result = await _run_analysis(
+            _analyzer().analyze_channel, request.url, request.max_videos, request.include_shorts
+        )
+
+        if not result['total_videos']:
             return ChannelAnalyzeResponse(
                 success=True,
-                channel_id=channel_id,
+                channel_id=result['channel_id'],
                 message="No videos found in channel"
             )
 
-        # 멤버십 전용 영상 필터링 (availability 필드 + 제목 키워드)
-        membership_avail = {'subscriber_only', 'needs_auth', 'premium_only'}
-        membership_title_kw = ['멤버십', '멤버쉽', '회원 전용', 'membership', 'members only']
-        videos = [
-            v for v in videos
-            if (v.get('availability') or '') not in membership_avail
-            and not any(kw in (v.get('title') or '').lower() for kw in membership_title_kw)
-        ]
-
-        # Filter Shorts (≤180s) when using API and include_shorts is False
-        if not request.include_shorts and not use_fallback:
-            videos = [v for v in videos if (v.get('duration') or 999) > 180]
-
-        total_videos = len(videos)
-
-        # Deduplicate
-        videos = duplicate_filter.deduplicate_video_ids(videos)
-        unique_videos = len(videos)
-        duplicates_removed = total_videos - unique_videos
-
-        # Check for already downloaded
-        safe_channel_name = channel_name or channel_id or "Unknown Channel"
-        download_path = Config.get_download_path(safe_channel_name)
-        videos = duplicate_filter.filter_already_downloaded(videos, str(download_path))
-        to_download = len(videos)
-        already_downloaded = unique_videos - to_download
-
-        # Convert to response format
-        video_infos = [
-            VideoInfo(
-                id=v['id'],
-                title=v['title'],
-                published_at=v.get('publishedAt')
-            )
-            for v in videos
-        ]
-
-        # Get playlists if requested (only with API)
-        playlists = []
-
-        source = "yt-dlp" if use_fallback else "YouTube API"
         return ChannelAnalyzeResponse(
             success=True,
-            channel_id=channel_id,
-            channel_name=channel_name or None,
-            total_videos=total_videos,
-            unique_videos=unique_videos,
-            duplicates_removed=duplicates_removed,
-            already_downloaded=already_downloaded,
-            to_download=to_download,
-            videos=video_infos,
-            playlists=playlists,
-            message=f"Found {to_download} videos to download (via {source})"
+            channel_id=result['channel_id'],
+            channel_name=result['channel_name'],
+            total_videos=result['total_videos'],
+            unique_videos=result['unique_videos'],
+            duplicates_removed=result['duplicates_removed'],
+            already_downloaded=result['already_downloaded'],
+            to_download=result['to_download'],
+            videos=_video_infos(result['videos']),
+            playlists=[],
+            message=f"Found {result['to_download']} videos to download (via {result['source']})"
         )
 
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error analyzing channel: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-
 @router.post("/channel/playlists/analyze", response_model=ChannelAnalyzeResponse)
 async def analyze_channel_playlists(request: ChannelAnalyzeRequest):
     """Analyze a YouTube channel's playlists and get all videos grouped by playlist"""
-    request.url = normalize_input(request.url)
-    if not is_valid_youtube_url(request.url):
-        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
-
     try:
-        channel_id = None
-        channel_name = ''
-        videos_list = []
-        use_fallback = not youtube_service
-
-        if not use_fallback:
-            channel_id = youtube_service.extract_channel_id(request.url)
-            if not channel_id:
-                username = youtube_service.extract_username(request.url)
-                if username:
-                    channel_id = youtube_service.get_channel_id_from_username(username)
-            
-            if channel_id:
-                channel_name = youtube_service.get_channel_title(channel_id) or channel_id
-                logger.info(f"Analyzing channel playlists via API: {channel_id} ({channel_name})")
-                # Fetch all playlists
-                playlists = youtube_service.get_channel_playlists(channel_id)
-
-                # 멤버십 전용 재생목록 필터링
-                membership_keywords = ['멤버십', '멤버쉽', 'membership', 'members only', 'members-only']
-                playlists = [
-                    pl for pl in playlists
-                    if not any(kw in pl['title'].lower() for kw in membership_keywords)
-                ]
-
-                # 같은 이름 재생목록 → 상위 폴더/하위 번호 폴더 구조
-                name_counts = Counter(pl['title'] for pl in playlists)
-                name_indices = {}
-                for pl in playlists:
-                    name = pl['title']
-                    if name_counts[name] > 1:
-                        idx = name_indices.get(name, 0) + 1
-                        name_indices[name] = idx
-                        pl['folder_name'] = f"{name}/{name} ({idx})"
-                    else:
-                        pl['folder_name'] = name
-
-                for pl in playlists:
-                    pl_videos = youtube_service.get_playlist_videos(pl['id'], request.max_videos)
-                    for v in pl_videos:
-                        videos_list.append({
-                            'id': v['id'],
-                            'title': v['title'],
-                            'publishedAt': v.get('publishedAt'),
-                            'playlist_name': pl['folder_name']
-                        })
-            else:
-                use_fallback = True
-
-        if use_fallback:
-            # Fallback for playlists is complex with yt-dlp, we will try to use yt-dlp on the /playlists URL directly
-            # which usually yields playlists. Then we extract videos.
-            logger.info(f"Using yt-dlp fallback for channel playlists analysis: {request.url}")
-            
-            import yt_dlp
-            import re as _re
-            # Make sure url ends with /playlists
-            url = request.url.rstrip('/')
-            if not url.endswith('/playlists'):
-                if url.endswith('/videos'):
-                    url = url[:-7]
-                url += '/playlists'
-
-            # 비-ASCII 핸들(@한글이름) → channel ID로 변환
-            _handle_match = _re.search(r'/@([^/]+)', url)
-            if _handle_match:
-                _handle = _handle_match.group(1)
-                if any(ord(c) > 127 for c in _handle):
-                    _cid = downloader._resolve_handle_to_channel_id(_handle)
-                    if _cid:
-                        url = f"https://www.youtube.com/channel/{_cid}/playlists"
-                        logger.info(f"Resolved non-ASCII handle @{_handle} → {_cid}")
-                
-            ydl_opts = {'quiet': True, 'extract_flat': True}
-            try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    channel_name = info.get('channel', '') or info.get('uploader', '')
-                    channel_id = info.get('channel_id', 'unknown_channel')
-                    
-                    entries = list(info.get('entries', []))
-
-                    # 멤버십 전용 재생목록 필터링
-                    membership_keywords = ['멤버십', '멤버쉽', 'membership', 'members only', 'members-only']
-                    entries = [
-                        e for e in entries
-                        if e and not any(kw in (e.get('title') or '').lower() for kw in membership_keywords)
-                    ]
-
-                    # 같은 이름 재생목록 → 상위 폴더/하위 번호 폴더 구조
-                    pl_titles = [e.get('title', 'Unknown Playlist') for e in entries if e]
-                    fb_name_counts = Counter(pl_titles)
-                    fb_name_indices = {}
-
-                    for pl_entry in entries:
-                        if not pl_entry:
-                            continue
-                        pl_title = pl_entry.get('title', 'Unknown Playlist')
-                        if fb_name_counts[pl_title] > 1:
-                            idx = fb_name_indices.get(pl_title, 0) + 1
-                            fb_name_indices[pl_title] = idx
-                            folder_name = f"{pl_title}/{pl_title} ({idx})"
-                        else:
-                            folder_name = pl_title
-
-                        pl_url = pl_entry.get('url')
-                        if pl_url:
-                            pl_info = ydl.extract_info(pl_url, download=False)
-                            for v_entry in pl_info.get('entries', []):
-                                if v_entry and v_entry.get('id'):
-                                    # 개별 영상 멤버십 필터 (yt-dlp availability 필드)
-                                    avail = (v_entry.get('availability') or '').lower()
-                                    if avail in ('subscriber_only', 'needs_auth', 'premium_only'):
-                                        logger.info(f"Skipping membership video: {v_entry.get('title')} ({avail})")
-                                        continue
-                                    videos_list.append({
-                                        'id': v_entry['id'],
-                                        'title': v_entry.get('title', 'Unknown'),
-                                        'playlist_name': folder_name
-                                    })
-            except Exception as e:
-                logger.error(f"yt-dlp fallback failed for playlists: {e}")
-
-        if not videos_list:
+        result = await _run_analysis(_analyzer().analyze_channel_playlists, request.url, request.max_videos)
+
+        if not result['total_videos']:
             return ChannelAnalyzeResponse(
                 success=True,
-                channel_id=channel_id,
+                channel_id=result['channel_id'],
                 message="No playlist videos found"
             )
 
-        total_videos = len(videos_list)
-
-        # Deduplicate - wait, we might have same video in multiple playlists. 
-        # If user wants them in separate folders, we SHOULD NOT deduplicate across playlists, 
-        # or we only deduplicate exact same video in the exact same playlist.
-        # Let's deduplicate by (id, playlist_name)
-        unique_vids = []
-        seen = set()
-        for v in videos_list:
-            key = (v['id'], v.get('playlist_name', ''))
-            if key not in seen:
-                seen.add(key)
-                unique_vids.append(v)
-                
-        videos_list = unique_vids
-        unique_videos = len(videos_list)
-        duplicates_removed = total_videos - unique_videos
-
-        # Check for already downloaded
-        to_download_vids = []
-        already_downloaded = 0
-        from utils.config import Config
-        for v in videos_list:
-            safe_chan = channel_name or channel_id or "Unknown Channel"
-            safe_pl = v.get('playlist_name') or "Unknown Playlist"
-            download_path = Config.get_download_path(safe_chan, safe_pl)
-            
-            # Check if file exists (duplicate_filter logic for single file)
-            # Actually DuplicateFilter expects a list of IDs. We can check manually or use filter.
-            # It's easier to use the filter per video.
-            res = duplicate_filter.filter_already_downloaded([v], str(download_path))
-            if res:
-                to_download_vids.append(v)
-            else:
-                already_downloaded += 1
-                
-        to_download = len(to_download_vids)
-
         video_infos = [
             VideoInfo(
                 id=v['id'],
@@ -445,25 +302,24 @@ async def analyze_channel_playlists(request: ChannelAnalyzeRequest):
                 published_at=v.get('publishedAt'),
                 playlist_name=v.get('playlist_name')
             )
-            for v in to_download_vids
+            for v in result['videos']
         ]
 
-        source = "yt-dlp" if use_fallback else "YouTube API"
         return ChannelAnalyzeResponse(
             success=True,
-            channel_id=channel_id,
-            channel_name=channel_name or None,
-            total_videos=total_videos,
-            unique_videos=unique_videos,
-            duplicates_removed=duplicates_removed,
-            already_downloaded=already_downloaded,
-            to_download=to_download,
+            channel_id=result['channel_id'],
+            channel_name=result['channel_name'],
+            total_videos=result['total_videos'],
+            unique_videos=result['unique_videos'],
+            duplicates_removed=result['duplicates_removed'],
+            already_downloaded=result['already_downloaded'],
+            to_download=result['to_download'],
             videos=video_infos,
-            message=f"Found {to_download} videos to download (via {source})"
+            message=f"Found {result['to_download']} videos to download (via {result['source']})"
         )
 
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error analyzing channel playlists: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -472,48 +328,24 @@ async def analyze_channel_playlists(request: ChannelAnalyzeRequest):
 @router.post("/video/analyze", response_model=ChannelAnalyzeResponse)
 async def analyze_video(request: PlaylistAnalyzeRequest):
     """Analyze a single YouTube video URL — returns 1 video, saved to channel root folder"""
-    request.url = normalize_input(request.url)
-    if not is_valid_youtube_url(request.url):
-        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
-
     try:
-        video_id = extract_video_id(request.url)
-        if not video_id:
-            raise HTTPException(status_code=400, detail="동영상 ID를 추출할 수 없습니다.")
-
-        # yt-dlp로 영상 정보 가져오기
-        info = await asyncio.to_thread(downloader.get_video_info, video_id)
-        if not info:
-            raise HTTPException(status_code=404, detail="영상을 찾을 수 없습니다.")
-
-        channel_name = info.get('uploader', '') or 'Unknown Channel'
-
-        # 이미 다운로드 여부 확인 (채널 루트 폴더)
-        download_path = Config.get_download_path(channel_name)
-        remaining = duplicate_filter.filter_already_downloaded(
-            [{'id': video_id, 'title': info['title']}], str(download_path)
-        )
-        # remaining: 아직 다운로드 안 된 영상 목록 (0개면 이미 받음, 1개면 미다운로드)
-        to_download = len(remaining)
-        already_downloaded = 1 - to_download
-
-        video_infos = [
-            VideoInfo(id=video_id, title=info['title'])
-        ] if remaining else []
+        result = await _run_analysis(_analyzer().analyze_video, request.url)
 
         return ChannelAnalyzeResponse(
             success=True,
-            channel_name=channel_name,
+            channel_name=result['channel_name'],
             total_videos=1,
             unique_videos=1,
-            already_downloaded=already_downloaded,
-            to_download=to_download,
-            videos=video_infos,
+            already_downloaded=result['already_downloaded'],
+            to_download=result['to_download'],
+            videos=[VideoInfo(id=v['id'], title=v['title']) for v in result['videos']],
             message=f"단일 영상 분석 완료"
         )
 
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error analyzing video: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -522,82 +354,32 @@ async def analyze_video(request: PlaylistAnalyzeRequest):
 @router.post("/playlist/analyze", response_model=PlaylistAnalyzeResponse)
 async def analyze_playlist(request: PlaylistAnalyzeRequest):
     """Analyze a YouTube playlist"""
-    request.url = normalize_input(request.url)
-    if not is_valid_youtube_url(request.url):
-        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
-
     try:
-        playlist_id = extract_playlist_id(request.url)
-        videos = []
-        playlist_meta = {}
-        use_fallback = not youtube_service
+        result = await _run_analysis(_analyzer().analyze_playlist, request.url, request.max_videos)
 
-        if not use_fallback:
-            try:
-                videos = youtube_service.get_playlist_videos(playlist_id, request.max_videos)
-                info = youtube_service.get_playlist_info(playlist_id)
-                if info:
-                    playlist_meta['playlist_title'] = info.get('title', '')
-                    playlist_meta['channel'] = info.get('channelTitle', '')
-            except Exception as e:
-                logger.warning(f"API playlist fetch failed, falling back to yt-dlp: {e}")
-                use_fallback = True
-
-        if use_fallback:
-            logger.info(f"Using yt-dlp fallback for playlist analysis: {request.url}")
-            videos, playlist_meta = downloader.get_playlist_videos(request.url, request.max_videos)
-
-        playlist_name = playlist_meta.get('playlist_title', '')
-        channel_name = playlist_meta.get('channel', '')
-
-        if not videos:
+        if not result['total_videos']:
             return PlaylistAnalyzeResponse(
                 success=True,
-                playlist_id=playlist_id,
+                playlist_id=result['playlist_id'],
                 message="No videos found in playlist"
             )
 
-        total_videos = len(videos)
-
-        # Deduplicate
-        videos = duplicate_filter.deduplicate_video_ids(videos)
-        unique_videos = len(videos)
-        duplicates_removed = total_videos - unique_videos
-
-        # Check for already downloaded
-        safe_channel_name = channel_name or "Unknown Channel"
-        safe_playlist_name = playlist_name or playlist_id or "Unknown Playlist"
-        download_path = Config.get_download_path(safe_channel_name, safe_playlist_name)
-        videos = duplicate_filter.filter_already_downloaded(videos, str(download_path))
-        to_download = len(videos)
-        already_downloaded = unique_videos - to_download
-
-        video_infos = [
-            VideoInfo(
-                id=v['id'],
-                title=v['title'],
-                published_at=v.get('publishedAt')
-            )
-            for v in videos
-        ]
-
-        source = "yt-dlp" if use_fallback else "YouTube API"
         return PlaylistAnalyzeResponse(
             success=True,
-            playlist_id=playlist_id,
-            playlist_name=playlist_name or None,
-            channel_name=channel_name or None,
-            total_videos=total_videos,
-            unique_videos=unique_videos,
-            duplicates_removed=duplicates_removed,
-            already_downloaded=already_downloaded,
-            to_download=to_download,
-            videos=video_infos,
-            message=f"Found {to_download} videos to download (via {source})"
+            playlist_id=result['playlist_id'],
+            playlist_name=result['playlist_name'],
+            channel_name=result['channel_name'],
+            total_videos=result['total_videos'],
+            unique_videos=result['unique_videos'],
+            duplicates_removed=result['duplicates_removed'],
+            already_downloaded=result['already_downloaded'],
+            to_download=result['to_download'],
+            videos=_video_infos(result['videos']),
+            message=f"Found {result['to_download']} videos to download (via {result['source']})"
         )
 
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error analyzing playlist: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -623,28 +405,139 @@ async def get_download_progress():
     return next(iter(all_prog.values()), {})
 
 
-@router.post("/download/reset-cancel")
-async def reset_cancel():
-    """배치 시작 전 취소 플래그 초기화 + 잔여 임시파일 정리"""
-    downloader.reset_cancel()
-    # 이전 강제 종료로 남은 임시파일 정리 (배치 시작 전 1회, 재귀)
+def _sse_event(event: str, data) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _progress_event_stream(request: Request, job_id: Optional[str]):
+    """
+    Push progress deltas for all active downloads over one connection
+
+    - 'progress' event: {video_id: progress} for entries changed since last push
+    - 'job' event: job status + {index: {status, reason, total}} for changed items
+    The first push after connecting contains the full state, so a reconnecting
+    EventSource resyncs automatically. Pushes are throttled to
+    Config.PROGRESS_STREAM_INTERVAL regardless of the number of workers.
+    """
+    sent_progress = {}
+    sent_items = []
+    last_progress_seq = -1
+    last_job_seq = -1
+    last_push = time.monotonic()
+
+    while not await request.is_disconnected():
+        job_state = None
+        job_videos = None
+        if job_id:
+            job_state = download_queue.get_job_state(job_id)
+            if job_state is None:
+                yield _sse_event('error', {'message': '작업을 찾을 수 없습니다.'})
+                return
+            job_videos = {vid for vid, _, _ in job_state['items']}
+
+        # 작업 항목 상태 변경분
+        if job_state and job_state['seq'] != last_job_seq:
+            last_job_seq = job_state['seq']
+            changed_items = {}
+            for index, (vid, status, reason) in enumerate(job_state['items']):
+                if index < len(sent_items) and sent_items[index] == (vid, status, reason):
+                    continue
+                entry = {'status': status, 'reason': reason}
+                if status == 'done':
+                    entry['total'] = downloader.get_progress(vid).get('total')
+                changed_items[index] = entry
+            sent_items = job_state['items']
+            last_push = time.monotonic()
+            yield _sse_event('job', {'id': job_id, 'status': job_state['status'], 'items': changed_items})
+            if job_state['status'] in ('completed', 'cancelled'):
+                return
+
+        # 진행률 변경분
+        progress_seq = downloader.get_progress_seq()
+        if progress_seq != last_progress_seq:
+            last_progress_seq = progress_seq
+            changed = {
+                vid: prog for vid, prog in downloader.get_progress().items()
+                if (job_videos is None or vid in job_videos) and sent_progress.get(vid) != prog
+            }
+            if changed:
+                sent_progress.update(changed)
+                last_push = time.monotonic()
+                yield _sse_event('progress', changed)
+
+        if time.monotonic() - last_push >= Config.PROGRESS_STREAM_KEEPALIVE:
+            last_push = time.monotonic()
+            yield ": keep-alive\n\n"
+
+        await asyncio.sleep(Config.PROGRESS_STREAM_INTERVAL)
+
+
+@router.get("/download/stream")
+async def stream_download_progress(request: Request, job_id: Optional[str] = None):
+    """
+    Server-Sent Events stream of download progress
+
+    One multiplexed connection replaces per-video progress polling.
+    Pass job_id to receive only that job's items plus job status updates.
+    """
+    return StreamingResponse(
+        _progress_event_stream(request, job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/download/concurrency")
+async def get_download_concurrency():
+    """Current concurrent-download target and the reason for each change"""
+    return download_queue.controller.get_status()
+
+
+@router.get("/download/pipeline")
+async def get_download_pipeline():
+    """Occupancy of each pipeline stage (extract / transfer / post-process)"""
+    return download_queue.get_pipeline_status()
+
+
+def _cleanup_temp_files():
+    """Remove leftover workspaces and temp files under the downloads folder (blocking)"""
     import glob as _glob
     import os as _os
     base = str(Config.DOWNLOADS_DIR)
+    # 이전 강제 종료로 남은 작업 폴더 정리 (진행 중·대기·재시도 예정 항목의 작업 폴더는 유지)
+    downloader.cleanup_stale_workspaces(base, keep=download_queue.get_unfinished_video_ids())
+    # 작업 폴더 도입 이전 버전이 출력 폴더에 직접 남긴 임시파일
     for pattern in ('**/*.part', '**/*.ytdl', '**/*.part-Frag*'):
         for f in _glob.glob(_os.path.join(base, pattern), recursive=True):
             try:
                 _os.remove(f)
             except OSError:
                 pass
-    return {"success": True, "message": "취소 플래그 초기화됨"}
+
+
+@router.post("/download/reset-cancel")
+async def reset_cancel():
+    """배치 시작 전 잔여 임시파일 정리 (취소 토큰은 다운로드별로 생성되므로 초기화 불필요)"""
+    # 다운로드 폴더 전체를 훑으므로 이벤트 루프 밖에서 실행 (진행률 스트림이 멈추지 않도록)
+    await asyncio.to_thread(_cleanup_temp_files)
+    return {"success": True, "message": "임시파일 정리됨"}
 
 
 @router.post("/download/cancel")
 async def cancel_download():
-    """현재 진행 중인 다운로드를 즉시 취소"""
-    downloader.request_cancel()
-    return {"success": True, "message": "다운로드 중단 요청됨"}
+    """진행 중인 모든 다운로드를 즉시 취소"""
+    cancelled = downloader.request_cancel()
+    return {"success": True, "cancelled": cancelled, "message": "다운로드 중단 요청됨"}
+
+
+@router.post("/download/cancel/{video_id}")
+async def cancel_download_by_id(video_id: str):
+    """특정 영상의 다운로드만 취소 (다른 다운로드는 계속 진행)"""
+    cancelled = downloader.request_cancel(video_id)
+    if not cancelled:
+        raise HTTPException(status_code=404, detail="진행 중인 다운로드가 없습니다.")
+    return {"success": True, "cancelled": cancelled, "message": "다운로드 중단 요청됨"}
 
 
 @router.post("/download/start")
@@ -659,33 +552,21 @@ async def start_download(request: DownloadExtractRequest):
         # 채널명/플레이리스트명 폴더 구조 구성
         output_dir = str(Config.get_download_path(request.channel_name or "", request.playlist_name or ""))
 
-        # 스킵 체크: 이미 다운로드된 파일인지 확인
-        from services.download_archive import get_archive
-        archive = get_archive(output_dir)
-
-        if archive.has_video(request.video_id) or duplicate_filter.is_file_downloaded(request.video_id, output_dir):
-            logger.info(f"Skipping already downloaded: {request.video_id}")
-            return {"success": True, "skipped": True, "message": "이미 다운로드됨 (스킵)"}
-
-        # 실제 다운로드 수행
-        filepath = await asyncio.to_thread(
-            downloader.download_video, request.video_id, request.quality, output_dir
+        result = await asyncio.to_thread(
+            download_with_archive, download_executor, duplicate_filter,
+            request.video_id, request.quality, output_dir
         )
 
-        if filepath == "CANCELLED":
+        status = result['status']
+        if status == 'cancelled':
             return {"success": False, "cancelled": True, "message": "사용자가 다운로드를 중단했습니다."}
-        elif filepath == "MEMBERSHIP_SKIP":
-            # 멤버십 전용 영상 → 아카이브에 기록하여 다음에 스킵
-            archive.add_video(request.video_id)
-            return {"success": True, "skipped": True, "message": "Membership (Skip)", "reason": "Membership"}
-        elif filepath == "AGE_RESTRICTED_SKIP":
-            # 성인인증 필요 영상 → 아카이브에 기록하여 다음에 스킵
-            archive.add_video(request.video_id)
-            return {"success": True, "skipped": True, "message": "Adult (Skip)", "reason": "Adult"}
-        elif filepath:
-            # 다운로드 성공 → 아카이브에 기록
-            archive.add_video(request.video_id)
-            return {"success": True, "skipped": False, "message": "다운로드 완료", "filepath": filepath}
+        elif status == 'skipped':
+            reason = result.get('reason')
+            if reason:
+                return {"success": True, "skipped": True, "message": f"{reason} (Skip)", "reason": reason}
+            return {"success": True, "skipped": True, "message": "이미 다운로드됨 (스킵)"}
+        elif status == 'done':
+            return {"success": True, "skipped": False, "message": "다운로드 완료", "filepath": result['filepath']}
         else:
             raise HTTPException(status_code=500, detail="다운로드 실패")
 
@@ -696,6 +577,141 @@ async def start_download(request: DownloadExtractRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/jobs")
+async def submit_download_job(request: DownloadJobRequest):
+    """
+    Submit a batch of videos to the server-side download queue
+
+    The worker pool runs items in the order chosen by the scheduling policy
+    (see /api/settings/scheduling); clients watch progress via GET /api/jobs/{job_id}.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="다운로드할 영상이 없습니다.")
+
+    items = [
+        {
+            'video_id': item.video_id,
+            'title': item.title,
+            'output_dir': str(Config.get_download_path(item.channel_name or "", item.playlist_name or "")),
+            'duration': item.duration,
+            'priority': item.priority,
+        }
+        for item in request.items
+    ]
+    job = download_queue.submit(items, request.quality, priority=request.priority)
+    return {"success": True, "job": job}
+
+
+@router.get("/jobs")
+async def list_download_jobs():
+    """List all download jobs (summary only)"""
+    return {"success": True, "jobs": download_queue.list_jobs()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_download_job(job_id: str):
+    """Get job status with per-item status and live progress"""
+    job = download_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_download_job(job_id: str):
+    """Cancel a job: pending items are dropped, in-flight downloads of this job stopped"""
+    if not download_queue.cancel_job(job_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return {"success": True, "message": "작업 중단 요청됨"}
+
+
+@router.post("/jobs/{job_id}/items/{index}/cancel")
+async def cancel_download_job_item(job_id: str, index: int):
+    """Cancel a single item of a job; other workers keep downloading"""
+    if not download_queue.cancel_item(job_id, index):
+        raise HTTPException(status_code=404, detail="취소할 항목을 찾을 수 없습니다.")
+    return {"success": True, "message": "항목 중단 요청됨"}
+
+
+@router.get("/dead-letters")
+async def list_dead_letters():
+    """List items that failed after all retries"""
+    return {"success": True, "items": download_queue.get_dead_letters()}
+
+
+@router.post("/dead-letters/retry")
+async def retry_dead_letters(request: DeadLetterRetryRequest):
+    """Re-submit dead-lettered items (all, or the given IDs) as new jobs"""
+    jobs = download_queue.retry_dead_letters(request.ids)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="재시도할 항목이 없습니다.")
+    return {"success": True, "jobs": jobs}
+
+
+@router.delete("/dead-letters")
+async def clear_dead_letters():
+    """Remove every dead-letter entry"""
+    removed = download_queue.remove_dead_letters()
+    return {"success": True, "removed": removed}
+
+
+@router.get("/subscriptions")
+async def list_subscriptions():
+    """List subscriptions with their sync state"""
+    return {"success": True, "subscriptions": subscription_syncer.list()}
+
+
+@router.post("/subscriptions")
+async def add_subscription(request: SubscriptionRequest):
+    """Register a channel or playlist; new uploads are queued on every sync"""
+    try:
+        subscription = subscription_syncer.add(
+            request.url,
+            quality=request.quality,
+            include_shorts=request.include_shorts,
+            interval=request.interval_hours * 3600 if request.interval_hours else None,
+            max_videos=request.max_videos,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "subscription": subscription}
+
+
+@router.patch("/subscriptions/{subscription_id}")
+async def update_subscription(subscription_id: int, request: SubscriptionUpdateRequest):
+    """Change a subscription's quality, interval, limits or enabled state"""
+    try:
+        subscription = subscription_syncer.update(
+            subscription_id,
+            quality=request.quality,
+            include_shorts=request.include_shorts,
+            interval=request.interval_hours * 3600 if request.interval_hours else None,
+            max_videos=request.max_videos,
+            enabled=request.enabled,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"success": True, "subscription": subscription}
+
+
+@router.delete("/subscriptions/{subscription_id}")
+async def remove_subscription(subscription_id: int):
+    """Unregister a subscription (queued downloads keep running)"""
+    if not subscription_syncer.remove(subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"success": True}
+
+
+@router.post("/subscriptions/{subscription_id}/sync")
+async def sync_subscription(subscription_id: int):
+    """Sync a subscription now instead of waiting for its interval"""
+    if not subscription_syncer.sync_now(subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"success": True}
+
+
 @router.post("/open-log-folder")
 async def open_log_folder():
     """Open the log folder in the system file manager"""
@@ -760,7 +776,7 @@ async def extract_download_url(request: DownloadExtractRequest):
         logger.info(f"Extracting download URL for: {request.video_id} ({request.quality})")
 
         # Get download info
-        info = downloader.get_download_info(request.video_id)
+        info = await asyncio.to_thread(downloader.get_download_info, request.video_id)
 
         if not info:
             raise HTTPException(status_code=404, detail="Video not found or unavailable")
@@ -11,7 +11,7 @@ from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from .routes import router, initialize_services
+from .routes import router, initialize_services, open_stores, download_queue, subscription_syncer
 from utils.config import Config
 from utils.logger import setup_logger
 
@@ -54,6 +54,9 @@ async def startup_event():
     Application startup tasks
 
     - Initialize services
+    - Open the job / subscription databases
+    - Start download queue workers
+    - Start subscription sync scheduler
     - Check yt-dlp version
     """
     logger.info("=" * 60)
@@ -63,6 +66,15 @@ async def startup_event():
     # Initialize API services
     initialize_services()
 
+    # Open job/subscription databases (resumed by the queue and syncer below)
+    open_stores()
+
+    # Start server-side download workers
+    download_queue.start()
+
+    # Re-analyze subscribed channels/playlists on their interval
+    subscription_syncer.start()
+
     # Log startup info
     logger.info(f"Server running on http://{Config.HOST}:{Config.PORT}")
     logger.info(f"Downloads directory: {Config.DOWNLOADS_DIR}")
@@ -82,6 +94,7 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown tasks"""
     logger.info("Shutting down application...")
+    download_queue.shutdown()
 
 
 @app.get("/")
@@ -0,0 +1,350 @@
+"""
+YouTube ALL DOWNLOADER - Download Throughput Benchmark
+
+Runs YTBulkDownloader.download_video against a local HTTP media server, so
+engine changes can be measured offline and reproducibly:
+
+    cd src && python -m benchmark --items 8 --size 64 --workers 1,4 --fragments 1,4,auto
+
+The server runs in its own process (its CPU is not counted) and serves
+synthetic media with HTTP Range support:
+
+- progressive: one file per video (single URL; segmented backend applies)
+- dash: the same bytes split into fragments (http_dash_segments;
+  concurrent_fragment_downloads applies)
+
+Videos are handed to yt-dlp as prefetched info dicts (the same path the
+download queue uses after the extraction stage), so no extractor or network
+access is involved. --rate and --latency emulate per-connection throttling
+and round-trip time.
+
+Reported per run: aggregate MB/s, per-item latency (p50/p95/max) and
+client CPU seconds per GB. --json writes every run's numbers to a file.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+MB = 1024 ** 2
+
+# 합성 미디어 내용: 고정 시드의 1MB 블록 반복 (실행마다 같은 바이트)
+_BLOCK_SIZE = MB
+_SEED = 20260101
+_WRITE_CHUNK = 64 * 1024
+
+_PATH_RE = re.compile(r'^/(?:progressive/(\d+)/[\w-]+\.mp4|dash/(\d+)/(\d+)/[\w-]+/seg-(\d+)\.m4s)$')
+
+
+def _synthetic_block() -> bytes:
+    return random.Random(_SEED).randbytes(_BLOCK_SIZE)
+
+
+class _MediaHandler(BaseHTTPRequestHandler):
+    """Serves /progressive/<size>/<id>.mp4 and /dash/<size>/<fragment size>/<id>/seg-<n>.m4s"""
+
+    protocol_version = 'HTTP/1.1'
+    block = b''
+    rate = 0          # bytes/s per connection (0 = unlimited)
+    latency = 0.0     # seconds before each response
+
+    def log_message(self, *args):
+        pass
+
+    def _resource(self):
+        """(offset, length) of the requested resource in the synthetic stream"""
+        m = _PATH_RE.match(self.path)
+        if not m:
+            return None
+        if m.group(1):
+            return 0, int(m.group(1))
+        size, frag_size, index = int(m.group(2)), int(m.group(3)), int(m.group(4))
+        start = index * frag_size
+        if start >= size:
+            return None
+        return start, min(frag_size, size - start)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head: bool = False):
+        resource = self._resource()
+        if resource is None:
+            self.send_error(404)
+            return
+        base, length = resource
+        start, end = 0, length - 1
+        match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if self.latency:
+            time.sleep(self.latency)
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else length - 1, length - 1)
+            if start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{length}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{length}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        if head:
+            return
+
+        position = base + start
+        remaining = end - start + 1
+        began = time.monotonic()
+        sent = 0
+        try:
+            while remaining:
+                offset = position % _BLOCK_SIZE
+                n = min(remaining, _WRITE_CHUNK, _BLOCK_SIZE - offset)
+                self.wfile.write(self.block[offset:offset + n])
+                position += n
+                remaining -= n
+                sent += n
+                if self.rate:
+                    ahead = sent / self.rate - (time.monotonic() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _serve(port_queue, rate: int, latency: float):
+    """Media server process entry point"""
+    handler = type('MediaHandler', (_MediaHandler,), {
+        'block': _synthetic_block(), 'rate': rate, 'latency': latency,
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_media_server(rate: int = 0, latency: float = 0.0):
+    """
+    Start the media server in a separate process
+
+    Returns:
+        (process, base URL)
+    """
+    ctx = multiprocessing.get_context('spawn')
+    port_queue = ctx.Queue()
+    process = ctx.Process(target=_serve, args=(port_queue, rate, latency), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+
+
+def make_info(base_url: str, index: int, kind: str, size: int, fragment_size: int) -> Dict:
+    """
+    Prefetched info dict for one synthetic video
+
+    Shaped like extract_video_info() output after format selection: a single
+    combined format (no merge) whose fields are also at the top level, which
+    is what the connection planner (format_plan) reads.
+    """
+    video_id = f"bench{index:06d}"
+    fmt = {
+        'format_id': kind,
+        'ext': 'mp4',
+        'vcodec': 'avc1.64001F',
+        'acodec': 'mp4a.40.2',
+        'height': 720,
+        'filesize': size,
+    }
+    if kind == 'dash':
+        base = f"{base_url}/dash/{size}/{fragment_size}/{video_id}/"
+        count = -(-size // fragment_size)
+        fmt.update({
+            'protocol': 'http_dash_segments',
+            'url': base + 'manifest.mpd',
+            'fragment_base_url': base,
+            'fragments': [{'path': f'seg-{n}.m4s', 'filesize': min(fragment_size, size - n * fragment_size)}
+                          for n in range(count)],
+        })
+    else:
+        fmt.update({'protocol': 'http', 'url': f"{base_url}/progressive/{size}/{video_id}.mp4"})
+    return {
+        '_type': 'video',
+        'id': video_id,
+        'title': f"Benchmark {kind} {index}",
+        'upload_date': '20260101',
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'webpage_url': f"https://www.youtube.com/watch?v={video_id}",
+        'formats': [fmt],
+        **fmt,
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_case(base_url: str, kind: str, workers: int, fragments: str, backend: str,
+             items: int, size: int, fragment_size: int, keep_sleep: bool = False) -> Dict:
+    """
+    Download `items` synthetic videos with one engine setting
+
+    Args:
+        fragments: Connections per download, or 'auto' for the measured tuner
+        keep_sleep: Keep yt-dlp's pre-download sleep (YouTube anti-throttling delay)
+
+    Returns:
+        Result dictionary (throughput, latency, CPU per GB, failures)
+    """
+    from services.downloader import YTBulkDownloader
+    from services.fragment_tuner import FragmentConcurrencyTuner
+
+    if fragments == 'auto':
+        tuner = FragmentConcurrencyTuner()
+    else:
+        # 고정 연결 수: 측정값과 예산 배분 대신 항상 지정 값 사용
+        n = int(fragments)
+        tuner = FragmentConcurrencyTuner(budget=n * workers, max_fragments=n, default=n)
+        tuner._wanted = lambda filesize: n
+    downloader = YTBulkDownloader(fragment_tuner=tuner, transfer_backend=backend)
+    if not keep_sleep:
+        # 요청 간 대기는 YouTube 차단 방지용이라 엔진 측정에서는 제외
+        for key in ('sleep_interval', 'max_sleep_interval', 'sleep_interval_requests'):
+            downloader.ydl_opts_base.pop(key, None)
+
+    output_dir = tempfile.mkdtemp(prefix='ytchita-bench-')
+    infos = [make_info(base_url, i, kind, size, fragment_size) for i in range(items)]
+    latencies = []
+    failures = 0
+
+    def one(info: Dict):
+        started = time.perf_counter()
+        result = downloader.download_video(info['id'], 'best', output_dir, info=info)
+        elapsed = time.perf_counter() - started
+        ok = bool(result) and os.path.isfile(result) and os.path.getsize(result) == size
+        return elapsed, ok
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for elapsed, ok in pool.map(one, infos):
+                latencies.append(elapsed)
+                failures += 0 if ok else 1
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    gigabytes = size * (items - failures) / 1024 ** 3
+    return {
+        'kind': kind,
+        'backend': backend,
+        'workers': workers,
+        'fragments': fragments,
+        'items': items,
+        'failures': failures,
+        'seconds': round(wall, 3),
+        'mb_per_s': round(size * (items - failures) / MB / wall, 2) if wall else 0.0,
+        'latency_p50': round(statistics.median(latencies), 3),
+        'latency_p95': round(_percentile(latencies, 95), 3),
+        'latency_max': round(max(latencies), 3),
+        'cpu_seconds': round(cpu, 3),
+        'cpu_s_per_gb': round(cpu / gigabytes, 2) if gigabytes else None,
+    }
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Offline download throughput benchmark.')
+    parser.add_argument('--kinds', default='progressive,dash', help='Media kinds (progressive, dash)')
+    parser.add_argument('--workers', default='1,4', help='Concurrent downloads to try (comma separated)')
+    parser.add_argument('--fragments', default='1,4,auto',
+                        help="Connections per download to try; 'auto' uses the throughput tuner")
+    parser.add_argument('--backends', default='segmented',
+                        help='Transfer backends for progressive media (segmented, native)')
+    parser.add_argument('--items', type=int, default=8, help='Videos per run')
+    parser.add_argument('--size', type=float, default=32, help='Size of each video in MB')
+    parser.add_argument('--fragment-size', type=float, default=1, help='DASH fragment size in MB')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Server rate limit per connection in MB/s (0 = unlimited)')
+    parser.add_argument('--latency', type=float, default=0, help='Server delay before each response in ms')
+    parser.add_argument('--keep-sleep', action='store_true',
+                        help="Keep the downloader's pre-download sleep (excluded by default)")
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per setting (best run is reported)')
+    parser.add_argument('--json', default=None, metavar='FILE', help='Write all results to FILE')
+    parser.add_argument('--log-level', default='WARNING', help='Log level on stderr (default: WARNING)')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(stream=sys.stderr, level=getattr(logging, args.log_level.upper(), logging.WARNING),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    size = int(args.size * MB)
+    fragment_size = max(1, int(args.fragment_size * MB))
+    process, base_url = start_media_server(int(args.rate * MB), args.latency / 1000)
+
+    cases = []
+    for kind in _csv(args.kinds):
+        # 분할 전송 백엔드는 단일 URL 형식에만 적용
+        backends = _csv(args.backends) if kind == 'progressive' else ['native']
+        for backend in backends:
+            for workers in _csv(args.workers):
+                for fragments in _csv(args.fragments):
+                    cases.append((kind, int(workers), fragments, backend))
+
+    header = (f"{'kind':<12}{'backend':<10}{'workers':>8}{'frags':>7}{'MB/s':>10}"
+              f"{'p50 s':>9}{'p95 s':>9}{'max s':>9}{'CPU s/GB':>10}{'fail':>6}")
+    print(f"{args.items} x {args.size:g}MB per run, server rate "
+          f"{'unlimited' if not args.rate else f'{args.rate:g}MB/s/conn'}, latency {args.latency:g}ms")
+    print(header)
+    print('-' * len(header))
+
+    results = []
+    try:
+        for kind, workers, fragments, backend in cases:
+            runs = [run_case(base_url, kind, workers, fragments, backend, args.items, size, fragment_size,
+                             args.keep_sleep)
+                    for _ in range(max(1, args.repeat))]
+            best = max(runs, key=lambda r: r['mb_per_s'])
+            results.append(best)
+            cpu_per_gb = '-' if best['cpu_s_per_gb'] is None else f"{best['cpu_s_per_gb']:.2f}"
+            print(f"{kind:<12}{backend:<10}{workers:>8}{fragments:>7}{best['mb_per_s']:>10.1f}"
+                  f"{best['latency_p50']:>9.2f}{best['latency_p95']:>9.2f}{best['latency_max']:>9.2f}"
+                  f"{cpu_per_gb:>10}{best['failures']:>6}", flush=True)
+    finally:
+        process.terminate()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'settings': {k: v for k, v in vars(args).items() if k != 'json'},
+                'results': results,
+            }, f, indent=2)
+    return 1 if any(r['failures'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+YouTube ALL DOWNLOADER - Headless CLI
+
+Mirror channels, playlists and single videos without the GUI or the HTTP
+server, e.g. from cron:
+
+    cd src && python -m cli https://www.youtube.com/@channel --quality 1080p --workers 4
+
+Uses the same analysis (SourceAnalyzer), archive/duplicate skipping and
+download pipeline (DownloadJobQueue) as the app. stdout carries one JSON
+object per line; logs go to stderr.
+
+    {"event": "analyzed", "url": ..., "kind": "channel", "to_download": 12, ...}
+    {"event": "progress", "video_id": ..., "status": "downloading", "percent": "42.0%", ...}
+    {"event": "item", "video_id": ..., "status": "done", "reason": null}
+    {"event": "summary", "status": "completed", "counts": {"done": 11, "failed": 1}, ...}
+
+Exit status: 0 = everything downloaded or skipped, 1 = analysis or download
+failures, 2 = usage error, 130 = interrupted.
+"""
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 진행 상황 출력 간격 (다운로드별, 초) / 작업 상태 확인 간격 (초)
+PROGRESS_INTERVAL = 1.0
+POLL_INTERVAL = 0.5
+
+_print_lock = threading.Lock()
+
+
+def emit(event: str, **fields):
+    """Write one JSON line to stdout"""
+    with _print_lock:
+        sys.stdout.write(json.dumps({'event': event, 'time': round(time.time(), 3), **fields},
+                                    ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+
+def _setup_logging(level: str):
+    """로그는 stderr로 (stdout은 JSON 출력 전용). 서비스 import 전에 설정해야 함"""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                           datefmt='%Y-%m-%d %H:%M:%S'))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Analyze YouTube channels/playlists/videos and download new videos (JSON lines on stdout).',
+    )
+    parser.add_argument('urls', nargs='+', metavar='URL', help='Channel, playlist or video URL')
+    parser.add_argument('--quality', default='720p', help='360p, 720p, 1080p, audio or best (default: 720p)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Concurrent downloads (default: YTCHITA_DOWNLOAD_WORKERS)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Let the concurrency controller tune downloads up to --workers')
+    parser.add_argument('--max-videos', type=int, default=None, help='Maximum videos per source')
+    parser.add_argument('--include-shorts', action='store_true', help='Keep videos of 3 minutes or less')
+    parser.add_argument('--api-key', default=None,
+                        help='YouTube Data API key (default: YOUTUBE_API_KEY or the saved key)')
+    parser.add_argument('--dry-run', action='store_true', help='Analyze only, do not download')
+    parser.add_argument('--log-level', default='INFO', help='Log level on stderr (default: INFO)')
+    return parser
+
+
+def analyze_sources(analyzer, urls: List[str], max_videos: int, include_shorts: bool) -> Tuple[List[Dict], int]:
+    """
+    Analyze every URL and collect job items
+
+    Returns:
+        (job items, number of sources that failed to analyze)
+    """
+    items = []
+    seen = set()
+    errors = 0
+    for url in urls:
+        try:
+            result = analyzer.analyze(url, max_videos, include_shorts)
+        except Exception as e:
+            errors += 1
+            emit('error', url=url, error=str(e))
+            continue
+
+        emit('analyzed', url=url, **{k: v for k, v in result.items() if k != 'videos'})
+        for video in result['videos']:
+            # 여러 소스에 같은 영상이 있으면 처음 나온 폴더에만 저장
+            if video['id'] in seen:
+                continue
+            seen.add(video['id'])
+            items.append({
+                'video_id': video['id'],
+                'title': video.get('title') or '',
+                'output_dir': result['download_path'],
+                'duration': video.get('duration'),
+            })
+    return items, errors
+
+
+def run_job(download_queue, downloader, items: List[Dict], quality: str) -> Dict:
+    """
+    Submit items as one job and report until it finishes
+
+    Returns:
+        Dict with job_id, final job status, per-status item counts and
+        whether the run was interrupted
+    """
+    last_progress = {}
+
+    def on_progress(video_id: str, entry: Dict):
+        status = entry.get('status')
+        now = time.monotonic()
+        previous = last_progress.get(video_id)
+        # 같은 상태의 진행률은 간격을 두고, 상태가 바뀌면 바로 출력
+        if previous and previous[0] == status and now - previous[1] < PROGRESS_INTERVAL:
+            return
+        last_progress[video_id] = (status, now)
+        emit('progress', video_id=video_id, **{k: v for k, v in entry.items() if k != 'status'}, status=status)
+
+    downloader.add_progress_listener(on_progress)
+    job = download_queue.submit(items, quality)
+    job_id = job['id']
+
+    interrupted = threading.Event()
+
+    def on_signal(signum, frame):
+        if interrupted.is_set():
+            raise KeyboardInterrupt
+        interrupted.set()
+        logging.getLogger(__name__).warning("Interrupted - cancelling downloads (again to force quit)")
+        download_queue.cancel_job(job_id)
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    # 항목 상태가 바뀔 때마다 한 줄 (처음 대기 상태는 생략)
+    reported = {index: ('pending', None) for index in range(len(items))}
+    while True:
+        state = download_queue.get_job_state(job_id)
+        for index, (video_id, status, reason) in enumerate(state['items']):
+            if reported[index] != (status, reason):
+                reported[index] = (status, reason)
+                emit('item', video_id=video_id, status=status, reason=reason)
+        if state['status'] in ('completed', 'cancelled'):
+            break
+        time.sleep(POLL_INTERVAL)
+
+    job = download_queue.get_job(job_id)
+    return {'job_id': job_id, 'status': job['status'], 'counts': job['counts'],
+            'interrupted': interrupted.is_set()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    _setup_logging(args.log_level)
+
+    from services.analyzer import SourceAnalyzer
+    from services.bandwidth import BandwidthLimiter
+    from services.concurrency import AdaptiveConcurrencyController
+    from services.download_queue import DownloadJobQueue
+    from services.downloader import YTBulkDownloader
+    from services.duplicate_filter import DuplicateFilter
+    from services.youtube_api import YouTubeAPIService
+    from utils.config import Config
+    from utils.key_manager import load_api_key_from_file
+    from utils.validators import validate_quality
+
+    valid, quality = validate_quality(args.quality)
+    if not valid:
+        print(f"error: invalid quality {args.quality!r}", file=sys.stderr)
+        return 2
+    if args.workers is not None and args.workers < 1:
+        print("error: --workers must be at least 1", file=sys.stderr)
+        return 2
+
+    Config.ensure_directories()
+    api_key = args.api_key or Config.YOUTUBE_API_KEY or load_api_key_from_file()
+    youtube_service = YouTubeAPIService(api_key) if api_key else None
+    downloader = YTBulkDownloader(
+        bandwidth_limiter=BandwidthLimiter(Config.BANDWIDTH_LIMIT, Config.PER_DOWNLOAD_BANDWIDTH_LIMIT)
+    )
+    duplicate_filter = DuplicateFilter()
+
+    analyzer = SourceAnalyzer(youtube_service, downloader, duplicate_filter)
+    items, errors = analyze_sources(analyzer, args.urls, args.max_videos or Config.MAX_VIDEOS_PER_REQUEST,
+                                    args.include_shorts)
+
+    if args.dry_run or not items:
+        emit('summary', sources=len(args.urls), source_errors=errors, queued=len(items),
+             counts={}, status='analyzed' if args.dry_run else 'completed')
+        return 1 if errors else 0
+
+    # --workers는 고정 동시 다운로드 수, --adaptive면 그 값이 상한
+    workers = args.workers or Config.DOWNLOAD_WORKERS
+    if args.adaptive:
+        controller = AdaptiveConcurrencyController(downloader, initial=min(workers, Config.DOWNLOAD_WORKERS),
+                                                   max_limit=workers, adaptive=True)
+    else:
+        controller = AdaptiveConcurrencyController(downloader, initial=workers, min_limit=workers,
+                                                   max_limit=workers, adaptive=False)
+    # 작업 저장소 없이 실행 (중단 후 재실행하면 아카이브 기준으로 남은 영상만 다시 받음)
+    download_queue = DownloadJobQueue(downloader, duplicate_filter, controller=controller)
+
+    try:
+        result = run_job(download_queue, downloader, items, quality)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        download_queue.shutdown()
+
+    counts = result['counts']
+    emit('summary', sources=len(args.urls), source_errors=errors, queued=len(items),
+         job_id=result['job_id'], status=result['status'], counts=counts)
+
+    if result['interrupted']:
+        return 130
+    return 1 if errors or counts.get('failed') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -59,7 +59,8 @@ let currentUrlType = '';
 let isAnalyzing = false;
 let isDownloading = false;
 let stopRequested = false;
-let currentDownloadControllers = [];  // 2개 동시 abort 지원
+let currentJobId = null;  // 서버 측 다운로드 작업 ID
+let currentJobItemIndex = new Map();  // 영상 목록 index → 작업 항목 index
 let selectedVideos = new Set();
 
 // DOM Elements
@@ -220,13 +221,12 @@ async function init() {
             stopRequested = true;
             elements.stopDownloadBtn.disabled = true;
             elements.stopDownloadBtn.style.opacity = '0.5';
-            // 서버에 즉시 취소 요청
-            try {
-                await fetch(`${API_BASE}/download/cancel`, { method: 'POST' });
-            } catch (_) {}
-            // 진행 중인 fetch 요청 모두 abort
-            currentDownloadControllers.forEach(c => c.abort());
-            currentDownloadControllers = [];
+            // 서버에 작업 취소 요청 (대기 항목 제거 + 진행 중 다운로드 중단)
+            if (currentJobId) {
+                try {
+                    await fetch(`${API_BASE}/jobs/${currentJobId}/cancel`, { method: 'POST' });
+                } catch (_) {}
+            }
         }
     });
     elements.settingsBtn.addEventListener('click', toggleSettings);
@@ -534,6 +534,7 @@ function renderVideoList(videos) {
                 <div class="video-title">${index + 1}. ${escapeHtml(video.title)}</div>
             </div>
             <div class="video-status" id="video-status-${index}"></div>
+            <button class="video-cancel-btn" id="video-cancel-${index}" data-index="${index}" title="이 영상만 중단" style="display: none;">✕</button>
         `;
         elements.videoList.appendChild(videoItem);
     });
@@ -554,6 +555,20 @@ function renderVideoList(videos) {
         });
     });
 
+    // 개별 영상 중단 버튼 (다른 다운로드는 계속 진행)
+    document.querySelectorAll('.video-cancel-btn').forEach(btn => {
+        btn.addEventListener('click', async (e) => {
+            e.stopPropagation();
+            const idx = parseInt(e.target.dataset.index);
+            const itemIndex = currentJobItemIndex.get(idx);
+            if (!currentJobId || itemIndex === undefined) return;
+            e.target.disabled = true;
+            try {
+                await fetch(`${API_BASE}/jobs/${currentJobId}/items/${itemIndex}/cancel`, { method: 'POST' });
+            } catch (_) {}
+        });
+    });
+
     // Sync select-all checkbox
     elements.selectAllCheckbox.checked = true;
     elements.selectAllCheckbox.indeterminate = false;
@@ -639,118 +654,156 @@ async function downloadAll() {
     let completed = 0;
     let skipped = 0;
     let failed = 0;
+    let cancelled = 0;
     let stopped = false;
     let doneCount = 0;
 
-    // 배치 시작 전 취소 플래그 초기화
+    // 배치 시작 전 잔여 임시파일 정리
     try {
         await fetch(`${API_BASE}/download/reset-cancel`, { method: 'POST' });
     } catch (_) {}
 
-    // 2-워커 풀: 큐에서 하나씩 꺼내서 병렬 처리
-    const queue = [...downloadIndices];
-    let queueIndex = 0;
-
     function updateProgress() {
         elements.progressFill.style.width = `${Math.round((doneCount / totalSelected) * 100)}%`;
         elements.progressText.textContent = `${doneCount}/${totalSelected}`;
     }
 
-    async function worker() {
-        while (queueIndex < queue.length && !stopRequested) {
-            const i = queue[queueIndex++];
-            const video = currentVideos[i];
+    // 서버 측 작업 큐에 한 번에 제출 → 워커 풀이 스케줄링 정책 순서로 다운로드
+    const jobItems = downloadIndices.map(i => ({
+        video_id: currentVideos[i].id,
+        title: currentVideos[i].title,
+        channel_name: currentChannelName || null,
+        playlist_name: currentVideos[i].playlist_name || currentPlaylistName || null,
+        duration: currentVideos[i].duration || null,
+    }));
 
-            updateProgress();
-            updateVideoRow(i, 'downloading', 'Downloading');
+    try {
+        const response = await fetch(`${API_BASE}/jobs`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ items: jobItems, quality: quality }),
+        });
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            throw new Error(data.detail || '다운로드 작업 등록 실패');
+        }
+        currentJobId = data.job.id;
+        downloadIndices.forEach((i, k) => {
+            currentJobItemIndex.set(i, k);
+            setCancelButton(i, true);
+        });
+    } catch (error) {
+        console.error('Error submitting download job:', error);
+        alert(`오류: ${error.message}`);
+        downloadIndices.forEach(i => updateVideoRow(i, 'error', 'Failed'));
+        failed = totalSelected;
+    }
 
-            // video_id별 진행률 폴링
-            let dotCount = 0;
-            const pollId = setInterval(async () => {
-                try {
-                    const prog = await fetch(`${API_BASE}/download/progress/${video.id}`).then(r => r.json());
-                    if (prog.status === 'downloading') {
-                        const parts = [prog.percent, prog.total, prog.speed, prog.eta ? `ETA ${prog.eta}` : ''].filter(Boolean);
-                        updateVideoRow(i, 'downloading', parts.join(' \u00b7 '));
-                    } else if (prog.status === 'converting') {
-                        dotCount = (dotCount % 3) + 1;
-                        updateVideoRow(i, 'downloading', 'Converting audio' + '.'.repeat(dotCount));
-                    }
-                } catch (_) {}
-            }, 1000);
+    // 진행률 스트림 (SSE): 하나의 연결로 모든 항목의 변경분만 수신
+    if (currentJobId) {
+        // video_id → 작업 항목 index 목록 (같은 영상이 여러 재생목록에 있을 수 있음)
+        const itemsByVideo = new Map();
+        jobItems.forEach((item, k) => {
+            if (!itemsByVideo.has(item.video_id)) itemsByVideo.set(item.video_id, []);
+            itemsByVideo.get(item.video_id).push(k);
+        });
+        const itemStatus = new Array(jobItems.length).fill('pending');
+        let dotCount = 0;
+
+        await new Promise((resolve) => {
+            const source = new EventSource(`${API_BASE}/download/stream?job_id=${currentJobId}`);
+
+            source.addEventListener('progress', (e) => {
+                const changed = JSON.parse(e.data);
+                dotCount = (dotCount % 3) + 1;
+                Object.entries(changed).forEach(([videoId, prog]) => {
+                    (itemsByVideo.get(videoId) || []).forEach(k => {
+                        if (itemStatus[k] !== 'running') return;
+                        const i = downloadIndices[k];
+                        if (prog.status === 'downloading') {
+                            const parts = [prog.percent, prog.total, prog.speed, prog.eta ? `ETA ${prog.eta}` : ''].filter(Boolean);
+                            updateVideoRow(i, 'downloading', parts.join(' \u00b7 '));
+                        } else if (prog.status === 'waiting_disk') {
+                            // 디스크 공간 부족으로 대기열 일시 정지
+                            const mb = (b) => `${Math.round(b / 1024 / 1024)}MB`;
+                            updateVideoRow(i, 'downloading', `Waiting for disk space · ${mb(prog.needed)} needed · ${mb(prog.available)} free`);
+                        } else if (prog.status === 'converting') {
+                            const label = prog.postprocessor === 'Merger' ? 'Merging' : 'Converting';
+                            if (prog.waiting) {
+                                // 후처리 슬롯 대기열: 대기 항목 수 + 대기 시간
+                                updateVideoRow(i, 'downloading', `${label} queued · ${prog.queue_depth} waiting · ${Math.round(prog.waited || 0)}s`);
+                            } else {
+                                updateVideoRow(i, 'downloading', label + '.'.repeat(dotCount));
+                            }
+                        }
+                    });
+                });
+            });
 
-            try {
-                const controller = new AbortController();
-                currentDownloadControllers.push(controller);
-                const response = await fetchWithTimeout(`${API_BASE}/download/start`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        video_id: video.id,
-                        quality: quality,
-                        channel_name: currentChannelName || null,
-                        playlist_name: video.playlist_name || currentPlaylistName || null,
-                    }),
-                    signal: controller.signal,
-                }, 600000);
-
-                clearInterval(pollId);
-                // controller 제거
-                currentDownloadControllers = currentDownloadControllers.filter(c => c !== controller);
-                const data = await response.json();
-
-                if (data.cancelled) {
-                    updateVideoRow(i, 'stopped', 'Stopped');
-                    stopped = true;
-                    break;
-                } else if (response.ok && data.success) {
-                    if (data.skipped) {
+            source.addEventListener('job', (e) => {
+                const job = JSON.parse(e.data);
+                Object.entries(job.items).forEach(([key, item]) => {
+                    const k = parseInt(key);
+                    const i = downloadIndices[k];
+                    // 재연결 시 전체 상태가 다시 오므로 바뀐 항목만 반영
+                    if (itemStatus[k] === item.status) return;
+                    itemStatus[k] = item.status;
+
+                    if (item.status === 'running') {
+                        updateVideoRow(i, 'downloading', 'Downloading');
+                        return;
+                    }
+                    if (item.status === 'retrying') {
+                        updateVideoRow(i, 'pending', item.reason ? `Retrying (${item.reason})` : 'Retrying');
+                        return;
+                    }
+                    if (item.status === 'done') {
+                        completed++;
+                        updateVideoRow(i, 'success', item.total ? `✔ ${item.total}` : '✔');
+                    } else if (item.status === 'skipped') {
                         skipped++;
-                        updateVideoRow(i, 'skip', data.reason ? `Skip (${data.reason})` : 'Skip');
+                        updateVideoRow(i, 'skip', item.reason ? `Skip (${item.reason})` : 'Skip');
+                    } else if (item.status === 'failed') {
+                        failed++;
+                        updateVideoRow(i, 'error', 'Failed');
+                    } else if (item.status === 'cancelled') {
+                        cancelled++;
+                        updateVideoRow(i, 'stopped', 'Stopped');
                     } else {
-                        completed++;
-                        const prog = await fetch(`${API_BASE}/download/progress/${video.id}`).then(r => r.json()).catch(() => ({}));
-                        updateVideoRow(i, 'success', prog.total ? `✔ ${prog.total}` : '✔');
+                        return;
                     }
-                    doneCount++;
-                    updateProgress();
-                } else {
-                    throw new Error(data.detail || '다운로드 실패');
-                }
-
-            } catch (error) {
-                clearInterval(pollId);
-                if (error.name === 'AbortError' || stopRequested) {
-                    updateVideoRow(i, 'stopped', 'Stopped');
-                    stopped = true;
-                    break;
-                }
-                console.error(`Error downloading ${video.title}:`, error);
-                failed++;
-                updateVideoRow(i, 'error', 'Failed');
-                doneCount++;
+                    setCancelButton(i, false);
+                    if (item.status !== 'cancelled') doneCount++;
+                });
                 updateProgress();
-            }
-        }
-    }
 
-    // 2개 워커 동시 실행
-    await Promise.all([worker(), worker()]);
+                if (job.status === 'completed' || job.status === 'cancelled') {
+                    stopped = job.status === 'cancelled';
+                    source.close();
+                    resolve();
+                }
+            });
 
-    // 중지 시 남은 큐 항목 '중지됨' 표시
-    if (stopped || stopRequested) {
-        for (let qi = queueIndex; qi < queue.length; qi++) {
-            updateVideoRow(queue[qi], 'stopped', 'Stopped');
-        }
-        stopped = true;
+            // 연결이 끊기면 EventSource가 자동 재연결 → 서버가 전체 상태를 다시 보냄
+            source.addEventListener('error', (e) => {
+                if (e.data) {
+                    // 서버가 보낸 error 이벤트 (작업 없음)
+                    source.close();
+                    resolve();
+                }
+            });
+        });
     }
+    currentJobId = null;
+    currentJobItemIndex.forEach((_, i) => setCancelButton(i, false));
+    currentJobItemIndex = new Map();
 
     // Summary via modal
     const parts = [];
     if (completed > 0) parts.push(`Done: ${completed}`);
     if (skipped > 0) parts.push(`Skip: ${skipped}`);
     if (failed > 0) parts.push(`Failed: ${failed}`);
-    if (stopped) parts.push(`Stopped: ${totalSelected - completed - skipped - failed}`);
+    if (cancelled > 0) parts.push(`Stopped: ${cancelled}`);
     const { displayPath, folderPath } = buildSavePaths();
 
     elements.completeTitle.textContent = stopped ? 'Download Stopped' : 'Download Complete';
@@ -763,7 +816,6 @@ async function downloadAll() {
 
     isDownloading = false;
     stopRequested = false;
-    currentDownloadControllers = [];
     elements.downloadAllBtn.disabled = false;
     elements.analyzeBtn.disabled = false;
     elements.progressWrap.style.display = 'none';
@@ -794,6 +846,16 @@ function updateVideoRow(index, type, statusText) {
     }
 }
 
+/**
+ * Show/hide a video row's per-item cancel button
+ */
+function setCancelButton(index, visible) {
+    const btn = document.getElementById(`video-cancel-${index}`);
+    if (!btn) return;
+    btn.style.display = visible ? '' : 'none';
+    btn.disabled = false;
+}
+
 /**
  * Toggle settings panel
  */
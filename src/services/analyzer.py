@@ -0,0 +1,408 @@
+"""
+Source Analyzer Service
+
+Resolves a channel, playlist or single-video URL into the list of videos
+still to download: fetch (YouTube Data API, yt-dlp fallback) → filter
+membership-only / Shorts → deduplicate → drop already downloaded ones
+(per-folder archive + file scan).
+
+Shared by the API routes and the headless CLI, so both decide "what is new"
+the same way.
+"""
+
+import logging
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from services.duplicate_filter import DuplicateFilter
+from services.youtube_api import YouTubeAPIService
+from utils.config import Config
+from utils.validators import extract_playlist_id, extract_video_id, is_valid_youtube_url, normalize_input
+
+logger = logging.getLogger(__name__)
+
+# 멤버십 전용 영상 필터 (yt-dlp availability 필드 + 제목 키워드)
+MEMBERSHIP_AVAILABILITY = {'subscriber_only', 'needs_auth', 'premium_only'}
+MEMBERSHIP_TITLE_KEYWORDS = ['멤버십', '멤버쉽', '회원 전용', 'membership', 'members only']
+
+# 멤버십 전용 재생목록 제목 키워드
+MEMBERSHIP_PLAYLIST_KEYWORDS = ['멤버십', '멤버쉽', 'membership', 'members only', 'members-only']
+
+# 이 길이(초) 이하는 Shorts로 간주
+SHORTS_MAX_DURATION = 180
+
+
+def assign_playlist_folders(titles: List[str]) -> List[str]:
+    """같은 이름 재생목록 → 상위 폴더/하위 번호 폴더 구조 (제목 순서대로 폴더명 반환)"""
+    counts = Counter(titles)
+    indices = {}
+    folders = []
+    for name in titles:
+        if counts[name] > 1:
+            idx = indices.get(name, 0) + 1
+            indices[name] = idx
+            folders.append(f"{name}/{name} ({idx})")
+        else:
+            folders.append(name)
+    return folders
+
+
+def source_kind(url: str) -> str:
+    """
+    Classify a (normalized) YouTube URL
+
+    Returns:
+        'video', 'playlist' or 'channel'
+    """
+    if extract_video_id(url) and 'list=' not in url:
+        return 'video'
+    if 'list=' in url:
+        return 'playlist'
+    return 'channel'
+
+
+class SourceAnalyzer:
+    """Channel / playlist / video analysis with duplicate and archive filtering"""
+
+    def __init__(self, youtube_service: Optional[YouTubeAPIService], downloader,
+                 duplicate_filter: DuplicateFilter):
+        """
+        Args:
+            youtube_service: YouTube Data API client (None = yt-dlp only)
+            downloader: YTBulkDownloader (yt-dlp fallback + single video info)
+            duplicate_filter: DuplicateFilter for dedup and already-downloaded checks
+        """
+        self.youtube_service = youtube_service
+        self.downloader = downloader
+        self.duplicate_filter = duplicate_filter
+
+    @staticmethod
+    def _validate(url: str) -> str:
+        url = normalize_input(url)
+        if not is_valid_youtube_url(url):
+            raise ValueError("Invalid YouTube URL")
+        return url
+
+    def _result(self, kind: str, videos: List[Dict], total_videos: int, unique_videos: int,
+                download_path: Optional[Path], source: Optional[str], **meta) -> Dict:
+        return {
+            'kind': kind,
+            'channel_id': meta.get('channel_id'),
+            'channel_name': meta.get('channel_name'),
+            'playlist_id': meta.get('playlist_id'),
+            'playlist_name': meta.get('playlist_name'),
+            'total_videos': total_videos,
+            'unique_videos': unique_videos,
+            'duplicates_removed': total_videos - unique_videos,
+            'already_downloaded': unique_videos - len(videos),
+            'to_download': len(videos),
+            'videos': videos,
+            'download_path': str(download_path) if download_path else None,
+            'source': source,
+        }
+
+    def analyze(self, url: str, max_videos: int = Config.MAX_VIDEOS_PER_REQUEST,
+                include_shorts: bool = False) -> Dict:
+        """Analyze any supported URL (dispatches on source_kind)"""
+        url = self._validate(url)
+        kind = source_kind(url)
+        if kind == 'video':
+            return self.analyze_video(url)
+        if kind == 'playlist':
+            return self.analyze_playlist(url, max_videos)
+        return self.analyze_channel(url, max_videos, include_shorts)
+
+    def analyze_channel(self, url: str, max_videos: int = Config.MAX_VIDEOS_PER_REQUEST,
+                        include_shorts: bool = False) -> Dict:
+        """
+        Analyze a channel's uploads
+
+        Args:
+            url: Channel URL (/channel/, /@handle, /c/, /user/)
+            max_videos: Maximum videos to fetch
+            include_shorts: Keep videos ≤180s (API only; yt-dlp has no durations here)
+
+        Returns:
+            Analysis dict ('videos' = videos still to download)
+
+        Raises:
+            ValueError: Invalid URL
+        """
+        url = self._validate(url)
+        channel_id = None
+        channel_name = ''
+        videos = []
+        use_fallback = not self.youtube_service
+
+        if not use_fallback:
+            # Try YouTube Data API first
+            channel_id = self.youtube_service.extract_channel_id(url)
+
+            if not channel_id:
+                # Extract username and fetch channel ID
+                username = self.youtube_service.extract_username(url)
+                if username:
+                    channel_id = self.youtube_service.get_channel_id_from_username(username)
+
+            if channel_id:
+                channel_name = self.youtube_service.get_channel_title(channel_id) or channel_id
+                logger.info(f"Analyzing channel via API: {channel_id} ({channel_name})")
+                videos = self.youtube_service.get_channel_videos(channel_id, max_videos)
+            else:
+                use_fallback = True
+
+        if use_fallback:
+            # Fallback to yt-dlp
+            logger.info(f"Using yt-dlp fallback for channel analysis: {url}")
+            videos, channel_meta = self.downloader.get_channel_videos(url, max_videos)
+            channel_name = channel_meta.get('channel', '')
+
+            # Extract channel_id from URL for download path
+            channel_id = (YouTubeAPIService.extract_channel_id(url)
+                          or YouTubeAPIService.extract_username(url) or "unknown_channel")
+
+        source = "yt-dlp" if use_fallback else "YouTube API"
+        if not videos:
+            return self._result('channel', [], 0, 0, None, source,
+                                channel_id=channel_id, channel_name=channel_name or None)
+
+        videos = [
+            v for v in videos
+            if (v.get('availability') or '') not in MEMBERSHIP_AVAILABILITY
+            and not any(kw in (v.get('title') or '').lower() for kw in MEMBERSHIP_TITLE_KEYWORDS)
+        ]
+
+        # Filter Shorts (≤180s) when using API and include_shorts is False
+        if not include_shorts and not use_fallback:
+            videos = [v for v in videos if (v.get('duration') or 999) > SHORTS_MAX_DURATION]
+
+        total_videos = len(videos)
+        videos = self.duplicate_filter.deduplicate_video_ids(videos)
+        unique_videos = len(videos)
+
+        # Check for already downloaded
+        safe_channel_name = channel_name or channel_id or "Unknown Channel"
+        download_path = Config.get_download_path(safe_channel_name)
+        videos = self.duplicate_filter.filter_already_downloaded(videos, str(download_path))
+
+        return self._result('channel', videos, total_videos, unique_videos, download_path, source,
+                            channel_id=channel_id, channel_name=channel_name or None)
+
+    def analyze_channel_playlists(self, url: str, max_videos: int = Config.MAX_VIDEOS_PER_REQUEST) -> Dict:
+        """
+        Analyze every playlist of a channel (videos grouped by playlist folder)
+
+        The same video may appear in several playlists and is then kept once
+        per playlist folder. Each video dict carries its 'playlist_name'.
+
+        Raises:
+            ValueError: Invalid URL
+        """
+        url = self._validate(url)
+        channel_id = None
+        channel_name = ''
+        videos_list = []
+        use_fallback = not self.youtube_service
+
+        if not use_fallback:
+            channel_id = self.youtube_service.extract_channel_id(url)
+            if not channel_id:
+                username = self.youtube_service.extract_username(url)
+                if username:
+                    channel_id = self.youtube_service.get_channel_id_from_username(username)
+
+            if channel_id:
+                channel_name = self.youtube_service.get_channel_title(channel_id) or channel_id
+                logger.info(f"Analyzing channel playlists via API: {channel_id} ({channel_name})")
+                # Fetch all playlists
+                playlists = [
+                    pl for pl in self.youtube_service.get_channel_playlists(channel_id)
+                    if not any(kw in pl['title'].lower() for kw in MEMBERSHIP_PLAYLIST_KEYWORDS)
+                ]
+                folders = assign_playlist_folders([pl['title'] for pl in playlists])
+
+                # 재생목록별 조회는 서로 독립적이므로 동시에 요청
+                playlist_videos = self.youtube_service.get_playlists_videos([pl['id'] for pl in playlists], max_videos)
+                for folder_name, videos in zip(folders, playlist_videos):
+                    for v in videos:
+                        videos_list.append({
+                            'id': v['id'],
+                            'title': v['title'],
+                            'publishedAt': v.get('publishedAt'),
+                            'playlist_name': folder_name,
+                        })
+            else:
+                use_fallback = True
+
+        if use_fallback:
+            channel_id, channel_name, videos_list = self._channel_playlists_via_ytdlp(url)
+
+        source = "yt-dlp" if use_fallback else "YouTube API"
+        meta = {'channel_id': channel_id, 'channel_name': channel_name or None}
+        if not videos_list:
+            return self._result('channel_playlists', [], 0, 0, None, source, **meta)
+
+        total_videos = len(videos_list)
+
+        # 같은 영상이 여러 재생목록에 있으면 재생목록 폴더마다 받으므로 (id, 재생목록) 기준으로만 중복 제거
+        unique_vids = []
+        seen = set()
+        for v in videos_list:
+            key = (v['id'], v.get('playlist_name', ''))
+            if key not in seen:
+                seen.add(key)
+                unique_vids.append(v)
+        unique_videos = len(unique_vids)
+
+        # Check for already downloaded (재생목록 폴더별)
+        safe_chan = channel_name or channel_id or "Unknown Channel"
+        to_download = []
+        for v in unique_vids:
+            download_path = Config.get_download_path(safe_chan, v.get('playlist_name') or "Unknown Playlist")
+            if self.duplicate_filter.filter_already_downloaded([v], str(download_path)):
+                to_download.append(v)
+
+        return self._result('channel_playlists', to_download, total_videos, unique_videos,
+                            Config.get_download_path(safe_chan), source, **meta)
+
+    def _channel_playlists_via_ytdlp(self, url: str):
+        """
+        yt-dlp fallback: read the channel's /playlists tab, then each playlist
+
+        Returns:
+            (channel_id, channel_name, videos with 'playlist_name')
+        """
+        logger.info(f"Using yt-dlp fallback for channel playlists analysis: {url}")
+        channel_id = None
+        channel_name = ''
+        videos_list = []
+
+        # Make sure url ends with /playlists
+        url = url.rstrip('/')
+        if not url.endswith('/playlists'):
+            if url.endswith('/videos'):
+                url = url[:-7]
+            url += '/playlists'
+
+        # 비-ASCII 핸들(@한글이름) → channel ID로 변환
+        handle_match = re.search(r'/@([^/]+)', url)
+        if handle_match:
+            handle = handle_match.group(1)
+            if any(ord(c) > 127 for c in handle):
+                cid = self.downloader._resolve_handle_to_channel_id(handle)
+                if cid:
+                    url = f"https://www.youtube.com/channel/{cid}/playlists"
+                    logger.info(f"Resolved non-ASCII handle @{handle} → {cid}")
+
+        ydl_opts = {'quiet': True, 'extract_flat': True}
+        try:
+            with self.downloader.ydl_pool.session(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=False)
+                channel_name = info.get('channel', '') or info.get('uploader', '')
+                channel_id = info.get('channel_id', 'unknown_channel')
+
+                entries = [
+                    e for e in info.get('entries', [])
+                    if e and not any(kw in (e.get('title') or '').lower() for kw in MEMBERSHIP_PLAYLIST_KEYWORDS)
+                ]
+                folders = assign_playlist_folders([e.get('title', 'Unknown Playlist') for e in entries])
+
+                for pl_entry, folder_name in zip(entries, folders):
+                    pl_url = pl_entry.get('url')
+                    if not pl_url:
+                        continue
+                    pl_info = ydl.extract_info(pl_url, download=False)
+                    for v_entry in pl_info.get('entries', []):
+                        if v_entry and v_entry.get('id'):
+                            # 개별 영상 멤버십 필터 (yt-dlp availability 필드)
+                            avail = (v_entry.get('availability') or '').lower()
+                            if avail in MEMBERSHIP_AVAILABILITY:
+                                logger.info(f"Skipping membership video: {v_entry.get('title')} ({avail})")
+                                continue
+                            videos_list.append({
+                                'id': v_entry['id'],
+                                'title': v_entry.get('title', 'Unknown'),
+                                'playlist_name': folder_name,
+                            })
+        except Exception as e:
+            logger.error(f"yt-dlp fallback failed for playlists: {e}")
+
+        return channel_id, channel_name, videos_list
+
+    def analyze_playlist(self, url: str, max_videos: int = Config.MAX_VIDEOS_PER_REQUEST) -> Dict:
+        """
+        Analyze a playlist
+
+        Raises:
+            ValueError: Invalid URL
+        """
+        url = self._validate(url)
+        playlist_id = extract_playlist_id(url)
+        videos = []
+        playlist_meta = {}
+        use_fallback = not self.youtube_service
+
+        if not use_fallback:
+            try:
+                videos = self.youtube_service.get_playlist_videos(playlist_id, max_videos)
+                info = self.youtube_service.get_playlist_info(playlist_id)
+                if info:
+                    playlist_meta['playlist_title'] = info.get('title', '')
+                    playlist_meta['channel'] = info.get('channelTitle', '')
+            except Exception as e:
+                logger.warning(f"API playlist fetch failed, falling back to yt-dlp: {e}")
+                use_fallback = True
+
+        if use_fallback:
+            logger.info(f"Using yt-dlp fallback for playlist analysis: {url}")
+            videos, playlist_meta = self.downloader.get_playlist_videos(url, max_videos)
+
+        playlist_name = playlist_meta.get('playlist_title', '')
+        channel_name = playlist_meta.get('channel', '')
+        source = "yt-dlp" if use_fallback else "YouTube API"
+        meta = {'playlist_id': playlist_id, 'playlist_name': playlist_name or None,
+                'channel_name': channel_name or None}
+
+        if not videos:
+            return self._result('playlist', [], 0, 0, None, source, **meta)
+
+        total_videos = len(videos)
+        videos = self.duplicate_filter.deduplicate_video_ids(videos)
+        unique_videos = len(videos)
+
+        # Check for already downloaded
+        safe_channel_name = channel_name or "Unknown Channel"
+        safe_playlist_name = playlist_name or playlist_id or "Unknown Playlist"
+        download_path = Config.get_download_path(safe_channel_name, safe_playlist_name)
+        videos = self.duplicate_filter.filter_already_downloaded(videos, str(download_path))
+
+        return self._result('playlist', videos, total_videos, unique_videos, download_path, source, **meta)
+
+    def analyze_video(self, url: str) -> Dict:
+        """
+        Analyze a single video (saved to the channel root folder)
+
+        Raises:
+            ValueError: Invalid URL or no video ID
+            LookupError: Video not found
+        """
+        url = self._validate(url)
+        video_id = extract_video_id(url)
+        if not video_id:
+            raise ValueError("동영상 ID를 추출할 수 없습니다.")
+
+        # yt-dlp로 영상 정보 가져오기
+        info = self.downloader.get_video_info(video_id)
+        if not info:
+            raise LookupError("영상을 찾을 수 없습니다.")
+
+        channel_name = info.get('uploader', '') or 'Unknown Channel'
+
+        # 이미 다운로드 여부 확인 (채널 루트 폴더)
+        download_path = Config.get_download_path(channel_name)
+        videos = self.duplicate_filter.filter_already_downloaded(
+            [{'id': video_id, 'title': info['title']}], str(download_path)
+        )
+        return self._result('video', videos, 1, 1, download_path, 'yt-dlp', channel_name=channel_name)
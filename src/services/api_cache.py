@@ -0,0 +1,170 @@
+"""
+API Response Cache
+
+SQLite cache of YouTube Data API responses, keyed by endpoint + query
+(without the API key). Each entry keeps the response body, its ETag and
+when it was last fetched or revalidated:
+
+- younger than the endpoint's TTL (Config.API_CACHE_TTL) → served directly
+- older → revalidated with If-None-Match; a 304 reuses the stored body and
+  resets its age
+
+The same database keeps each channel's known uploads for incremental
+channel analysis: the newest video already seen (the watermark) and the
+full video list, so a re-analysis only pages until it reaches the
+watermark and merges the stored remainder back in.
+
+The database lives next to the download archives
+(Config.DOWNLOADS_DIR/.api_cache.db).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channel_uploads (
+    channel_id TEXT PRIMARY KEY,
+    newest_id TEXT NOT NULL,
+    newest_published_at TEXT NOT NULL,
+    exhausted INTEGER NOT NULL,
+    refreshed_at REAL NOT NULL,
+    videos TEXT NOT NULL
+);
+"""
+
+
+class APIResponseCache:
+    """SQLite store for Data API responses and their ETags"""
+
+    def __init__(self, path: Optional[Path] = None, ttls: Optional[Dict[str, int]] = None):
+        """
+        Open (or create) the cache database and drop long-unused entries
+
+        Args:
+            path: Database file (default: Config.API_CACHE_DB_PATH)
+            ttls: Seconds an entry is served without revalidation, per
+                endpoint (default: Config.API_CACHE_TTL; missing = 0)
+        """
+        self.path = Path(path or Config.API_CACHE_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = Config.API_CACHE_TTL if ttls is None else ttls
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self.prune(Config.API_CACHE_MAX_AGE)
+
+    @staticmethod
+    def make_key(resource: str, params: Dict) -> str:
+        """Cache key for one request (params must not contain the API key)"""
+        return resource + '?' + json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+    def ttl(self, resource: str) -> int:
+        return self.ttls.get(resource, 0)
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], str, float]]:
+        """
+        Look up a stored response
+
+        Returns:
+            (etag, body, fetched_at) or None
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def put(self, key: str, etag: Optional[str], body: str):
+        """Store (or replace) a response"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, body, fetched_at) VALUES (?, ?, ?, ?)",
+                    (key, etag, body, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache API response: {e}")
+
+    def touch(self, key: str):
+        """Mark a stored response as just revalidated (304)"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update cached API response: {e}")
+
+    def get_channel_uploads(self, channel_id: str) -> Optional[Dict]:
+        """
+        Known uploads of a channel
+
+        Returns:
+            Dict with newest_id, newest_published_at, exhausted (the list
+            reaches the channel's first upload), refreshed_at (last full
+            fetch) and videos (newest first), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_id, newest_published_at, exhausted, refreshed_at, videos "
+                "FROM channel_uploads WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        if not row:
+            return None
+        newest_id, newest_published_at, exhausted, refreshed_at, videos = row
+        return {
+            'newest_id': newest_id,
+            'newest_published_at': newest_published_at,
+            'exhausted': bool(exhausted),
+            'refreshed_at': refreshed_at,
+            'videos': json.loads(videos),
+        }
+
+    def put_channel_uploads(self, channel_id: str, videos: List[Dict], exhausted: bool, refreshed_at: float):
+        """Store a channel's uploads (newest first); the first one becomes the watermark"""
+        if not videos:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO channel_uploads "
+                    "(channel_id, newest_id, newest_published_at, exhausted, refreshed_at, videos) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (channel_id, videos[0]['id'], videos[0]['publishedAt'], int(exhausted), refreshed_at,
+                     json.dumps(videos, ensure_ascii=False))
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store uploads of channel {channel_id}: {e}")
+
+    def prune(self, max_age: float) -> int:
+        """Delete entries not fetched or revalidated for max_age seconds"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM responses WHERE fetched_at < ?", (time.time() - max_age,))
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} stale API cache entries")
+        return cursor.rowcount
+
+    def clear(self):
+        """Delete every cached response and channel watermark"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM channel_uploads")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,144 @@
+"""
+Bandwidth Limiter Service
+
+Process-wide token bucket shared by every active download_video call.
+yt-dlp's own 'ratelimit' only knows about a single download; this limiter
+caps the total across all of them, with an optional per-download cap.
+
+State lives in shared memory (multiprocessing RawArray + Lock), so the same
+bucket is enforced in download worker processes as well. Limits can be
+changed at runtime and apply immediately to running downloads.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# 공유 상태 인덱스
+_RATE, _PER_DOWNLOAD_RATE, _TOKENS, _LAST_REFILL = range(4)
+
+# 한 번에 허용하는 버스트 크기 (초 단위 전송량)
+BURST_SECONDS = 1.0
+
+
+class DownloadRateState:
+    """다운로드 1건의 전송량 추적 + 개별 상한 버킷 (진행률 훅 스레드 간 공유)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_bytes = 0
+        self.debt_until = 0.0  # 개별 상한 기준 다음 전송 가능 시각
+
+
+class BandwidthLimiter:
+    """Token bucket (bytes/s) shared by all downloads, across threads and processes"""
+
+    def __init__(self, rate: float = 0, per_download_rate: float = 0, shared=None):
+        """
+        Initialize limiter
+
+        Args:
+            rate: Total cap in bytes/s for all downloads (0 = unlimited)
+            per_download_rate: Cap in bytes/s for each download (0 = unlimited)
+            shared: (state, lock) from another limiter's shared_state(); used
+                by worker processes to attach to the parent's bucket
+        """
+        if shared is not None:
+            self._state, self._lock = shared
+            return
+
+        ctx = multiprocessing.get_context('spawn')
+        self._state = ctx.RawArray('d', 4)
+        self._lock = ctx.Lock()
+        self._state[_TOKENS] = 0.0
+        self._state[_LAST_REFILL] = time.monotonic()
+        self.set_limits(rate, per_download_rate)
+
+    def shared_state(self):
+        """Shared-memory handles to pass to worker processes at creation"""
+        return self._state, self._lock
+
+    def set_limits(self, rate: float, per_download_rate: float):
+        """
+        Change limits at runtime (applies to running downloads immediately)
+
+        Args:
+            rate: Total cap in bytes/s (0 = unlimited)
+            per_download_rate: Per-download cap in bytes/s (0 = unlimited)
+        """
+        with self._lock:
+            self._state[_RATE] = max(0.0, float(rate or 0))
+            self._state[_PER_DOWNLOAD_RATE] = max(0.0, float(per_download_rate or 0))
+            # 버킷을 새 상한 기준으로 초기화 (누적 대기 시간 제거)
+            self._state[_TOKENS] = self._state[_RATE] * BURST_SECONDS
+            self._state[_LAST_REFILL] = time.monotonic()
+        logger.info(f"Bandwidth limits set: total={rate or 'unlimited'} B/s, per-download={per_download_rate or 'unlimited'} B/s")
+
+    def get_limits(self) -> Dict:
+        """Current limits in bytes/s (0 = unlimited)"""
+        return {
+            'limit': int(self._state[_RATE]),
+            'per_download_limit': int(self._state[_PER_DOWNLOAD_RATE]),
+        }
+
+    def throttle(self, downloaded_bytes: int, rate_state: DownloadRateState):
+        """
+        Account bytes reported by a progress hook and sleep if over a limit
+
+        Called from yt-dlp progress hooks; sleeping there stalls only the
+        thread that is reading this download's data.
+
+        Args:
+            downloaded_bytes: Cumulative bytes of the current file (from hook)
+            rate_state: Per-download state
+        """
+        with rate_state.lock:
+            last = rate_state.last_bytes
+            # 값이 줄었으면 다음 파일(영상→음성 등)로 넘어간 것
+            nbytes = downloaded_bytes - last if downloaded_bytes >= last else downloaded_bytes
+            rate_state.last_bytes = downloaded_bytes
+        self.consume(nbytes, rate_state)
+
+    def consume(self, nbytes: int, rate_state: DownloadRateState):
+        """
+        Account bytes just transferred and sleep if over a limit
+
+        Takes a byte count instead of a cumulative total, so several threads
+        of one download (segmented transfer) can each throttle themselves.
+
+        Args:
+            nbytes: Bytes transferred since this caller's last call
+            rate_state: Per-download state
+        """
+        if nbytes <= 0:
+            return
+
+        wait = 0.0
+        now = time.monotonic()
+
+        # 전체 상한: 토큰을 먼저 차감하고(부채 허용), 부족분만큼 대기
+        with self._lock:
+            rate = self._state[_RATE]
+            per_download_rate = self._state[_PER_DOWNLOAD_RATE]
+            if rate > 0:
+                elapsed = now - self._state[_LAST_REFILL]
+                tokens = min(rate * BURST_SECONDS, self._state[_TOKENS] + elapsed * rate)
+                tokens -= nbytes
+                self._state[_TOKENS] = tokens
+                self._state[_LAST_REFILL] = now
+                if tokens < 0:
+                    wait = -tokens / rate
+
+        # 다운로드별 상한
+        if per_download_rate > 0:
+            with rate_state.lock:
+                start = max(now, rate_state.debt_until)
+                rate_state.debt_until = start + nbytes / per_download_rate
+                wait = max(wait, rate_state.debt_until - now - BURST_SECONDS)
+
+        if wait > 0:
+            time.sleep(wait)
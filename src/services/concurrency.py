@@ -0,0 +1,194 @@
+"""
+Adaptive Download Concurrency Controller
+
+AIMD-style control of how many downloads run at once:
+- Additive increase: +1 while all slots are busy and the last step up
+  actually raised aggregate throughput
+- Step back: -1 when the last increase did not improve throughput
+- Multiplicative decrease: halve on throttle signals (HTTP 429 / bot check)
+  or a high error rate
+
+Throughput is measured from the downloader's progress hooks
+(YTBulkDownloader.get_transferred_bytes). Every change is recorded with its
+reason so the current level can be explained.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyController:
+    """Download slot gate whose size is adjusted from throughput and error signals"""
+
+    # 직전 증가가 처리량을 이만큼(비율) 이상 올리지 못하면 한 단계 되돌림
+    MIN_GAIN = 0.05
+    # 구간 내 실패 비율이 이 이상이면 (최소 2건) 감소
+    ERROR_RATE_LIMIT = 0.3
+
+    def __init__(self, downloader, initial: Optional[int] = None,
+                 min_limit: Optional[int] = None, max_limit: Optional[int] = None,
+                 adaptive: Optional[bool] = None, interval: Optional[float] = None):
+        """
+        Initialize controller
+
+        Args:
+            downloader: YTBulkDownloader (source of transferred-bytes counter)
+            initial: Starting target (default: Config.DOWNLOAD_WORKERS)
+            min_limit: Lower bound (default: Config.DOWNLOAD_WORKERS_MIN)
+            max_limit: Upper bound (default: Config.DOWNLOAD_WORKERS_MAX)
+            adaptive: False keeps the target fixed (default: Config.ADAPTIVE_CONCURRENCY)
+            interval: Seconds between evaluations (default: Config.ADAPTIVE_CONCURRENCY_INTERVAL)
+        """
+        self.downloader = downloader
+        self.min_limit = max(1, min_limit or Config.DOWNLOAD_WORKERS_MIN)
+        self.max_limit = max(self.min_limit, max_limit or Config.DOWNLOAD_WORKERS_MAX)
+        self.adaptive = Config.ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        self.interval = interval or Config.ADAPTIVE_CONCURRENCY_INTERVAL
+
+        initial = initial or Config.DOWNLOAD_WORKERS
+        self.target = min(self.max_limit, max(self.min_limit, initial))
+        self.active = 0
+
+        self._cond = threading.Condition()
+        self._history = deque(maxlen=100)  # [{time, target, reason}]
+        self._throughput = 0.0             # 마지막 구간 처리량 (bytes/s)
+        self._saturated = False            # 마지막 구간 동안 슬롯이 모두 사용 중이었는지
+        self._prev_level_throughput = None # 직전 증가 이전 수준의 처리량
+        self._pending_check = False        # 직전 증가 효과를 다음 구간에서 확인
+        self._hold_until = 0.0             # 되돌림 후 재증가 보류 시각
+        self._window = {'done': 0, 'failed': 0, 'throttled': 0}
+        self._thread = None
+
+        self._record(self.target, "initial")
+
+    def start(self):
+        """Start the periodic evaluation thread (idempotent)"""
+        if not self.adaptive or self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name="concurrency-controller", daemon=True)
+        self._thread.start()
+
+    def acquire(self):
+        """Block until a download slot is free under the current target"""
+        with self._cond:
+            while self.active >= self.target:
+                self._cond.wait()
+            self.active += 1
+            if self.active >= self.target:
+                self._saturated = True
+
+    def release(self):
+        """Return a download slot"""
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def record_result(self, result: Dict):
+        """
+        Feed a download outcome into the current window
+
+        Args:
+            result: download_with_archive() result dictionary
+        """
+        with self._cond:
+            if result.get('reason') == 'Throttled':
+                self._window['throttled'] += 1
+            elif result['status'] == 'failed':
+                self._window['failed'] += 1
+            elif result['status'] == 'done':
+                self._window['done'] += 1
+
+    def get_status(self) -> Dict:
+        """Current target, measurements and the reason for each change"""
+        with self._cond:
+            return {
+                'adaptive': self.adaptive,
+                'target': self.target,
+                'active': self.active,
+                'min': self.min_limit,
+                'max': self.max_limit,
+                'throughput': self._throughput,
+                'history': list(self._history),
+            }
+
+    def _record(self, target: int, reason: str):
+        self._history.append({'time': time.time(), 'target': target, 'reason': reason})
+
+    def _set_target(self, target: int, reason: str):
+        """Change target (caller holds lock)"""
+        target = min(self.max_limit, max(self.min_limit, target))
+        if target == self.target:
+            return
+        logger.info(f"Download concurrency {self.target} → {target}: {reason}")
+        self.target = target
+        self._record(target, reason)
+        self._cond.notify_all()
+
+    def _run(self):
+        last_bytes = self.downloader.get_transferred_bytes()
+        last_time = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            now_bytes = self.downloader.get_transferred_bytes()
+            now = time.monotonic()
+            throughput = (now_bytes - last_bytes) / max(now - last_time, 1e-6)
+            last_bytes, last_time = now_bytes, now
+            try:
+                self._evaluate(throughput)
+            except Exception as e:
+                logger.error(f"Concurrency controller error: {e}")
+
+    def _evaluate(self, throughput: float):
+        """One AIMD step from the last window's measurements"""
+        with self._cond:
+            window = self._window
+            self._window = {'done': 0, 'failed': 0, 'throttled': 0}
+            saturated = self._saturated or self.active >= self.target
+            self._saturated = False
+            self._throughput = throughput
+            mb = throughput / 1024 ** 2
+
+            # 1) 요청 제한 신호 → 절반으로 감소
+            if window['throttled']:
+                self._pending_check = False
+                self._hold_until = time.monotonic() + self.interval * 6
+                self._set_target(self.target // 2, f"throttled by YouTube ({window['throttled']} in window)")
+                return
+
+            # 2) 실패율이 높으면 절반으로 감소
+            finished = window['done'] + window['failed']
+            if window['failed'] >= 2 and window['failed'] / finished >= self.ERROR_RATE_LIMIT:
+                self._pending_check = False
+                self._hold_until = time.monotonic() + self.interval * 3
+                self._set_target(self.target // 2, f"error rate {window['failed']}/{finished} in window")
+                return
+
+            if not saturated or throughput <= 0:
+                # 대기열이 비었거나 전송이 없으면 판단 보류
+                self._pending_check = False
+                return
+
+            # 3) 직전 증가가 처리량을 올렸는지 확인 → 아니면 한 단계 되돌림
+            if self._pending_check:
+                self._pending_check = False
+                prev = self._prev_level_throughput or 0
+                if throughput < prev * (1 + self.MIN_GAIN):
+                    self._hold_until = time.monotonic() + self.interval * 6
+                    self._set_target(
+                        self.target - 1,
+                        f"no throughput gain at {self.target} ({mb:.2f}MB/s vs {prev / 1024 ** 2:.2f}MB/s)"
+                    )
+                    return
+
+            # 4) 모든 슬롯 사용 중 + 신호 없음 → 1 증가
+            if self.target < self.max_limit and time.monotonic() >= self._hold_until:
+                self._prev_level_throughput = throughput
+                self._pending_check = True
+                self._set_target(self.target + 1, f"all {self.target} slots busy at {mb:.2f}MB/s, probing up")
@@ -0,0 +1,240 @@
+"""
+Disk Space Guard
+
+Admission step in front of the transfer stage. Each item's output size is
+estimated from the prefetched formats (filesize / filesize_approx) and
+reserved against the free space of its output volume (and of its workspace
+volume, when Config.DOWNLOAD_TEMP_DIR is elsewhere) before the transfer
+starts. When the next item does not fit, the queue pauses (items wait in
+order) instead of filling the disk, and resumes when running downloads
+finish and return their reservations or space is freed. An item that does
+not fit even with no other reservation on its volume fails with
+DiskFullError instead of waiting forever.
+
+Reservations are held until the item ends (post-processing included), since
+merging needs room for the parts and the merged file at the same time. Bytes
+already written to an item's workspace are part of the volume's used space,
+so only the remainder of each reservation is counted against free space.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, List, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 예상 크기 여유 비율 (filesize_approx 오차)
+ESTIMATE_MARGIN = 1.1
+
+
+def estimate_download_size(info: Optional[Dict], quality: str) -> Optional[int]:
+    """
+    Peak disk usage of a download from extract_video_info() formats
+
+    Args:
+        info: Prefetched info dict (None = unknown)
+        quality: Requested quality ('audio' extracts after download)
+
+    Returns:
+        Bytes, or None when the formats carry no size information
+    """
+    if not info:
+        return None
+    formats = info.get('requested_formats') or [info]
+    total = 0
+    for f in formats:
+        size = f.get('filesize') or f.get('filesize_approx')
+        if not size and f.get('tbr') and info.get('duration'):
+            size = f['tbr'] * 125 * info['duration']  # kbps → bytes/s
+        if not size:
+            return None
+        total += size
+    # 병합/변환 중에는 원본 조각과 결과 파일이 함께 존재
+    if len(formats) > 1 or quality == 'audio':
+        total *= 2
+    return int(total * ESTIMATE_MARGIN)
+
+
+def _existing_parent(path: str) -> str:
+    """아직 없는 출력 폴더는 가장 가까운 상위 폴더 기준으로 확인"""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _dir_size(path: Optional[str]) -> int:
+    """작업 폴더에 이미 기록된 바이트 (없으면 0)"""
+    total = 0
+    if not path:
+        return total
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return total
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                total += _dir_size(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass  # 진행 중 삭제/이동된 파일
+    return total
+
+
+class DiskFullError(OSError):
+    """The item does not fit on its volume even with no other reservations"""
+
+
+class DiskSpaceGuard:
+    """Per-volume space reservations with an in-order waiting line"""
+
+    def __init__(self, margin: Optional[int] = None, fallback_estimate: Optional[int] = None,
+                 interval: Optional[float] = None):
+        """
+        Initialize guard
+
+        Args:
+            margin: Bytes always left free on a volume (default: Config.DISK_FREE_MARGIN)
+            fallback_estimate: Reservation when the size is unknown (default: Config.DISK_FALLBACK_ESTIMATE)
+            interval: Seconds between free-space re-checks while paused (default: Config.DISK_CHECK_INTERVAL)
+        """
+        self.margin = Config.DISK_FREE_MARGIN if margin is None else margin
+        self.fallback_estimate = fallback_estimate or Config.DISK_FALLBACK_ESTIMATE
+        self.interval = interval or Config.DISK_CHECK_INTERVAL
+        self._cond = threading.Condition()
+        # {key: [{volume, path, bytes, workspace, written, scanned_at}]}
+        self._reservations: Dict[Hashable, List[Dict]] = {}
+        self._waiting = deque()                                # 대기 순서 (key)
+        self._blocked: Optional[Dict] = None                   # 대기열 맨 앞 항목의 부족 정보
+
+    def _holds(self):
+        return (h for holds in self._reservations.values() for h in holds)
+
+    def _written(self, hold: Dict) -> int:
+        """Bytes a hold's workspace already has (rescanned at most once per interval)"""
+        if hold['workspace'] is None:
+            return 0
+        now = time.monotonic()
+        if now - hold['scanned_at'] >= self.interval:
+            hold['written'] = _dir_size(hold['workspace'])
+            hold['scanned_at'] = now
+        return hold['written']
+
+    def _reserved_on(self, volume: int) -> int:
+        """아직 기록되지 않은 예약 바이트 (이미 쓴 부분은 free에서 이미 빠져 있음)"""
+        return sum(max(0, h['bytes'] - self._written(h))
+                   for h in self._holds() if h['volume'] == volume)
+
+    def reserve(self, key: Hashable, path: str, nbytes: Optional[int],
+                is_cancelled: Callable[[], bool],
+                on_wait: Optional[Callable[[int, int], None]] = None,
+                workspace: Optional[str] = None) -> bool:
+        """
+        Block until nbytes fit on path's volume (and workspace's), then reserve them
+
+        A workspace on another volume (Config.DOWNLOAD_TEMP_DIR) is where the
+        transfer and merge actually write, so nbytes are held there as well;
+        the output volume still needs room for the finished file.
+
+        Args:
+            key: Reservation key (released with release(key))
+            path: Output directory
+            nbytes: Estimated size (None = fallback estimate)
+            is_cancelled: Polled while waiting; True aborts the wait
+            on_wait: Called while paused with (needed bytes, available bytes)
+            workspace: Folder the item writes into; its current size counts
+                as already used (resumed .part files, progress of running items)
+
+        Returns:
+            False if cancelled while waiting
+
+        Raises:
+            DiskFullError: Nothing else holds space on a volume and the
+                item still does not fit there, so waiting would never end
+        """
+        nbytes = nbytes or self.fallback_estimate
+        targets = [(_existing_parent(path), None)]
+        if workspace:
+            ws_target = _existing_parent(workspace)
+            if os.stat(ws_target).st_dev == os.stat(targets[0][0]).st_dev:
+                targets = [(targets[0][0], workspace)]
+            else:
+                # 출력 폴더에는 완료 파일 복사분만 기록되므로 작업 폴더 크기로 빼지 않음
+                targets.append((ws_target, workspace))
+        # 대기 중인 항목의 작업 폴더는 변하지 않으므로 잠금 밖에서 한 번만 확인
+        now = time.monotonic()
+        holds = [{'volume': os.stat(target).st_dev, 'path': target, 'bytes': nbytes, 'workspace': ws,
+                  'written': _dir_size(ws), 'scanned_at': now}
+                 for target, ws in targets]
+
+        with self._cond:
+            self._waiting.append(key)
+            try:
+                while True:
+                    if is_cancelled():
+                        return False
+                    if self._waiting[0] == key:
+                        shortfall = None
+                        for hold in holds:
+                            available = (shutil.disk_usage(hold['path']).free
+                                         - self._reserved_on(hold['volume']) - self.margin)
+                            needed = max(0, nbytes - hold['written'])
+                            if needed > available:
+                                shortfall = (hold, needed, available)
+                                break
+                        if shortfall is None:
+                            self._reservations[key] = holds
+                            self._blocked = None
+                            return True
+                        hold, needed, available = shortfall
+                        target = hold['path']
+                        if not any(h['volume'] == hold['volume'] for h in self._holds()):
+                            # 반납될 예약이 없으면 기다려도 공간이 생기지 않음
+                            raise DiskFullError(
+                                f"Not enough disk space on {target}: {needed / 1024 ** 2:.0f}MB needed, "
+                                f"{max(0, available) / 1024 ** 2:.0f}MB available"
+                            )
+                        if self._blocked is None:
+                            logger.warning(
+                                f"Download queue paused: {needed / 1024 ** 2:.0f}MB needed, "
+                                f"{max(0, available) / 1024 ** 2:.0f}MB available on {target}"
+                            )
+                        self._blocked = {'path': target, 'needed': needed, 'available': max(0, available)}
+                        if on_wait:
+                            on_wait(needed, max(0, available))
+                    # 반납(notify) 또는 주기적 재확인 (사용자가 공간을 비운 경우)
+                    self._cond.wait(self.interval)
+            finally:
+                if self._waiting[0] == key:
+                    self._blocked = None  # 다음 항목이 다시 판단
+                self._waiting.remove(key)
+                self._cond.notify_all()
+
+    def release(self, key: Hashable):
+        """Return a reservation (no-op if none)"""
+        with self._cond:
+            if self._reservations.pop(key, None) is not None:
+                self._cond.notify_all()
+
+    def get_status(self) -> Dict:
+        """Pause state, reserved bytes and the shortfall that caused the pause"""
+        with self._cond:
+            return {
+                'paused': self._blocked is not None,
+                'waiting': len(self._waiting),
+                'reservations': len(self._reservations),
+                'reserved': sum(h['bytes'] for h in self._holds()),
+                'margin': self.margin,
+                'blocked': dict(self._blocked) if self._blocked else None,
+            }
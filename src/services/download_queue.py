@@ -0,0 +1,793 @@
+"""
+Download Job Queue Service
+
+Server-side batch downloads: a batch of video IDs is submitted once as a job,
+and worker threads run each item through a staged pipeline:
+
+1. extract: prefetch threads resolve the next items' formats
+   (extract_video_info) while earlier items are still transferring
+2. transfer: download_video with the prefetched info, limited by the
+   concurrency controller
+3. post-process: ffmpeg merge/convert, limited by the downloader's
+   post-processing semaphore; the transfer slot is handed back as soon as
+   an item reports 'converting', so the network stays busy during merges
+
+Clients only watch job status; every stage reports into the progress map.
+
+Transient failures (format, rename, network, throttling) are re-queued by a
+RetryScheduler with per-class backoff, so workers never sleep between
+attempts. Items that exhaust their retries land in a dead-letter list that
+can be retried in bulk.
+
+Before a transfer starts, its estimated size is reserved against the free
+space of the output and workspace volumes (DiskSpaceGuard); the queue pauses while the
+next item would not fit, and the item fails if it could never fit.
+
+With a JobStore attached, every state change is written to disk and
+unfinished jobs are resumed when the queue starts.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from services.concurrency import AdaptiveConcurrencyController
+from services.disk_space import DiskFullError, DiskSpaceGuard, estimate_download_size
+from services.download_archive import get_archive
+from services.downloader import RETRYABLE_RESULTS
+from services.job_store import JobStore
+from services.retry import ERROR_CLASS_LABELS, RetryScheduler, backoff_delay
+from services.scheduler import DownloadScheduler
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 항목 최종 상태 (더 이상 워커가 처리하지 않음)
+FINAL_STATUSES = {'done', 'skipped', 'failed', 'cancelled'}
+
+
+def is_already_downloaded(duplicate_filter, video_id: str, output_dir: str) -> bool:
+    """Check archive and existing files in output_dir"""
+    return get_archive(output_dir).has_video(video_id) or duplicate_filter.is_file_downloaded(video_id, output_dir)
+
+
+def download_with_archive(downloader, duplicate_filter, video_id: str,
+                          quality: str, output_dir: str,
+                          cancel_event: Optional[threading.Event] = None,
+                          info: Optional[Dict] = None, permissive: bool = False) -> Dict:
+    """
+    Download one video with archive-based skip handling
+
+    Args:
+        downloader: YTBulkDownloader instance
+        duplicate_filter: DuplicateFilter instance
+        video_id: YouTube video ID
+        quality: Preferred quality
+        output_dir: Output directory path
+        cancel_event: Cancellation token for this download only
+        info: Prefetched extract_video_info() result (optional)
+        permissive: Use the permissive fallback format
+
+    Returns:
+        Dictionary with 'status' (done/skipped/cancelled/failed) and details;
+        retryable failures also carry 'error_class'
+    """
+    archive = get_archive(output_dir)
+
+    # 스킵 체크: 이미 다운로드된 파일인지 확인
+    if is_already_downloaded(duplicate_filter, video_id, output_dir):
+        logger.info(f"Skipping already downloaded: {video_id}")
+        return {'status': 'skipped', 'reason': None}
+
+    filepath = downloader.download_video(
+        video_id, quality, output_dir, cancel_event=cancel_event, info=info, permissive=permissive
+    )
+
+    if filepath == "CANCELLED":
+        return {'status': 'cancelled'}
+    elif filepath == "MEMBERSHIP_SKIP":
+        # 멤버십 전용 영상 → 아카이브에 기록하여 다음에 스킵
+        archive.add_video(video_id)
+        return {'status': 'skipped', 'reason': 'Membership'}
+    elif filepath in RETRYABLE_RESULTS:
+        error_class = RETRYABLE_RESULTS[filepath]
+        return {'status': 'failed', 'reason': ERROR_CLASS_LABELS[error_class], 'error_class': error_class}
+    elif filepath == "AGE_RESTRICTED_SKIP":
+        # 성인인증 필요 영상 → 아카이브에 기록하여 다음에 스킵
+        archive.add_video(video_id)
+        return {'status': 'skipped', 'reason': 'Adult'}
+    elif filepath:
+        # 다운로드 성공 → 아카이브에 기록
+        archive.add_video(video_id)
+        return {'status': 'done', 'filepath': filepath}
+    else:
+        return {'status': 'failed'}
+
+
+class DownloadJobQueue:
+    """Job queue with a worker pool for server-side batch downloads"""
+
+    def __init__(self, downloader, duplicate_filter, workers: Optional[int] = None, executor=None,
+                 controller: Optional[AdaptiveConcurrencyController] = None,
+                 store: Optional[JobStore] = None, policy: Optional[str] = None,
+                 disk_guard: Optional[DiskSpaceGuard] = None):
+        """
+        Initialize job queue
+
+        Args:
+            downloader: YTBulkDownloader instance shared by all workers
+            duplicate_filter: DuplicateFilter instance for skip checks
+            workers: Initial concurrent downloads (default: Config.DOWNLOAD_WORKERS)
+            executor: Object with extract_video_info()/download_video() that runs the
+                actual work (e.g. ProcessDownloadExecutor); defaults to the downloader itself
+            controller: Concurrency controller (default: adaptive, starting at `workers`)
+            store: JobStore for crash-safe persistence (None = in-memory only)
+            policy: Scheduling policy (default: Config.DOWNLOAD_SCHEDULING_POLICY)
+            disk_guard: Free-space admission (default: DiskSpaceGuard with Config values)
+        """
+        self.downloader = downloader
+        self.executor = executor or downloader
+        self.duplicate_filter = duplicate_filter
+        self.controller = controller or AdaptiveConcurrencyController(downloader, initial=workers)
+        self.store = store
+        self.disk_guard = disk_guard or DiskSpaceGuard()
+        # 전송 스레드는 (전송 최대치 + 후처리 슬롯 + 후처리 대기열)만큼 두고, 실제 동시 전송 수는
+        # controller가 제한. 후처리 대기열이 가득 차면 새 전송이 멈춤 (미병합 파일 누적 방지)
+        self.worker_count = (
+            self.controller.max_limit
+            + self.downloader.postprocess_scheduler.workers
+            + max(0, Config.POSTPROCESS_QUEUE_MAX)
+        )
+        self.extract_worker_count = max(1, Config.PIPELINE_EXTRACT_WORKERS)
+        self.prefetch = Config.PIPELINE_PREFETCH > 0
+        self._queue = DownloadScheduler(policy or Config.DOWNLOAD_SCHEDULING_POLICY)
+        # 추출 단계 → 전송 단계 (scheduler entry, info). 가득 차면 추출 스레드가 대기
+        self._ready = queue.Queue(maxsize=max(1, Config.PIPELINE_PREFETCH))
+        self._prefetched = {}             # {(job_id, index): info} 순서 재조정으로 되돌린 항목의 추출 결과
+        self._transfer_slots = {}         # {video_id: slot dict} 전송 슬롯을 가진 다운로드
+        self._retry = RetryScheduler(self._retry_due)
+        self._dead_letters = {}           # store가 없을 때의 메모리 dead-letter 목록 {id: entry}
+        self._dead_letter_seq = 0
+        self._jobs = {}                   # {job_id: job dict} (끝난 작업은 보관 한도까지만 유지)
+        self._cancel_tokens = {}          # {(job_id, index): threading.Event} 실행 중 항목의 취소 토큰
+        self._lock = threading.Lock()
+        self._seq = 0                     # 항목 상태 변경 시마다 증가 (스트림 변경 감지용)
+        self._workers: List[threading.Thread] = []
+
+    def start(self):
+        """Start worker threads and resume unfinished jobs from the store (idempotent)"""
+        with self._lock:
+            if self._workers:
+                return
+            for n in range(self.extract_worker_count):
+                t = threading.Thread(target=self._prefetch_loop, name=f"download-extract-{n}", daemon=True)
+                t.start()
+                self._workers.append(t)
+            for n in range(self.worker_count):
+                t = threading.Thread(target=self._worker_loop, name=f"download-worker-{n}", daemon=True)
+                t.start()
+                self._workers.append(t)
+        self.downloader.add_progress_listener(self._on_progress)
+        self.controller.start()
+        self._retry.start()
+        self._resume_from_store()
+        logger.info(
+            f"Download queue started: {self.extract_worker_count} extract / {self.worker_count} transfer "
+            f"thread(s), concurrency target {self.controller.target}"
+        )
+
+    def shutdown(self):
+        """Release executor resources (worker processes)"""
+        if self.executor is not self.downloader and hasattr(self.executor, 'shutdown'):
+            self.executor.shutdown()
+
+    def _resume_from_store(self):
+        """Re-queue pending, interrupted and retrying items of jobs left over from the last run"""
+        if not self.store:
+            return
+        try:
+            jobs = self.store.load_unfinished()
+        except Exception as e:
+            logger.error(f"Failed to load saved download jobs: {e}")
+            return
+
+        for job in jobs:
+            # 실행 중에 종료된 항목은 다시 대기 상태로 (yt-dlp가 .part 파일에서 이어받음)
+            interrupted = [i for i, item in enumerate(job['items']) if item['status'] == 'running']
+            for index in interrupted:
+                job['items'][index]['status'] = 'pending'
+            with self._lock:
+                self._jobs[job['id']] = job
+                self._update_job_status(job)
+                self._persist(job, interrupted)
+            pending = [i for i, item in enumerate(job['items']) if item['status'] == 'pending']
+            for index in pending:
+                self._enqueue(job, index)
+            # 백오프 대기 중이던 항목은 남은 시간 후 재시도 (이미 지났으면 즉시)
+            retrying = [i for i, item in enumerate(job['items']) if item['status'] == 'retrying']
+            for index in retrying:
+                self._retry.schedule(job['id'], index, job['items'][index].get('retry_at') or time.time())
+            logger.info(
+                f"Resumed job {job['id']}: {len(pending) + len(retrying)} of {len(job['items'])} item(s) remaining"
+            )
+
+    def submit(self, items: List[Dict], quality: str, priority: int = 0) -> Dict:
+        """
+        Submit a batch of videos as a new job
+
+        Args:
+            items: List of dicts with video_id, title, output_dir and
+                optional duration (seconds) / priority
+            quality: Preferred quality for every item in the job
+            priority: Default priority for items without their own (higher runs first)
+
+        Returns:
+            Job snapshot dictionary
+        """
+        self.start()
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'id': job_id,
+            'quality': quality,
+            'status': 'queued',
+            'created_at': time.time(),
+            'finished_at': None,
+            'cancel_requested': False,
+            'items': [
+                {
+                    'video_id': item['video_id'],
+                    'title': item.get('title') or '',
+                    'output_dir': item['output_dir'],
+                    'duration': item.get('duration'),
+                    'priority': item.get('priority') if item.get('priority') is not None else priority,
+                    'status': 'pending',
+                    'reason': None,
+                    'filepath': None,
+                    'attempts': 0,            # 실패 후 재시도 횟수
+                    'error_class': None,
+                    'error': None,
+                    'retry_at': None,
+                    'permissive': False,      # 포맷 오류 후 관대한 포맷 사용
+                }
+                for item in items
+            ],
+        }
+
+        with self._lock:
+            self._jobs[job_id] = job
+            if self.store:
+                self.store.save_job(job)
+
+        for index in range(len(job['items'])):
+            self._enqueue(job, index)
+        # 이미 추출을 마친 낮은 우선순위 항목이 새 작업보다 먼저 전송되지 않도록
+        top = max((item['priority'] or 0 for item in job['items']), default=0)
+        with self._ready.mutex:
+            outranked = any(entry['priority'] < top for entry, _ in self._ready.queue)
+        if outranked:
+            self._requeue_ready()
+
+        logger.info(f"Job {job_id} submitted: {len(items)} item(s), quality={quality}")
+        return self.get_job(job_id)
+
+    def _enqueue(self, job: Dict, index: int):
+        """Hand an item to the scheduler (fair-share group = output folder)"""
+        item = job['items'][index]
+        self._queue.put(
+            job['id'], index,
+            priority=item.get('priority', 0),
+            duration=item.get('duration'),
+            group=item['output_dir'],
+        )
+
+    def set_policy(self, policy: str):
+        """Change the scheduling policy; queued and prefetched items are reordered (raises ValueError)"""
+        self._queue.set_policy(policy)
+        self._requeue_ready()
+
+    def _requeue_ready(self):
+        """
+        Hand prefetched items back to the scheduler so they are ordered again
+
+        Used when a higher-priority job arrives or the policy changes; items
+        keep their submission position and their extracted info.
+        """
+        requeued = 0
+        while True:
+            try:
+                entry, info = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if info is not None:
+                with self._lock:
+                    self._prefetched[(entry['job_id'], entry['index'])] = info
+            self._queue.requeue(entry)
+            requeued += 1
+        if requeued:
+            logger.debug(f"{requeued} prefetched item(s) returned to the scheduler")
+
+    def get_pipeline_status(self) -> Dict:
+        """Occupancy of each pipeline stage"""
+        return {
+            'extract': {
+                'workers': self.extract_worker_count,
+                'prefetch': self.prefetch,
+                'ready': self._ready.qsize(),
+                'ready_max': self._ready.maxsize,
+            },
+            'transfer': {
+                'active': self.controller.active,
+                'target': self.controller.target,
+                'connections': self.downloader.fragment_tuner.get_status(),
+            },
+            'postprocess': {
+                **self.downloader.postprocess_scheduler.get_status(),
+                'queue_max': Config.POSTPROCESS_QUEUE_MAX,
+            },
+            'disk': self.disk_guard.get_status(),
+        }
+
+    def get_scheduler_status(self) -> Dict:
+        """Current scheduling policy and queue depth per priority"""
+        return self._queue.get_status()
+
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancel a job: drop pending items and stop this job's in-flight downloads
+
+        Other jobs' downloads are not affected.
+
+        Returns:
+            False if job does not exist
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return False
+            job['cancel_requested'] = True
+            changed = []
+            for index, item in enumerate(job['items']):
+                if item['status'] in ('pending', 'retrying'):
+                    item['status'] = 'cancelled'
+                    changed.append(index)
+                elif item['status'] == 'running':
+                    self._cancel_tokens[(job_id, index)].set()
+            self._update_job_status(job)
+            self._persist(job, changed)
+
+        logger.info(f"Job {job_id} cancel requested")
+        return True
+
+    def cancel_item(self, job_id: str, index: int) -> bool:
+        """
+        Cancel a single item of a job (pending, retrying or running)
+
+        Returns:
+            False if the item does not exist or is already finished
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or not 0 <= index < len(job['items']):
+                return False
+            item = job['items'][index]
+            if item['status'] in ('pending', 'retrying'):
+                item['status'] = 'cancelled'
+                self._update_job_status(job)
+                self._persist(job, [index])
+            elif item['status'] == 'running':
+                self._cancel_tokens[(job_id, index)].set()
+            else:
+                return False
+
+        logger.info(f"Job {job_id} item {index} ({item['video_id']}) cancel requested")
+        return True
+
+    def _load_evicted(self, job_id: str) -> Optional[Dict]:
+        """Finished job that was dropped from memory, read back from the store"""
+        if not self.store:
+            return None
+        try:
+            return self.store.load_job(job_id)
+        except Exception as e:
+            logger.error(f"Failed to load job {job_id}: {e}")
+            return None
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get job snapshot with per-item status and live progress"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return self._snapshot(job)
+        job = self._load_evicted(job_id)
+        if not job:
+            return None
+        with self._lock:
+            return self._snapshot(job)
+
+    def get_job_state(self, job_id: str) -> Optional[Dict]:
+        """
+        Lightweight job state for the progress stream
+
+        Returns:
+            Dict with job status, change counter and (video_id, status, reason)
+            per item, or None if job does not exist
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            seq = self._seq
+        if not job:
+            job = self._load_evicted(job_id)
+            if not job:
+                return None
+        with self._lock:
+            return {
+                'id': job['id'],
+                'status': job['status'],
+                'seq': seq,
+                'items': [(item['video_id'], item['status'], item['reason']) for item in job['items']],
+            }
+
+    def list_jobs(self) -> List[Dict]:
+        """Get summary of all jobs (without per-item details)"""
+        with self._lock:
+            summaries = []
+            for job in self._jobs.values():
+                snap = self._snapshot(job)
+                snap.pop('items')
+                summaries.append(snap)
+            return summaries
+
+    def get_unfinished_video_ids(self) -> Set[str]:
+        """
+        Video IDs of items that will still be downloaded (pending, running, retrying)
+
+        Includes saved jobs not loaded yet, so their workspaces (.part files
+        to resume from) are not treated as stale.
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+            video_ids = {item['video_id'] for job in jobs for item in job['items']
+                         if item['status'] not in FINAL_STATUSES}
+        if self.store:
+            try:
+                saved = self.store.load_unfinished()
+            except Exception as e:
+                logger.error(f"Failed to load saved download jobs: {e}")
+                saved = []
+            video_ids.update(item['video_id'] for job in saved for item in job['items']
+                             if item['status'] not in FINAL_STATUSES)
+        return video_ids
+
+    def _snapshot(self, job: Dict) -> Dict:
+        """Build a JSON-serializable copy of a job (caller holds lock)"""
+        counts = {}
+        items = []
+        for item in job['items']:
+            counts[item['status']] = counts.get(item['status'], 0) + 1
+            entry = dict(item)
+            entry.pop('output_dir')
+            if item['status'] in ('running', 'done'):
+                entry['progress'] = self.downloader.get_progress(item['video_id'])
+            items.append(entry)
+
+        return {
+            'id': job['id'],
+            'quality': job['quality'],
+            'status': job['status'],
+            'created_at': job['created_at'],
+            'finished_at': job['finished_at'],
+            'total': len(job['items']),
+            'counts': counts,
+            'items': items,
+        }
+
+    def _update_job_status(self, job: Dict):
+        """Recompute job status from item statuses (caller holds lock)"""
+        self._seq += 1
+        statuses = [item['status'] for item in job['items']]
+        if all(s in FINAL_STATUSES for s in statuses):
+            newly_finished = job['status'] not in ('completed', 'cancelled')
+            if newly_finished:
+                job['finished_at'] = time.time()
+            job['status'] = 'cancelled' if job['cancel_requested'] else 'completed'
+            if newly_finished:
+                self._evict_finished_jobs()
+        elif any(s != 'pending' for s in statuses):
+            job['status'] = 'running'
+
+    def _evict_finished_jobs(self):
+        """
+        Drop finished jobs from memory past the retention limits (caller holds lock)
+
+        Keeps at most Config.FINISHED_JOBS_IN_MEMORY finished jobs, none older
+        than Config.FINISHED_JOB_MEMORY_TTL. With a store, evicted jobs can
+        still be looked up by ID; without one they are gone.
+        """
+        finished = sorted(
+            (job for job in self._jobs.values() if job['status'] in ('completed', 'cancelled')),
+            key=lambda job: job['finished_at'] or 0,
+            reverse=True,
+        )
+        cutoff = time.time() - Config.FINISHED_JOB_MEMORY_TTL
+        keep = max(1, Config.FINISHED_JOBS_IN_MEMORY)
+        for n, job in enumerate(finished):
+            if n >= keep or (job['finished_at'] or 0) < cutoff:
+                del self._jobs[job['id']]
+
+    def _persist(self, job: Dict, indexes: List[int]):
+        """Write job status and changed items to the store (caller holds lock)"""
+        if self.store:
+            self.store.update(job, indexes)
+
+    def _prefetch_loop(self):
+        """Extraction stage: pull items in scheduler order and resolve formats ahead"""
+        while True:
+            entry = self._queue.take()
+            info = None
+            try:
+                info = self._prefetch_item(entry['job_id'], entry['index'])
+            except Exception as e:
+                logger.error(f"Unexpected error in extract worker: {e}")
+            self._ready.put((entry, info))
+
+    def _prefetch_item(self, job_id: str, index: int) -> Optional[Dict]:
+        """Extract one item's info (None when cancelled, already downloaded or failed)"""
+        if not self.prefetch:
+            return None
+        with self._lock:
+            # 순서 재조정으로 되돌아온 항목은 다시 추출하지 않음
+            info = self._prefetched.pop((job_id, index), None)
+            if info is not None:
+                return info
+            job = self._jobs.get(job_id)
+            if not job or job['items'][index]['status'] != 'pending':
+                return None
+            item = job['items'][index]
+            video_id = item['video_id']
+            output_dir = item['output_dir']
+            quality = job['quality']
+            permissive = item.get('permissive', False)
+
+        # 건너뛸 항목은 추출하지 않음 (전송 단계에서 skipped 처리)
+        if is_already_downloaded(self.duplicate_filter, video_id, output_dir):
+            return None
+        return self.executor.extract_video_info(video_id, quality, permissive)
+
+    def _worker_loop(self):
+        """Transfer stage: take prefetched items and download them under the controller's limit"""
+        while True:
+            entry, info = self._ready.get()
+            job_id, index = entry['job_id'], entry['index']
+            # 대기 중 취소된 항목은 전송 슬롯을 잡지 않고 건너뜀
+            if not self._is_pending(job_id, index):
+                continue
+            self.controller.acquire()
+            slot = {'held': True}
+            try:
+                self._process_item(job_id, index, info, slot)
+            except Exception as e:
+                logger.error(f"Unexpected error in download worker: {e}")
+            finally:
+                self._release_transfer_slot(slot)
+
+    def _is_pending(self, job_id: str, index: int) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return bool(job) and not job['cancel_requested'] and job['items'][index]['status'] == 'pending'
+
+    def _release_transfer_slot(self, slot: Dict):
+        """Return the transfer slot once (on 'converting' or when the item ends)"""
+        with self._lock:
+            if not slot['held']:
+                return
+            slot['held'] = False
+        self.controller.release()
+
+    def _on_progress(self, video_id: str, entry: Dict):
+        """Progress listener: hand the transfer slot over when post-processing starts"""
+        if entry.get('status') != 'converting':
+            return
+        with self._lock:
+            slot = self._transfer_slots.get(video_id)
+        if slot:
+            self._release_transfer_slot(slot)
+
+    def _process_item(self, job_id: str, index: int, info: Optional[Dict], slot: Dict):
+        """Run a single queued item (transfer + post-process stages)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            item = job['items'][index]
+            # 취소된 항목은 건너뜀
+            if item['status'] != 'pending':
+                return
+            item['status'] = 'running'
+            self._update_job_status(job)
+            self._persist(job, [index])
+            video_id = item['video_id']
+            output_dir = item['output_dir']
+            quality = job['quality']
+            permissive = item.get('permissive', False)
+            cancel_event = threading.Event()
+            self._cancel_tokens[(job_id, index)] = cancel_event
+            self._transfer_slots[video_id] = slot
+
+        try:
+            result = self._admit_and_download(job_id, index, video_id, quality, output_dir,
+                                              cancel_event, info, permissive)
+        except Exception as e:
+            logger.error(f"[job {job_id}] Error downloading {video_id}: {e}")
+            result = {'status': 'failed'}
+        finally:
+            self.disk_guard.release((job_id, index))
+
+        self.controller.record_result(result)
+
+        with self._lock:
+            self._cancel_tokens.pop((job_id, index), None)
+            if self._transfer_slots.get(video_id) is slot:
+                del self._transfer_slots[video_id]
+            item['reason'] = result.get('reason')
+            item['filepath'] = result.get('filepath')
+
+            if result['status'] == 'failed':
+                item['error'] = self.downloader.get_progress(video_id).get('error')
+                item['error_class'] = result.get('error_class')
+                if self._schedule_retry(job, index):
+                    return
+
+            item['status'] = result['status']
+            self._update_job_status(job)
+            self._persist(job, [index])
+            if item['status'] == 'failed':
+                self._add_dead_letter(job, item)
+
+    def _admit_and_download(self, job_id: str, index: int, video_id: str, quality: str,
+                            output_dir: str, cancel_event: threading.Event,
+                            info: Optional[Dict], permissive: bool) -> Dict:
+        """Reserve disk space for the item (waiting while the volume is full), then download it"""
+        # 이미 받은 항목은 공간 예약 없이 바로 skipped 처리
+        if not is_already_downloaded(self.duplicate_filter, video_id, output_dir):
+            def on_wait(needed: int, available: int):
+                self.downloader.set_progress(video_id, {
+                    'status': 'waiting_disk',
+                    'needed': needed,
+                    'available': available,
+                })
+
+            try:
+                admitted = self.disk_guard.reserve(
+                    (job_id, index), output_dir, estimate_download_size(info, quality),
+                    cancel_event.is_set, on_wait=on_wait,
+                    workspace=self.downloader.workspace_dir(video_id, output_dir)
+                )
+            except DiskFullError as e:
+                # 재시도해도 같은 결과 → 바로 dead-letter로
+                logger.error(f"[job {job_id}] {video_id}: {e}")
+                self.downloader.report_error(video_id, str(e))
+                return {'status': 'failed', 'reason': 'Disk full'}
+            if not admitted:
+                return {'status': 'cancelled'}
+
+        logger.info(f"[job {job_id}] Downloading {video_id} ({quality})")
+        return download_with_archive(
+            self.executor, self.duplicate_filter, video_id, quality, output_dir,
+            cancel_event=cancel_event, info=info, permissive=permissive
+        )
+
+    def _schedule_retry(self, job: Dict, index: int) -> bool:
+        """
+        Put a failed item back with its error class's backoff (caller holds lock)
+
+        Returns:
+            False if the failure is not retryable or retries are exhausted
+        """
+        item = job['items'][index]
+        error_class = item.get('error_class')
+        if not error_class or job['cancel_requested']:
+            return False
+        delay = backoff_delay(error_class, item.get('attempts', 0) + 1)
+        if delay is None:
+            return False
+
+        item['attempts'] = item.get('attempts', 0) + 1
+        item['status'] = 'retrying'
+        item['retry_at'] = time.time() + delay
+        if error_class == 'format':
+            item['permissive'] = True
+        self._update_job_status(job)
+        self._persist(job, [index])
+        self._retry.schedule(job['id'], index, item['retry_at'])
+        logger.info(
+            f"[job {job['id']}] {item['video_id']} failed ({error_class}), "
+            f"retry {item['attempts']} in {delay:.0f}s"
+        )
+        return True
+
+    def _retry_due(self, job_id: str, index: int):
+        """RetryScheduler callback: backoff expired → back into the scheduler"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job['items'][index]['status'] != 'retrying':
+                return  # 대기 중에 취소됨
+            item = job['items'][index]
+            item['status'] = 'pending'
+            item['retry_at'] = None
+            self._update_job_status(job)
+            self._persist(job, [index])
+        self._enqueue(job, index)
+
+    def _add_dead_letter(self, job: Dict, item: Dict):
+        """Record a finally failed item in the dead-letter list (caller holds lock)"""
+        entry = {
+            'video_id': item['video_id'],
+            'title': item.get('title', ''),
+            'output_dir': item['output_dir'],
+            'duration': item.get('duration'),
+            'priority': item.get('priority', 0),
+            'quality': job['quality'],
+            'job_id': job['id'],
+            'error_class': item.get('error_class'),
+            'reason': item.get('reason'),
+            'error': item.get('error'),
+            'attempts': item.get('attempts', 0),
+            'failed_at': time.time(),
+        }
+        if self.store:
+            try:
+                self.store.add_dead_letter(entry)
+            except Exception as e:
+                logger.error(f"Failed to record dead letter for {item['video_id']}: {e}")
+        else:
+            self._dead_letter_seq += 1
+            self._dead_letters[self._dead_letter_seq] = {**entry, 'id': self._dead_letter_seq}
+
+    def get_dead_letters(self) -> List[Dict]:
+        """Items that failed after all retries, oldest first"""
+        if self.store:
+            return self.store.list_dead_letters()
+        with self._lock:
+            return list(self._dead_letters.values())
+
+    def remove_dead_letters(self, ids: Optional[List[int]] = None) -> int:
+        """Delete dead-letter entries (None = all); returns the number removed"""
+        if self.store:
+            return self.store.remove_dead_letters(ids)
+        with self._lock:
+            if ids is None:
+                count = len(self._dead_letters)
+                self._dead_letters.clear()
+                return count
+            return sum(1 for i in ids if self._dead_letters.pop(i, None))
+
+    def retry_dead_letters(self, ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Re-submit dead-letter entries as new jobs (one per quality) and remove them
+
+        Args:
+            ids: Entries to retry (None = all)
+
+        Returns:
+            Snapshots of the submitted jobs
+        """
+        entries = self.get_dead_letters()
+        if ids is not None:
+            wanted = set(ids)
+            entries = [e for e in entries if e['id'] in wanted]
+        if not entries:
+            return []
+
+        by_quality: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            by_quality.setdefault(entry['quality'], []).append(entry)
+
+        jobs = [self.submit(batch, quality) for quality, batch in by_quality.items()]
+        self.remove_dead_letters([e['id'] for e in entries])
+        logger.info(f"Retrying {len(entries)} dead-lettered item(s) in {len(jobs)} job(s)")
+        return jobs
+
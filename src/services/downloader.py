@@ -2,22 +2,460 @@
 YouTube Downloader Service
 
 Wrapper around yt-dlp for extracting download information
+
+Each download runs in its own workspace directory (partial files, fragments,
+merge intermediates); the finished file is moved atomically into the output
+folder and cleanup only ever removes that workspace.
+
+Transfers of progressive formats can be handed to a pluggable
+TransferBackend (Config.TRANSFER_BACKEND); the built-in 'segmented' backend
+fetches byte ranges over several connections into a preallocated file.
 """
 
+import errno
 import glob
+import hashlib
+import http.client
+import json
 import logging
 import os
 import re
+import shutil
 import sys
 import threading
 import time
-import yt_dlp
-from typing import Dict, List, Optional
+from collections import deque
+from contextlib import contextmanager
 
+import yt_dlp
+import yt_dlp.downloader.http
+import yt_dlp.networking
+import yt_dlp.version
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
+from typing import Callable, Dict, Iterable, List, Optional
+
+from services.bandwidth import DownloadRateState
+from services.fragment_tuner import FRAGMENTED_PROTOCOLS, FragmentConcurrencyTuner, format_plan
+from services.postprocess import PostProcessScheduler
+from services.ydl_pool import YoutubeDLPool
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# download_video의 재시도 가능한 실패 반환값 → 오류 분류 (재시도는 작업 큐의 RetryScheduler가 담당)
+RETRYABLE_RESULTS = {
+    "FORMAT_UNAVAILABLE": 'format',
+    "RENAME_FAILED": 'rename',
+    "NETWORK_ERROR": 'network',
+    "THROTTLED": 'throttled',
+}
+
+# 출력 폴더 안의 다운로드별 작업 폴더 상위 이름 (Config.DOWNLOAD_TEMP_DIR 미설정 시)
+WORKSPACE_DIRNAME = '.incomplete'
+
+# AAC 오디오 코덱 (acodec 값 접두어) — m4a로 저장할 때 변환 불필요
+AAC_CODECS = ('mp4a', 'aac')
+
+# 스트림 복사만 하는 postprocessor (CPU 부담이 없어 후처리 슬롯 대기 없이 실행)
+STREAM_COPY_POSTPROCESSORS = ('FFmpegFixupM4a',)
+
+
+def audio_plan(info: Optional[Dict]) -> str:
+    """
+    What the audio-only path has to do with a downloaded format
+
+    Args:
+        info: Info dict of the downloaded (single) format
+
+    Returns:
+        'keep' (AAC already in .m4a — use the file as is),
+        'remux' (AAC in another container — stream copy into .m4a) or
+        'transcode' (other or unknown codec — convert to AAC)
+    """
+    acodec = ((info or {}).get('acodec') or '').lower()
+    if not acodec.startswith(AAC_CODECS):
+        return 'transcode'
+    return 'keep' if (info.get('ext') or '').lower() == 'm4a' else 'remux'
+
+
+# 일시적인 네트워크 오류 메시지 (소문자)
+NETWORK_ERROR_KEYWORDS = [
+    'timed out', 'timeout', 'connection reset', 'connection aborted', 'connection refused',
+    'remote end closed', 'incompleteread', 'incomplete read', 'temporary failure in name resolution',
+    'name or service not known', 'network is unreachable', 'getaddrinfo failed',
+    'http error 500', 'http error 502', 'http error 503', 'http error 504', 'unable to connect',
+]
+
+
+class TransferNotSupported(Exception):
+    """The backend cannot move this URL (e.g. no Range support); use yt-dlp's own downloader"""
+
+
+class TransferBackend:
+    """
+    Moves one resolved media URL into a file, in place of yt-dlp's HTTP downloader
+
+    Selected by name (Config.TRANSFER_BACKEND) and only used for formats it
+    supports; everything else goes through yt-dlp's own downloaders.
+    """
+
+    name = ''
+
+    def supports(self, info: Dict) -> bool:
+        """Whether the format (one entry of requested_formats) can be transferred"""
+        return False
+
+    def transfer(self, url: str, headers: Dict, filename: str, connections: int,
+                 on_progress: Callable[[int, Optional[int]], None],
+                 chunk_size: Optional[int] = None, opener: Optional[Callable] = None,
+                 throttle: Optional[Callable[[int], None]] = None) -> Dict:
+        """
+        Download url into filename
+
+        Args:
+            url: Resolved media URL
+            headers: HTTP headers for every request
+            filename: Destination (temporary) file; a partial file left by an
+                earlier failed transfer is resumed where the backend can
+            connections: Parallel connections allowed for this transfer
+            on_progress: Called with (downloaded bytes, total bytes); an
+                exception raised here aborts the transfer (cancellation)
+            chunk_size: Largest byte range per request (None = backend default)
+            opener: (url, headers) -> response with status/headers/read/close
+                (default: urllib)
+            throttle: Called with each block's size from the thread that
+                read it; may sleep to rate-limit that connection
+
+        Returns:
+            Dict with 'bytes' and 'connections' used
+
+        Raises:
+            TransferNotSupported: Caller should fall back to yt-dlp's downloader
+                (no partial file is left behind)
+        """
+        raise NotImplementedError
+
+
+def _urllib_opener(url: str, headers: Dict):
+    import urllib.request
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=20)
+
+
+class SegmentedHTTPBackend(TransferBackend):
+    """
+    Multi-connection HTTP downloader for progressive (single-URL) formats
+
+    The file size is probed with a one-byte Range request, the destination is
+    preallocated, and byte ranges of chunk_size are fetched by up to
+    `connections` threads and written at their offsets. A failed range
+    resumes from the last written byte.
+
+    How far each range got is kept next to the file (<file>.segments), so a
+    retry after a network error resumes the ranges from the partial file
+    instead of starting over.
+    """
+
+    name = 'segmented'
+
+    # 요청 1건당 최대 범위 — YouTube는 큰 범위 요청을 느리게 보내므로 yt-dlp와 같은 10MB
+    DEFAULT_CHUNK_SIZE = 10 * 1024 ** 2
+    BLOCK_SIZE = 64 * 1024
+    # 진행률 콜백 최소 간격 (초)
+    PROGRESS_INTERVAL = 0.1
+    PROGRESS_SUFFIX = '.segments'
+
+    def __init__(self, retries: int = 3):
+        self.retries = retries
+
+    def supports(self, info: Dict) -> bool:
+        return yt_dlp.utils.determine_protocol(info) in ('http', 'https')
+
+    def _probe(self, url: str, headers: Dict, opener: Callable) -> int:
+        """Range 지원 여부 확인 + 전체 크기"""
+        response = opener(url, {**headers, 'Range': 'bytes=0-0'})
+        try:
+            content_range = response.headers.get('Content-Range') or ''
+            total = content_range.rpartition('/')[2]
+            if response.status != 206 or not total.isdigit():
+                raise TransferNotSupported(f"no byte-range support (HTTP {response.status})")
+            return int(total)
+        finally:
+            response.close()
+
+    def _load_progress(self, filename: str, total: int, chunk_size: int) -> Optional[Dict[int, int]]:
+        """이전 전송의 구간별 진행 위치 {구간 시작: 다음에 받을 바이트} (이어받을 수 없으면 None)"""
+        try:
+            with open(filename + self.PROGRESS_SUFFIX, encoding='utf-8') as f:
+                saved = json.load(f)
+            if (saved['total'] != total or saved['chunk_size'] != chunk_size
+                    or os.path.getsize(filename) != total):
+                return None
+            return {int(start): pos for start, pos in saved['ranges'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_progress(self, filename: str, total: int, chunk_size: int, progress: Dict[int, int]):
+        try:
+            with open(filename + self.PROGRESS_SUFFIX, 'w', encoding='utf-8') as f:
+                json.dump({'total': total, 'chunk_size': chunk_size,
+                           'ranges': {str(start): pos for start, pos in progress.items()}}, f)
+        except OSError as e:
+            logger.debug(f"Failed to save segment progress for {filename}: {e}")
+
+    def _discard(self, filename: str, keep_file: bool = False):
+        """진행 기록 삭제 (keep_file=False면 부분 파일도 삭제)"""
+        for path in (filename + self.PROGRESS_SUFFIX,) if keep_file else (filename, filename + self.PROGRESS_SUFFIX):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def transfer(self, url: str, headers: Dict, filename: str, connections: int,
+                 on_progress: Callable[[int, Optional[int]], None],
+                 chunk_size: Optional[int] = None, opener: Optional[Callable] = None,
+                 throttle: Optional[Callable[[int], None]] = None) -> Dict:
+        opener = opener or _urllib_opener
+        try:
+            total = self._probe(url, headers, opener)
+        except TransferNotSupported:
+            # 이 백엔드가 미리 할당한 부분 파일은 폴백 다운로더가 이어받을 수 없음
+            if os.path.exists(filename + self.PROGRESS_SUFFIX):
+                self._discard(filename)
+            raise
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+
+        # 구간별 다음에 받을 위치. 같은 크기/구간의 부분 파일이 있으면 이어받음
+        progress = self._load_progress(filename, total, chunk_size)
+        if progress is None:
+            # 전체 크기로 미리 할당 → 각 연결이 자기 구간 위치에 바로 기록
+            with open(filename, 'wb') as f:
+                f.truncate(total)
+            progress = {start: start for start in range(0, total, chunk_size)}
+            # 미리 할당된 파일에는 항상 진행 기록이 함께 있음 (없으면 받은 데이터로 오인될 수 있음)
+            self._save_progress(filename, total, chunk_size, progress)
+        if total == 0:
+            self._discard(filename, keep_file=True)
+            return {'bytes': 0, 'connections': 0}
+
+        ranges = deque(
+            (start, pos, min(start + chunk_size, total) - 1)
+            for start, pos in sorted(progress.items())
+            if pos < min(start + chunk_size, total)
+        )
+        resumed = total - sum(end - pos + 1 for _, pos, end in ranges)
+        if resumed:
+            logger.info(f"Resuming segmented transfer at {resumed}/{total} bytes: {filename}")
+        workers = max(1, min(connections, len(ranges)))
+        lock = threading.Lock()
+        report_lock = threading.Lock()
+        stop = threading.Event()
+        state = {'downloaded': resumed, 'reported': 0.0, 'error': None}
+
+        def report(start: int, pos: int, nbytes: int):
+            # 카운터만 잠금 안에서 갱신하고 콜백은 잠금 밖에서 호출
+            # (콜백이 오래 걸려도 다른 구간의 전송을 막지 않음)
+            with lock:
+                progress[start] = pos
+                state['downloaded'] += nbytes
+                now = time.monotonic()
+                if now - state['reported'] < self.PROGRESS_INTERVAL:
+                    return
+                state['reported'] = now
+            # yt-dlp 훅은 스레드 안전하지 않으므로 한 번에 하나만 (진행 중이면 이번 보고는 생략)
+            if report_lock.acquire(blocking=False):
+                try:
+                    with lock:
+                        downloaded = state['downloaded']
+                    on_progress(downloaded, total)
+                finally:
+                    report_lock.release()
+
+        def fetch_range(f, start: int, pos: int, end: int):
+            for attempt in range(self.retries + 1):
+                try:
+                    response = opener(url, {**headers, 'Range': f'bytes={pos}-{end}'})
+                    try:
+                        if response.status != 206:
+                            raise TransferNotSupported(f"range request answered with HTTP {response.status}")
+                        f.seek(pos)
+                        while pos <= end:
+                            if stop.is_set():
+                                return
+                            block = response.read(min(self.BLOCK_SIZE, end - pos + 1))
+                            if not block:
+                                # 네트워크 오류로 분류되도록 IncompleteRead로 보고 (.part 유지 → 재시도 시 이어받음)
+                                raise http.client.IncompleteRead(b'', end - pos + 1)
+                            f.write(block)
+                            pos += len(block)
+                            report(start, pos, len(block))
+                            if throttle:
+                                throttle(len(block))
+                        return
+                    finally:
+                        response.close()
+                except TransferNotSupported:
+                    raise
+                except Exception as e:
+                    if stop.is_set() or attempt >= self.retries or isinstance(e, yt_dlp.utils.DownloadError):
+                        raise
+                    logger.debug(f"Range {pos}-{end} failed ({e!r}), retrying")
+                    time.sleep(2 ** attempt)
+
+        def worker():
+            try:
+                # 버퍼 없이 기록 → 저장된 진행 위치가 항상 파일에 쓰인 데이터와 일치
+                with open(filename, 'r+b', buffering=0) as f:
+                    while not stop.is_set():
+                        with lock:
+                            if not ranges:
+                                return
+                            start, pos, end = ranges.popleft()
+                        fetch_range(f, start, pos, end)
+            except Exception as e:
+                with lock:
+                    state['error'] = state['error'] or e
+                stop.set()
+
+        threads = [threading.Thread(target=worker, name=f"segment-{i}", daemon=True) for i in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        error = state['error']
+        if isinstance(error, TransferNotSupported):
+            # 폴백 다운로더가 미리 할당된 파일을 받은 데이터로 착각하지 않도록 삭제
+            self._discard(filename)
+            raise error
+        if error is not None:
+            self._save_progress(filename, total, chunk_size, progress)
+            raise error
+
+        self._discard(filename, keep_file=True)
+        on_progress(total, total)
+        return {'bytes': total, 'connections': workers}
+
+
+# 이름 → 전송 백엔드 ('native' = yt-dlp 기본 다운로더만 사용)
+TRANSFER_BACKENDS = {
+    'native': None,
+    SegmentedHTTPBackend.name: SegmentedHTTPBackend,
+}
+
+
+def get_transfer_backend(name: str) -> Optional[TransferBackend]:
+    """Instantiate a backend from TRANSFER_BACKENDS (unknown names fall back to native)"""
+    if name not in TRANSFER_BACKENDS:
+        logger.warning(f"Unknown transfer backend '{name}', using native")
+        return None
+    backend_class = TRANSFER_BACKENDS[name]
+    return backend_class() if backend_class else None
+
+
+class _BackendFD(yt_dlp.downloader.http.HttpFD):
+    """yt-dlp 파일 다운로더 어댑터: 전송 백엔드로 받고, 지원하지 않으면 HttpFD로 폴백"""
+
+    FD_NAME = 'backend'
+
+    def __init__(self, ydl, params, backend: TransferBackend):
+        super().__init__(ydl, params)
+        self.backend = backend
+
+    def real_download(self, filename, info_dict):
+        tmpfilename = self.temp_name(filename)
+        headers = {**(info_dict.get('http_headers') or {}), 'Accept-Encoding': 'identity'}
+        chunk_size = (self.params.get('http_chunk_size')
+                      or (info_dict.get('downloader_options') or {}).get('http_chunk_size'))
+        connections = self.params.get('concurrent_fragment_downloads') or 1
+        # 연결(구간)마다 자기 바이트만큼 대역폭 상한 적용 — 진행률 훅에서는 다시 제한하지 않음
+        throttle = self.params.get('transfer_throttle')
+        start = time.time()
+
+        def on_progress(downloaded: int, total: Optional[int]):
+            elapsed = time.time() - start
+            speed = downloaded / elapsed if elapsed > 0 else None
+            self._hook_progress({
+                'status': 'downloading',
+                'downloaded_bytes': downloaded,
+                'total_bytes': total,
+                'tmpfilename': tmpfilename,
+                'filename': filename,
+                'eta': (total - downloaded) / speed if speed and total else None,
+                'speed': speed,
+                'elapsed': elapsed,
+                'throttled': throttle is not None,
+                'ctx_id': info_dict.get('ctx_id'),
+            }, info_dict)
+
+        def opener(url: str, request_headers: Dict):
+            # yt-dlp 네트워킹 사용 (쿠키/프록시/타임아웃 설정 공유)
+            return self.ydl.urlopen(yt_dlp.networking.Request(url, headers=request_headers))
+
+        try:
+            result = self.backend.transfer(
+                info_dict['url'], headers, tmpfilename, connections, on_progress, chunk_size, opener, throttle
+            )
+        except TransferNotSupported as e:
+            logger.debug(f"{self.backend.name} backend not usable ({e}), using native downloader")
+            return super().real_download(filename, info_dict)
+
+        self.try_rename(tmpfilename, filename)
+        self._hook_progress({
+            'status': 'finished',
+            'downloaded_bytes': result['bytes'],
+            'total_bytes': result['bytes'],
+            'filename': filename,
+            'elapsed': time.time() - start,
+            'connections': result['connections'],
+            'ctx_id': info_dict.get('ctx_id'),
+        }, info_dict)
+        return True
+
+
+# _BackendYoutubeDL.dl이 YoutubeDL.dl을 대신하며 사용하는 내부 속성
+# (자동 업데이트된 yt-dlp에 없으면 기본 다운로더로 동작)
+YDL_INTERNALS = ('_progress_hooks', '_copy_infodict', '_calc_headers')
+
+
+class _BackendYoutubeDL(yt_dlp.YoutubeDL):
+    """YoutubeDL that routes supported formats to the session's transfer backend"""
+
+    _internals_warned = False
+
+    def _has_internals(self) -> bool:
+        missing = [attr for attr in YDL_INTERNALS if not hasattr(self, attr)]
+        if missing and not _BackendYoutubeDL._internals_warned:
+            _BackendYoutubeDL._internals_warned = True
+            logger.warning(f"yt-dlp {yt_dlp.version.__version__} lacks {', '.join(missing)}; "
+                           f"transfer backend disabled, using native downloader")
+        return not missing
+
+    def dl(self, name, info, subtitle=False, test=False):
+        backend = self.params.get('transfer_backend')
+        if (backend is None or subtitle or test or name == '-' or not info.get('url')
+                or not backend.supports(info)
+                # 외부 다운로더 설정 등으로 yt-dlp가 HttpFD 이외를 고르면 그대로 따름
+                or get_suitable_downloader(info, self.params) is not yt_dlp.downloader.http.HttpFD
+                or not self._has_internals()):
+            return super().dl(name, info, subtitle, test)
+
+        fd = _BackendFD(self, self.params, backend)
+        for ph in self._progress_hooks:
+            fd.add_progress_hook(ph)
+        self.write_debug(f'Invoking {fd.FD_NAME} downloader on "{info["url"]}"')
+        # YoutubeDL.dl과 동일하게 복사본 + 헤더 계산
+        new_info = self._copy_infodict(info)
+        if new_info.get('http_headers') is None:
+            new_info['http_headers'] = self._calc_headers(new_info)
+        return fd.download(name, new_info, subtitle)
+
+    def run_pp(self, pp, infodict):
+        # 이미 m4a(AAC)인 오디오는 추출 단계를 건너뜀 (ffprobe 실행·후처리 슬롯 대기 없음)
+        if isinstance(pp, FFmpegExtractAudioPP) and audio_plan(infodict) == 'keep':
+            logger.debug(f"Audio already AAC/m4a, skipping extraction: {infodict.get('filepath')}")
+            return infodict
+        return super().run_pp(pp, infodict)
+
 
 def _get_ffmpeg_location() -> str:
     """Get ffmpeg path — bundled binary in PyInstaller, or system default."""
@@ -49,7 +487,24 @@ def _get_ffmpeg_location() -> str:
 class YTBulkDownloader:
     """yt-dlp wrapper for YouTube downloads"""
 
-    def __init__(self):
+    # 후처리 단계 슬롯을 사용하는 postprocessor (ffmpeg 실행). MoveFiles 등은 제외
+    FFMPEG_POSTPROCESSORS = ('Merger', 'FFmpeg')
+
+    def __init__(self, progress_listener: Optional[Callable[[str, Dict], None]] = None,
+                 bandwidth_limiter=None, postprocess_scheduler: Optional[PostProcessScheduler] = None,
+                 fragment_tuner: Optional[FragmentConcurrencyTuner] = None,
+                 transfer_backend: Optional[str] = None):
+        """
+        Args:
+            progress_listener: 진행률 갱신 시 호출되는 콜백 (video_id, entry).
+                워커 프로세스에서 부모 프로세스로 진행률을 전달할 때 사용.
+            bandwidth_limiter: 모든 다운로드가 공유하는 BandwidthLimiter (없으면 무제한)
+            postprocess_scheduler: ffmpeg 후처리(병합/변환) 동시 실행 수 제한 + 대기열.
+                워커 프로세스는 부모의 것을 받아 공유 (기본: CPU 코어 기반 Config.POSTPROCESS_WORKERS)
+            fragment_tuner: 다운로드별 조각 동시 연결 수 선택 + 전체 연결 예산.
+                워커 프로세스는 부모의 것을 받아 공유
+            transfer_backend: 단일 URL 형식의 전송 백엔드 이름 (기본: Config.TRANSFER_BACKEND)
+        """
         ffmpeg_loc = _get_ffmpeg_location()
         self.ydl_opts_base = {
             'quiet': True,
@@ -65,24 +520,69 @@ class YTBulkDownloader:
             'sleep_interval': 1,
             'max_sleep_interval': 3,
             'sleep_interval_requests': 1,
-            # 프래그먼트 병렬 다운로드 (단일 영상 내 DASH 조각을 동시에 받음)
-            'concurrent_fragment_downloads': 4,
             'logger': logger,   # yt-dlp 에러/경고를 Python logger로 캡처
         }
         if ffmpeg_loc:
             self.ydl_opts_base['ffmpeg_location'] = ffmpeg_loc
         self._progress_map = {}           # {video_id: {status, percent, ...}}
+        self._progress_seq = 0            # 진행률 변경 시마다 증가 (스트림 변경 감지용)
         self._last_total_map = {}         # {video_id: str}
         self._downloaded_bytes_map = {}   # {video_id: int}
-        self._cancel_event = threading.Event()
+        self._cancel_events = {}          # {video_id: threading.Event} 진행 중인 다운로드별 취소 토큰
+        self._cancel_lock = threading.Lock()
+        self._progress_listeners = [progress_listener] if progress_listener else []
+        self.bandwidth_limiter = bandwidth_limiter
+        # 프로필(옵션 조합)별로 재사용하는 YoutubeDL 세션 (추출기 캐시/쿠키/HTTP 연결 유지)
+        self.ydl_pool = YoutubeDLPool(ydl_class=_BackendYoutubeDL)
+        self.postprocess_scheduler = postprocess_scheduler or PostProcessScheduler()
+        # 프래그먼트 병렬 다운로드 수 (단일 영상 내 DASH 조각을 동시에 받음) — 다운로드마다 세션 체크아웃 시 지정
+        self.fragment_tuner = fragment_tuner or FragmentConcurrencyTuner()
+        self.transfer_backend = get_transfer_backend(transfer_backend or Config.TRANSFER_BACKEND)
+        self._transferred_bytes = 0       # 전체 다운로드 누적 바이트 (처리량 측정용)
+        self._last_bytes_map = {}         # {video_id: int} 현재 파일의 마지막 downloaded_bytes
+        self._bytes_lock = threading.Lock()
+
+    def request_cancel(self, video_id: Optional[str] = None) -> int:
+        """
+        외부에서 다운로드 취소를 요청
+
+        Args:
+            video_id: 취소할 영상 ID (None이면 진행 중인 모든 다운로드)
 
-    def request_cancel(self):
-        """외부에서 다운로드 취소를 요청"""
-        self._cancel_event.set()
+        Returns:
+            취소 신호를 보낸 다운로드 수
+        """
+        with self._cancel_lock:
+            if video_id is None:
+                events = list(self._cancel_events.values())
+            else:
+                events = [self._cancel_events[video_id]] if video_id in self._cancel_events else []
+        for event in events:
+            event.set()
+        return len(events)
 
-    def reset_cancel(self):
-        """취소 플래그 초기화"""
-        self._cancel_event.clear()
+    @contextmanager
+    def track_download(self, video_id: str, cancel_event):
+        """
+        진행 중인 다운로드로 등록하여 request_cancel()로 취소할 수 있게 함
+
+        Args:
+            video_id: YouTube video ID
+            cancel_event: set()/is_set()을 가진 취소 토큰
+        """
+        with self._cancel_lock:
+            self._cancel_events[video_id] = cancel_event
+        try:
+            yield cancel_event
+        finally:
+            with self._cancel_lock:
+                if self._cancel_events.get(video_id) is cancel_event:
+                    del self._cancel_events[video_id]
+
+    def get_active_downloads(self) -> List[str]:
+        """현재 진행 중인 다운로드의 video_id 목록"""
+        with self._cancel_lock:
+            return list(self._cancel_events.keys())
 
     @staticmethod
     def _format_bytes(b: int) -> str:
@@ -99,12 +599,43 @@ class YTBulkDownloader:
         """Remove ANSI escape sequences from string"""
         return re.sub(r'\x1b\[[0-9;]*m', '', s)
 
+    def set_progress(self, video_id: str, entry: Dict):
+        """진행률 갱신 + 변경 카운터 증가 + 누적 전송량 집계"""
+        with self._bytes_lock:
+            if entry.get('status') == 'downloading':
+                current = entry.get('downloaded_bytes') or 0
+                last = self._last_bytes_map.get(video_id, 0)
+                # 값이 줄었으면 다음 파일(영상→음성 등)로 넘어간 것
+                self._transferred_bytes += current - last if current >= last else current
+                self._last_bytes_map[video_id] = current
+            else:
+                self._last_bytes_map.pop(video_id, None)
+        self._progress_map[video_id] = entry
+        self._progress_seq += 1
+        for listener in self._progress_listeners:
+            try:
+                listener(video_id, entry)
+            except Exception as e:
+                logger.error(f"Progress listener error for {video_id}: {e}")
+
+    def add_progress_listener(self, listener: Callable[[str, Dict], None]):
+        """진행률 갱신 콜백 추가 (video_id, entry)"""
+        self._progress_listeners.append(listener)
+
     def get_progress(self, video_id=None):
         """video_id별 진행률 조회. video_id=None이면 전체 반환."""
         if video_id:
             return self._progress_map.get(video_id, {})
         return dict(self._progress_map)
 
+    def get_transferred_bytes(self) -> int:
+        """모든 다운로드의 누적 전송 바이트 (처리량 = 두 시점의 차이 / 경과 시간)"""
+        return self._transferred_bytes
+
+    def get_progress_seq(self) -> int:
+        """진행률 변경 카운터 (값이 같으면 진행률 변화 없음)"""
+        return self._progress_seq
+
     def get_video_info(self, video_id: str) -> Optional[Dict]:
         """
         Get detailed information about a YouTube video
@@ -123,7 +654,7 @@ class YTBulkDownloader:
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_pool.session(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
 
                 if not info:
@@ -216,7 +747,7 @@ class YTBulkDownloader:
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_pool.session(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
 
                 if not info:
@@ -240,7 +771,7 @@ class YTBulkDownloader:
         """비-ASCII 핸들(@한글이름)을 ytsearch로 channel_id로 변환"""
         try:
             ydl_opts = {'quiet': True, 'no_warnings': True, 'extract_flat': True}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_pool.session(ydl_opts) as ydl:
                 info = ydl.extract_info(f'ytsearch1:{handle}', download=False)
                 entries = info.get('entries', [])
                 if entries and entries[0]:
@@ -291,7 +822,7 @@ class YTBulkDownloader:
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_pool.session(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
 
                 if not info:
@@ -339,7 +870,7 @@ class YTBulkDownloader:
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_pool.session(ydl_opts) as ydl:
                 info = ydl.extract_info(playlist_url, download=False)
 
                 if not info:
@@ -367,110 +898,256 @@ class YTBulkDownloader:
             logger.error(f"Error getting playlist videos via yt-dlp: {e}")
             return [], {}
 
-    def download_video(self, video_id: str, quality: str = '720p', output_dir: str = None) -> Optional[str]:
+    @staticmethod
+    def _format_string(quality: str, permissive: bool = False) -> str:
+        """품질 설정 → yt-dlp format 문자열 (permissive: height/codec 제한 없는 폴백)"""
+        if quality == 'audio':
+            return 'bestaudio' if permissive else 'bestaudio[ext=m4a]/bestaudio'
+        if permissive:
+            return 'bestvideo+bestaudio/best'
+        height = quality.replace('p', '') if quality != 'best' else ''
+        if height:
+            return (
+                f'bestvideo[height<={height}][vcodec^=avc1]+bestaudio/'
+                f'bestvideo[height<={height}]+bestaudio/'
+                f'best[height<={height}]/best'
+            )
+        return 'bestvideo+bestaudio/best'
+
+    def extract_video_info(self, video_id: str, quality: str = '720p',
+                           permissive: bool = False) -> Optional[Dict]:
+        """
+        Extraction stage: resolve metadata and formats ahead of the transfer
+
+        The result is passed to download_video(info=...) so the transfer starts
+        without another extraction. Errors are not classified here; the
+        download stage re-extracts and handles them.
+
+        Args:
+            video_id: YouTube video ID
+            quality: Preferred quality (format selection uses the same rules)
+            permissive: Use the permissive fallback format (retry after format error)
+
+        Returns:
+            JSON-serializable info dict, or None on any error
+        """
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        self.set_progress(video_id, {'status': 'extracting'})
+        ydl_opts = {
+            **self.ydl_opts_base,
+            'format': self._format_string(quality, permissive),
+        }
+        try:
+            with self.ydl_pool.session(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=False)
+                if not info:
+                    return None
+                self.set_progress(video_id, {'status': 'ready'})
+                return ydl.sanitize_info(info)
+        except Exception as e:
+            logger.debug(f"Prefetch extraction failed for {video_id}: {e}")
+            return None
+
+    def download_video(self, video_id: str, quality: str = '720p', output_dir: str = None,
+                       cancel_event: Optional[threading.Event] = None,
+                       info: Optional[Dict] = None, permissive: bool = False) -> Optional[str]:
         """
         Download a video using yt-dlp (server-side download).
 
+        Transient failures are not retried here; they are reported as one of
+        RETRYABLE_RESULTS so the caller can re-queue with backoff instead of
+        blocking this thread.
+
         Args:
             video_id: YouTube video ID
             quality: Preferred quality (e.g., '720p', '1080p', 'best', 'audio')
             output_dir: Output directory path
+            cancel_event: 이 다운로드 전용 취소 토큰 (없으면 새로 생성)
+            info: extract_video_info() 결과 (있으면 추출을 건너뛰고 바로 전송)
+            permissive: height/codec 제한 없는 폴백 포맷 사용 (포맷 오류 후 재시도)
 
         Returns:
-            Downloaded file path or None
+            Downloaded file path, a status string (CANCELLED, *_SKIP or one of
+            RETRYABLE_RESULTS) or None on a non-retryable failure
         """
+        if cancel_event is None:
+            cancel_event = threading.Event()
+        with self.track_download(video_id, cancel_event):
+            return self._download_video(video_id, quality, output_dir, cancel_event, info, permissive)
+
+    def _download_video(self, video_id: str, quality: str, output_dir: Optional[str],
+                        cancel_event: threading.Event, info: Optional[Dict] = None,
+                        permissive: bool = False) -> Optional[str]:
+        """download_video 본체 (취소 토큰 등록 후 호출됨)"""
         url = f"https://www.youtube.com/watch?v={video_id}"
         self._downloaded_bytes_map[video_id] = 0
         self._last_total_map[video_id] = ''
 
+        rate_state = DownloadRateState()
+        gate_state = {'held': False, 'waited': 0.0}
+
+        # 조각 동시 연결 수: 측정 처리량 + 형식 크기 + 전체 연결 예산으로 결정
+        # (분할 전송 백엔드가 있으면 단일 URL https 형식도 여러 연결 사용)
+        plan = format_plan(info, range_backend=self.transfer_backend is not None)
+        connections = self.fragment_tuner.allocate(plan['filesize'], plan['parallel'])
+        conn_state = {'held': True}
+
+        def release_connections():
+            if conn_state['held']:
+                conn_state['held'] = False
+                self.fragment_tuner.release(connections)
+
         # video_id를 캡처한 클로저 훅
         def progress_hook(d):
-            if self._cancel_event.is_set():
+            if cancel_event.is_set():
                 raise yt_dlp.utils.DownloadError("사용자가 다운로드를 중단했습니다.")
             if d['status'] == 'downloading':
-                self._progress_map[video_id] = {
+                # 전체/개별 대역폭 상한 초과 시 이 다운로드 스레드만 대기 (분할 전송은 구간 스레드에서 이미 적용)
+                if self.bandwidth_limiter and not d.get('throttled'):
+                    self.bandwidth_limiter.throttle(d.get('downloaded_bytes') or 0, rate_state)
+                self.set_progress(video_id, {
                     'status': 'downloading',
                     'percent': self._strip_ansi(d.get('_percent_str', '')).strip(),
                     'total': self._strip_ansi(d.get('_total_bytes_str') or d.get('_total_bytes_estimate_str', '')).strip(),
                     'speed': self._strip_ansi(d.get('_speed_str', '')).strip(),
                     'eta': self._strip_ansi(d.get('_eta_str', '')).strip(),
-                }
+                    'downloaded_bytes': d.get('downloaded_bytes') or 0,
+                })
             elif d['status'] == 'finished':
-                self._downloaded_bytes_map[video_id] += d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+                nbytes = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+                # 대역폭 상한이 걸려 있으면 측정값이 상한에 묶이므로 제외
+                if not (self.bandwidth_limiter and any(self.bandwidth_limiter.get_limits().values())):
+                    protocol = (d.get('info_dict') or {}).get('protocol') or ''
+                    # 분할 전송 백엔드는 실제 사용한 연결 수를 보고
+                    used = d.get('connections') or (connections if protocol.startswith(FRAGMENTED_PROTOCOLS) else 1)
+                    self.fragment_tuner.record(nbytes, d.get('elapsed') or 0, used)
+                self._downloaded_bytes_map[video_id] += nbytes
                 total = self._format_bytes(self._downloaded_bytes_map[video_id])
                 self._last_total_map[video_id] = total
-                self._progress_map[video_id] = {
+                self.set_progress(video_id, {
                     'status': 'finished',
                     'total': total,
-                }
+                })
 
         def postprocessor_hook(d):
             status = d.get('status', '')
+            name = d.get('postprocessor', '')
+            # 스트림 복사(컨테이너 수정, AAC 리먹스)는 인코딩 슬롯을 쓰지 않음
+            uses_ffmpeg = name.startswith(self.FFMPEG_POSTPROCESSORS) and not (
+                name in STREAM_COPY_POSTPROCESSORS
+                or (name == 'FFmpegExtractAudio' and audio_plan(d.get('info_dict')) != 'transcode')
+            )
             if status == 'started':
-                self._progress_map[video_id] = {
-                    'status': 'converting',
-                    'percent': '',
-                    'total': '',
-                    'speed': '',
-                    'eta': '',
-                    'postprocessor': d.get('postprocessor', ''),
-                }
+                # 전송이 끝났으므로 연결 예산 반납
+                release_connections()
+
+                def report(waiting: bool, queue_depth: int = 0, waited: float = 0.0):
+                    self.set_progress(video_id, {
+                        'status': 'converting',
+                        'percent': '',
+                        'total': '',
+                        'speed': '',
+                        'eta': '',
+                        'postprocessor': name,
+                        'waiting': waiting,
+                        'queue_depth': queue_depth,
+                        'waited': round(waited, 1),
+                    })
+
+                # 후처리 슬롯 대기열 (전송 단계 슬롯은 첫 'converting' 보고 시 반납됨)
+                if uses_ffmpeg and not gate_state['held']:
+                    scheduler = self.postprocess_scheduler
+                    report(True, scheduler.get_status()['waiting'] + 1)
+                    waited = scheduler.acquire(
+                        cancel_event.is_set,
+                        on_wait=lambda depth, secs: report(True, depth, secs)
+                    )
+                    if waited is None:
+                        raise yt_dlp.utils.DownloadError("사용자가 다운로드를 중단했습니다.")
+                    gate_state['held'] = True
+                    gate_state['waited'] = waited
+                report(False, waited=gate_state['waited'])
             elif status == 'finished':
+                if gate_state['held']:
+                    self.postprocess_scheduler.release()
+                    gate_state['held'] = False
                 filepath = d.get('info_dict', {}).get('filepath', '')
                 if filepath and os.path.exists(filepath):
                     total = self._format_bytes(os.path.getsize(filepath))
                 else:
                     total = self._last_total_map.get(video_id, '')
-                self._progress_map[video_id] = {
+                self.set_progress(video_id, {
                     'status': 'converting_done',
                     'total': total,
-                }
+                })
 
         if not output_dir:
             output_dir = str(Config.DOWNLOADS_DIR)
 
         os.makedirs(output_dir, exist_ok=True)
+        # 이 다운로드 전용 작업 폴더에서 받고 완료 후 출력 폴더로 이동
+        workspace = self.workspace_dir(video_id, output_dir)
+        os.makedirs(workspace, exist_ok=True)
 
         # 파일명: YYMMDD_영상제목.확장자 (영상 업로드 날짜)
-        outtmpl = os.path.join(output_dir, '%(upload_date>%y%m%d)s_%(title)s.%(ext)s')
+        outtmpl = os.path.join(workspace, '%(upload_date>%y%m%d)s_%(title)s.%(ext)s')
 
+        format_string = self._format_string(quality, permissive)
         if quality == 'audio':
-            format_string = 'bestaudio[ext=m4a]/bestaudio'
+            # AAC가 아닌 형식(opus 등)만 실제 변환, AAC는 그대로/리먹스 (audio_plan)
             ydl_opts = {
                 **self.ydl_opts_base,
                 'format': format_string,
-                'outtmpl': outtmpl,
-                'progress_hooks': [progress_hook],
-                'postprocessor_hooks': [postprocessor_hook],
                 'postprocessors': [{
                     'key': 'FFmpegExtractAudio',
                     'preferredcodec': 'm4a',
                 }],
             }
         else:
-            height = quality.replace('p', '') if quality != 'best' else ''
-            if height:
-                format_string = (
-                    f'bestvideo[height<={height}][vcodec^=avc1]+bestaudio/'
-                    f'bestvideo[height<={height}]+bestaudio/'
-                    f'best[height<={height}]/best'
-                )
-            else:
-                format_string = 'bestvideo+bestaudio/best'
-
             ydl_opts = {
                 **self.ydl_opts_base,
                 'format': format_string,
-                'outtmpl': outtmpl,
-                'progress_hooks': [progress_hook],
                 'merge_output_format': 'mp4',
             }
 
+        # 호출마다 달라지는 값은 세션 체크아웃 시 적용 (ydl_opts는 세션 프로필)
+        session_args = {
+            'outtmpl': outtmpl,
+            'progress_hook': progress_hook,
+            'postprocessor_hook': postprocessor_hook,
+            'params': {
+                'concurrent_fragment_downloads': connections,
+                'transfer_backend': self.transfer_backend,
+                'transfer_throttle': (
+                    (lambda nbytes: self.bandwidth_limiter.consume(nbytes, rate_state))
+                    if self.bandwidth_limiter else None
+                ),
+            },
+        }
+
+        try:
+            return self._run_download(
+                video_id, url, quality, output_dir, workspace, ydl_opts, session_args, cancel_event, info
+            )
+        finally:
+            release_connections()
+            # 후처리 중 예외로 'finished' 훅이 오지 않은 경우 슬롯 반납
+            if gate_state['held']:
+                self.postprocess_scheduler.release()
+
+    def _run_download(self, video_id: str, url: str, quality: str, output_dir: str, workspace: str,
+                      ydl_opts: Dict, session_args: Dict, cancel_event,
+                      prefetched: Optional[Dict]) -> Optional[str]:
+        """yt-dlp 실행 (작업 폴더) + 완료 파일 이동 + 에러 분류 (만료된 선행 추출 정보만 즉시 재추출)"""
         max_attempts = 2
         for attempt in range(max_attempts):
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
+                with self.ydl_pool.session(ydl_opts, **session_args) as ydl:
+                    if prefetched is not None:
+                        # 추출 단계에서 받은 정보로 바로 전송 시작
+                        info = ydl.process_ie_result(prefetched, download=True)
+                    else:
+                        info = ydl.extract_info(url, download=True)
                     if not info:
                         return None
 
@@ -482,35 +1159,58 @@ class YTBulkDownloader:
                         # 병합 시 확장자가 바뀔 수 있으므로 mp4로 변경
                         filepath = base + '.mp4'
 
-                    if os.path.exists(filepath):
-                        logger.info(f"Downloaded: {filepath}")
-                        return filepath
-                    else:
+                    if not os.path.exists(filepath):
                         logger.warning(f"File not found after download: {filepath}")
+                        self._cleanup_workspace(workspace)
                         return None
 
+                filepath = self._finalize(filepath, output_dir)
+                self._cleanup_workspace(workspace)
+                logger.info(f"Downloaded: {filepath}")
+                return filepath
+
             except Exception as e:
                 # 취소 요청에 의한 중단
-                if self._cancel_event.is_set():
+                if cancel_event.is_set():
                     logger.info(f"Download cancelled by user: {video_id}")
-                    self._cleanup_partial_files(output_dir, video_id)
+                    self._cleanup_workspace(workspace)
                     return "CANCELLED"
 
                 error_msg = str(e)
 
-                # 포맷 에러이고 아직 재시도 가능하면 관대한 포맷으로 폴백 재시도
-                if 'Requested format is not available' in error_msg and attempt < max_attempts - 1:
-                    logger.warning(f"Format unavailable for {video_id}, retrying with permissive format in 3s... (attempt {attempt + 1}/{max_attempts})")
+                # 미리 추출한 포맷 URL이 만료된 경우 → 새로 추출하여 재시도
+                if prefetched is not None and 'http error 403' in error_msg.lower() and attempt < max_attempts - 1:
+                    logger.warning(f"Prefetched formats expired for {video_id}, re-extracting...")
+                    prefetched = None
                     self._downloaded_bytes_map[video_id] = 0
-                    # 재시도 시 height/codec 제한 없는 관대한 포맷으로 폴백
-                    if quality == 'audio':
-                        ydl_opts['format'] = 'bestaudio'
-                    else:
-                        ydl_opts['format'] = 'bestvideo+bestaudio/best'
-                    time.sleep(3)
                     continue
 
+                # 포맷 에러 → 관대한 포맷으로 재시도하도록 호출자에게 알림
+                if 'Requested format is not available' in error_msg:
+                    logger.warning(f"Format unavailable for {video_id} (format: {ydl_opts['format']})")
+                    self.report_error(video_id, error_msg)
+                    return "FORMAT_UNAVAILABLE"
+
                 error_msg_lower = error_msg.lower()
+
+                # 요청 제한(429) / 봇 확인 → 일시적 차단이므로 스킵 기록 없이 실패 처리
+                throttle_keywords = [
+                    'http error 429', 'too many requests', "confirm you're not a bot",
+                    'confirm you’re not a bot', 'rate-limit', 'rate limit',
+                ]
+                if any(kw in error_msg_lower for kw in throttle_keywords):
+                    logger.warning(f"Throttled by YouTube while downloading {video_id}: {e}")
+                    self._cleanup_workspace(workspace)
+                    self.report_error(video_id, error_msg)
+                    return "THROTTLED"
+
+                # 일시적 네트워크 오류 → 작업 폴더의 .part 파일을 남겨 재시도 시 이어받음
+                # (성인인증 키워드 'age'가 'webpage'에 걸리지 않도록 먼저 확인)
+                if any(kw in error_msg_lower for kw in NETWORK_ERROR_KEYWORDS):
+                    logger.warning(f"Network error while downloading {video_id}: {e}")
+                    self.report_error(video_id, error_msg)
+                    return "NETWORK_ERROR"
+
                 membership_keywords = [
                     'join this channel', 'members-only', 'members only',
                     'membership', '멤버십', 'this video is available to this channel',
@@ -528,28 +1228,99 @@ class YTBulkDownloader:
                     logger.info(f"Age-restricted video skipped: {video_id}")
                     return "AGE_RESTRICTED_SKIP"
 
-                # 리네임 에러 → 임시 파일 정리 후 재시도
-                if 'Unable to rename file' in error_msg and attempt < max_attempts - 1:
-                    logger.warning(f"Rename failed for {video_id}, cleaning up and retrying... (attempt {attempt + 1}/{max_attempts})")
-                    self._cleanup_partial_files(output_dir, video_id)
-                    self._downloaded_bytes_map[video_id] = 0
-                    time.sleep(3)
-                    continue
+                # 리네임 에러 → 임시 파일 정리 후 재시도하도록 알림
+                if 'Unable to rename file' in error_msg:
+                    logger.warning(f"Rename failed for {video_id}, cleaning up partial files")
+                    self._cleanup_workspace(workspace)
+                    self.report_error(video_id, error_msg)
+                    return "RENAME_FAILED"
 
                 logger.error(f"Error downloading {video_id}: {e}")
-                self._cleanup_partial_files(output_dir, video_id)
+                self._cleanup_workspace(workspace)
+                self.report_error(video_id, error_msg)
                 return None
 
+    def report_error(self, video_id: str, error_msg: str):
+        """실패 사유를 진행률 맵에 기록 (작업 큐의 dead-letter 목록에 사용)"""
+        self.set_progress(video_id, {
+            'status': 'error',
+            'error': self._strip_ansi(error_msg)[:500],
+        })
+
     @staticmethod
-    def _cleanup_partial_files(output_dir: str, video_id: str):
-        """취소 시 남은 .part / .ytdl 임시 파일 삭제"""
-        for pattern in ('*.part', '*.ytdl', '*.part-Frag*', '*.temp.*'):
-            for f in glob.glob(os.path.join(output_dir, pattern)):
-                try:
-                    os.remove(f)
-                    logger.info(f"Removed partial file: {f}")
-                except OSError:
-                    pass
+    def workspace_dir(video_id: str, output_dir: str) -> str:
+        """
+        Scratch directory of one download
+
+        Stable for the same video and output folder, so a retry after a
+        network error resumes the .part files left there.
+        """
+        folder_key = hashlib.sha1(os.path.abspath(output_dir).encode('utf-8')).hexdigest()[:8]
+        root = Config.DOWNLOAD_TEMP_DIR or os.path.join(output_dir, WORKSPACE_DIRNAME)
+        return os.path.join(str(root), f"{video_id}_{folder_key}")
+
+    @staticmethod
+    def _finalize(filepath: str, output_dir: str) -> str:
+        """
+        Move a finished file from its workspace into the output folder atomically
+
+        Same volume: a single rename. Another volume (fast temp dir): copy to a
+        .temp name inside the output folder first, then rename, so a partial
+        file never appears under the final name.
+
+        Returns:
+            Final file path
+        """
+        dest = os.path.join(output_dir, os.path.basename(filepath))
+        try:
+            os.replace(filepath, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            staging = dest + '.temp'
+            shutil.copyfile(filepath, staging)
+            os.replace(staging, dest)
+            os.remove(filepath)
+        return dest
+
+    @staticmethod
+    def _cleanup_workspace(workspace: str):
+        """이 다운로드의 작업 폴더만 삭제 (같은 폴더의 다른 다운로드 임시 파일은 유지)"""
+        if not os.path.isdir(workspace):
+            return
+        shutil.rmtree(workspace, ignore_errors=True)
+        logger.info(f"Removed workspace: {workspace}")
+        # 비어 있으면 상위 .incomplete 폴더도 정리
+        try:
+            os.rmdir(os.path.dirname(workspace))
+        except OSError:
+            pass
+
+    def cleanup_stale_workspaces(self, base_dir: str, keep: Iterable[str] = ()) -> int:
+        """
+        Remove workspaces left by earlier runs, keeping those of active downloads
+
+        Args:
+            base_dir: Downloads root searched recursively for workspace folders
+            keep: Further video IDs whose workspaces stay (queued or retrying
+                items that will resume their .part files)
+
+        Returns:
+            Number of workspaces removed
+        """
+        active = set(self.get_active_downloads()) | set(keep)
+        roots = glob.glob(os.path.join(base_dir, '**', WORKSPACE_DIRNAME), recursive=True)
+        if Config.DOWNLOAD_TEMP_DIR:
+            roots.append(str(Config.DOWNLOAD_TEMP_DIR))
+        removed = 0
+        for root in roots:
+            for workspace in glob.glob(os.path.join(root, '*')):
+                video_id = os.path.basename(workspace).rsplit('_', 1)[0]
+                if video_id in active or not os.path.isdir(workspace):
+                    continue
+                self._cleanup_workspace(workspace)
+                removed += 1
+        return removed
 
     def get_download_info(self, video_id: str) -> Optional[Dict]:
         """
@@ -0,0 +1,187 @@
+"""
+Fragment Concurrency Tuner
+
+Chooses yt-dlp's concurrent_fragment_downloads per download instead of a
+fixed value for every DASH/HLS transfer:
+
+- from the measured per-connection throughput (EWMA over finished files),
+  enough connections to move the format in about TARGET_SECONDS
+- capped by a fair share of a total socket budget across the downloads
+  currently running, and by the connections still free in that budget
+
+Progressive (single-URL http/https) formats - YouTube's usual adaptive
+audio/video streams - are parallelised only when a range-capable transfer
+backend (the 'segmented' backend) is active and splits them into byte
+ranges. With the 'native' backend yt-dlp's HTTP downloader moves them over
+a single connection, so budgeted tuning only applies to DASH/HLS there.
+Before the first measurement the configured default is used.
+
+State lives in shared memory (RawArray + Lock) like the bandwidth limiter,
+so download worker processes draw from one budget.
+"""
+
+import logging
+import math
+import multiprocessing
+from typing import Dict, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 공유 상태 인덱스
+_BUDGET, _MAX_FRAGMENTS, _DEFAULT, _ACTIVE_CONNS, _ACTIVE_DOWNLOADS, _PER_CONN, _SAMPLES = range(7)
+
+# 연결당 처리량 측정값을 이만큼 섞음 (지수 이동 평균)
+EWMA_ALPHA = 0.3
+# 형식 하나를 이 시간 안에 받을 만큼 연결 수를 고름 (초)
+TARGET_SECONDS = 20
+# 이보다 짧거나 작은 전송은 측정에서 제외 (연결 수립 시간이 대부분)
+MIN_SAMPLE_SECONDS = 2.0
+MIN_SAMPLE_BYTES = 1024 ** 2
+
+# 조각 단위로 받는 프로토콜 (concurrent_fragment_downloads가 적용됨)
+FRAGMENTED_PROTOCOLS = ('http_dash_segments', 'm3u8', 'ism', 'f4m')
+# 단일 URL 형식 — 바이트 범위 분할 백엔드가 있을 때만 여러 연결 사용
+SEGMENTABLE_PROTOCOLS = ('http', 'https')
+
+
+def format_plan(info: Optional[Dict], range_backend: bool = False) -> Dict:
+    """
+    Size and protocol of the formats yt-dlp will transfer for an info dict
+
+    Args:
+        info: extract_video_info() result (None = unknown)
+        range_backend: A range-capable transfer backend is active, so plain
+            http/https formats can be split over several connections
+
+    Returns:
+        Dict with 'filesize' (largest format, None if unknown),
+        'fragmented' (any format is fragmented), 'segmentable' (every
+        format is a plain HTTP URL) and 'parallel' (the transfer can use
+        several connections); flags are None if unknown
+    """
+    if not info:
+        return {'filesize': None, 'fragmented': None, 'segmentable': None, 'parallel': None}
+    formats = info.get('requested_formats') or [info]
+    sizes = [f.get('filesize') or f.get('filesize_approx') for f in formats]
+    protocols = [f.get('protocol') or '' for f in formats]
+    fragmented = any(p.startswith(FRAGMENTED_PROTOCOLS) for p in protocols)
+    segmentable = all(p in SEGMENTABLE_PROTOCOLS for p in protocols)
+    return {
+        # 영상/음성은 차례로 받으므로 가장 큰 형식 기준
+        'filesize': max(sizes) if all(sizes) else None,
+        'fragmented': fragmented,
+        'segmentable': segmentable,
+        'parallel': fragmented or (range_backend and segmentable),
+    }
+
+
+class FragmentConcurrencyTuner:
+    """Per-download fragment concurrency within a shared socket budget"""
+
+    def __init__(self, budget: Optional[int] = None, max_fragments: Optional[int] = None,
+                 default: Optional[int] = None, shared=None):
+        """
+        Initialize tuner
+
+        Args:
+            budget: Total connections for all transfers (default: Config.DOWNLOAD_SOCKET_BUDGET)
+            max_fragments: Upper bound per download (default: Config.FRAGMENT_CONCURRENCY_MAX)
+            default: Fragment concurrency before any measurement (default: Config.FRAGMENT_CONCURRENCY_DEFAULT)
+            shared: shared_state() of another tuner; used by worker processes
+                to attach to the parent's budget
+        """
+        if shared is not None:
+            self._state, self._lock = shared
+            return
+
+        ctx = multiprocessing.get_context('spawn')
+        self._state = ctx.RawArray('d', 7)
+        self._lock = ctx.Lock()
+        self._state[_BUDGET] = max(1, budget or Config.DOWNLOAD_SOCKET_BUDGET)
+        self._state[_MAX_FRAGMENTS] = max(1, max_fragments or Config.FRAGMENT_CONCURRENCY_MAX)
+        self._state[_DEFAULT] = max(1, default or Config.FRAGMENT_CONCURRENCY_DEFAULT)
+
+    def shared_state(self):
+        """Shared-memory handles to pass to worker processes at creation"""
+        return self._state, self._lock
+
+    def allocate(self, filesize: Optional[int] = None, parallel: Optional[bool] = None) -> int:
+        """
+        Reserve connections for a download that is about to start
+
+        Args:
+            filesize: Largest format size in bytes (None = unknown)
+            parallel: Whether the transfer can use several connections
+                (fragmented or segmented; None = unknown)
+
+        Returns:
+            Connection count to use as concurrent_fragment_downloads; pass it
+            to release() when the transfer ends
+        """
+        with self._lock:
+            budget = int(self._state[_BUDGET])
+            if parallel is False:
+                wanted = 1
+            else:
+                wanted = self._wanted(filesize)
+                fair = budget // (int(self._state[_ACTIVE_DOWNLOADS]) + 1)
+                free = budget - int(self._state[_ACTIVE_CONNS])
+                wanted = min(wanted, int(self._state[_MAX_FRAGMENTS]), fair, free)
+            # 예산을 다 써도 다운로드마다 연결 1개는 보장
+            connections = max(1, wanted)
+            self._state[_ACTIVE_CONNS] += connections
+            self._state[_ACTIVE_DOWNLOADS] += 1
+        return connections
+
+    def _wanted(self, filesize: Optional[int]) -> int:
+        """측정값 기반 희망 연결 수 (caller holds lock)"""
+        per_conn = self._state[_PER_CONN]
+        if not filesize or per_conn <= 0:
+            return int(self._state[_DEFAULT])
+        return math.ceil(filesize / (per_conn * TARGET_SECONDS))
+
+    def release(self, connections: int):
+        """Return connections reserved by allocate()"""
+        with self._lock:
+            self._state[_ACTIVE_CONNS] = max(0.0, self._state[_ACTIVE_CONNS] - connections)
+            self._state[_ACTIVE_DOWNLOADS] = max(0.0, self._state[_ACTIVE_DOWNLOADS] - 1)
+
+    def record(self, nbytes: int, elapsed: float, connections: int):
+        """
+        Feed a finished file's transfer into the per-connection throughput estimate
+
+        Args:
+            nbytes: Bytes transferred
+            elapsed: Transfer time in seconds
+            connections: Connections the transfer used
+        """
+        if elapsed < MIN_SAMPLE_SECONDS or nbytes < MIN_SAMPLE_BYTES or connections < 1:
+            return
+        sample = nbytes / elapsed / connections
+        with self._lock:
+            if self._state[_SAMPLES]:
+                self._state[_PER_CONN] += EWMA_ALPHA * (sample - self._state[_PER_CONN])
+            else:
+                self._state[_PER_CONN] = sample
+            self._state[_SAMPLES] += 1
+
+    def set_budget(self, budget: int):
+        """Change the total connection budget (applies to downloads started afterwards)"""
+        with self._lock:
+            self._state[_BUDGET] = max(1, int(budget))
+        logger.info(f"Download socket budget set to {int(budget)}")
+
+    def get_status(self) -> Dict:
+        """Budget, connections in use and the throughput estimate"""
+        with self._lock:
+            return {
+                'budget': int(self._state[_BUDGET]),
+                'max_fragments': int(self._state[_MAX_FRAGMENTS]),
+                'default': int(self._state[_DEFAULT]),
+                'connections': int(self._state[_ACTIVE_CONNS]),
+                'downloads': int(self._state[_ACTIVE_DOWNLOADS]),
+                'per_connection_throughput': int(self._state[_PER_CONN]),
+                'samples': int(self._state[_SAMPLES]),
+            }
@@ -0,0 +1,211 @@
+"""
+Job Store Service
+
+SQLite persistence for the server-side download queue. Every job and item
+state change is written through, so a crash or closed window does not lose a
+batch: on the next start, unfinished jobs are loaded back and their pending
+(and interrupted running) items are queued again.
+
+Items that keep failing after their retries are kept in a dead-letter
+table so they can be retried in bulk later.
+
+The database lives next to the download archives
+(Config.DOWNLOADS_DIR/.download_queue.db).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 상태 컬럼 외 나머지 필드는 JSON으로 저장 (필드 추가 시 스키마 변경 불필요)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    failed_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# 완료/취소된 작업 보관 기간 (초)
+FINISHED_JOB_RETENTION = 7 * 24 * 3600
+
+
+class JobStore:
+    """Write-through SQLite store for download jobs and their items"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (or create) the job database
+
+        Args:
+            path: Database file (default: Config.QUEUE_DB_PATH)
+        """
+        self.path = Path(path or Config.QUEUE_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 워커 스레드들이 같은 연결을 사용 (접근은 _lock으로 직렬화)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _job_data(job: Dict) -> str:
+        return json.dumps({k: v for k, v in job.items() if k not in ('items', 'status')}, ensure_ascii=False)
+
+    @staticmethod
+    def _item_data(item: Dict) -> str:
+        return json.dumps({k: v for k, v in item.items() if k != 'status'}, ensure_ascii=False)
+
+    def save_job(self, job: Dict):
+        """Insert a new job with all of its items"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO jobs (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+                    (job['id'], job['status'], job['created_at'], self._job_data(job))
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO items (job_id, idx, status, data) VALUES (?, ?, ?, ?)",
+                    [(job['id'], index, item['status'], self._item_data(item))
+                     for index, item in enumerate(job['items'])]
+                )
+        except sqlite3.Error as e:
+            # DB가 잠겼거나 디스크가 가득 차도 작업은 메모리에서 계속 진행 (재시작 시 이어받기만 불가)
+            logger.warning(f"Failed to save job {job['id']}, continuing without persistence: {e}")
+
+    def update(self, job: Dict, indexes: List[int]):
+        """
+        Write the job row and the given items in one transaction
+
+        Args:
+            job: Job dictionary
+            indexes: Indexes of items whose state changed
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, data = ? WHERE id = ?",
+                    (job['status'], self._job_data(job), job['id'])
+                )
+                self._conn.executemany(
+                    "UPDATE items SET status = ?, data = ? WHERE job_id = ? AND idx = ?",
+                    [(job['items'][i]['status'], self._item_data(job['items'][i]), job['id'], i)
+                     for i in indexes]
+                )
+        except sqlite3.Error as e:
+            # 저장 실패가 다운로드 자체를 멈추지 않도록 로그만 남김
+            logger.error(f"Failed to persist job {job['id']}: {e}")
+
+    def load_unfinished(self) -> List[Dict]:
+        """
+        Load jobs that were not completed or cancelled, oldest first
+
+        Finished jobs past the retention period are deleted on the way.
+
+        Returns:
+            List of job dictionaries (same shape DownloadJobQueue uses)
+        """
+        with self._lock, self._conn:
+            cutoff = time.time() - FINISHED_JOB_RETENTION
+            self._conn.execute(
+                "DELETE FROM items WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN ('completed', 'cancelled') AND created_at < ?)",
+                (cutoff,)
+            )
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('completed', 'cancelled') AND created_at < ?",
+                (cutoff,)
+            )
+
+            rows = self._conn.execute(
+                "SELECT id, status, data FROM jobs "
+                "WHERE status NOT IN ('completed', 'cancelled') ORDER BY created_at"
+            ).fetchall()
+            return [self._load_job_row(*row) for row in rows]
+
+    def load_job(self, job_id: str) -> Optional[Dict]:
+        """Load one job with its items (e.g. a finished job no longer kept in memory)"""
+        with self._lock:
+            row = self._conn.execute("SELECT id, status, data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._load_job_row(*row) if row else None
+
+    def _load_job_row(self, job_id: str, status: str, data: str) -> Dict:
+        """Build a job dict from its row and items (caller holds lock)"""
+        job = json.loads(data)
+        job['status'] = status
+        job['items'] = []
+        for item_status, item_data in self._conn.execute(
+            "SELECT status, data FROM items WHERE job_id = ? ORDER BY idx", (job_id,)
+        ):
+            item = json.loads(item_data)
+            item['status'] = item_status
+            job['items'].append(item)
+        return job
+
+    def add_dead_letter(self, entry: Dict) -> int:
+        """
+        Record an item that exhausted its retries
+
+        Args:
+            entry: Dead-letter dictionary (video_id, output_dir, quality, error, ...)
+
+        Returns:
+            Dead-letter ID
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO dead_letters (failed_at, data) VALUES (?, ?)",
+                (entry.get('failed_at') or time.time(), json.dumps(entry, ensure_ascii=False))
+            )
+            return cursor.lastrowid
+
+    def list_dead_letters(self) -> List[Dict]:
+        """All dead-letter entries, oldest first (each with its 'id')"""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM dead_letters ORDER BY id").fetchall()
+        return [{**json.loads(data), 'id': entry_id} for entry_id, data in rows]
+
+    def remove_dead_letters(self, ids: Optional[List[int]] = None) -> int:
+        """
+        Delete dead-letter entries
+
+        Args:
+            ids: Entries to delete (None = all)
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock, self._conn:
+            if ids is None:
+                cursor = self._conn.execute("DELETE FROM dead_letters")
+            else:
+                cursor = self._conn.executemany("DELETE FROM dead_letters WHERE id = ?", [(i,) for i in ids])
+            return cursor.rowcount
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
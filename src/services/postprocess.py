@@ -0,0 +1,112 @@
+"""
+Post-processing Scheduler
+
+Bounded gate for ffmpeg postprocessors (merge, audio extract, fixups).
+The number of concurrent ffmpeg runs is tied to the CPU core count
+(Config.POSTPROCESS_WORKERS), and items over the limit wait in a queue
+instead of competing for cores and disk.
+
+The slot semaphore and the counters (running, waiting, wait times) live in
+shared memory, so download worker processes share one limit and queue
+depth/wait time can be shown for every item in 'converting' progress.
+"""
+
+import logging
+import multiprocessing
+import time
+from typing import Callable, Dict, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 공유 상태 인덱스
+_WORKERS, _RUNNING, _WAITING, _COMPLETED, _TOTAL_WAIT, _MAX_WAIT = range(6)
+
+# 대기 중 진행률 갱신 간격 (초)
+WAIT_REPORT_INTERVAL = 0.5
+
+
+class PostProcessScheduler:
+    """Core-aware slot gate with queue statistics, shared across processes"""
+
+    def __init__(self, workers: Optional[int] = None, shared=None):
+        """
+        Initialize scheduler
+
+        Args:
+            workers: Concurrent ffmpeg runs (default: Config.POSTPROCESS_WORKERS)
+            shared: shared_state() of another scheduler; used by worker
+                processes to attach to the parent's slots and counters
+        """
+        if shared is not None:
+            self._slots, self._state, self._lock = shared
+            self.workers = int(self._state[_WORKERS])
+            return
+
+        ctx = multiprocessing.get_context('spawn')
+        self.workers = max(1, workers or Config.POSTPROCESS_WORKERS)
+        self._slots = ctx.BoundedSemaphore(self.workers)
+        self._state = ctx.RawArray('d', 6)
+        self._lock = ctx.Lock()
+        self._state[_WORKERS] = self.workers
+
+    def shared_state(self):
+        """Shared-memory handles to pass to worker processes at creation"""
+        return self._slots, self._state, self._lock
+
+    def acquire(self, is_cancelled: Callable[[], bool],
+                on_wait: Optional[Callable[[int, float], None]] = None) -> Optional[float]:
+        """
+        Wait for a post-processing slot
+
+        Args:
+            is_cancelled: Polled while waiting; True aborts the wait
+            on_wait: Called periodically while waiting with (queue depth, seconds waited)
+
+        Returns:
+            Seconds waited, or None if cancelled while waiting
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._state[_WAITING] += 1
+
+        acquired = False
+        try:
+            while not self._slots.acquire(timeout=WAIT_REPORT_INTERVAL):
+                if is_cancelled():
+                    return None
+                if on_wait:
+                    on_wait(int(self._state[_WAITING]), time.monotonic() - start)
+            acquired = True
+        finally:
+            waited = time.monotonic() - start
+            with self._lock:
+                self._state[_WAITING] -= 1
+                if acquired:
+                    self._state[_RUNNING] += 1
+                    self._state[_TOTAL_WAIT] += waited
+                    self._state[_MAX_WAIT] = max(self._state[_MAX_WAIT], waited)
+        return waited
+
+    def release(self):
+        """Return a slot after the postprocessor finished (or failed)"""
+        with self._lock:
+            self._state[_RUNNING] -= 1
+            self._state[_COMPLETED] += 1
+        self._slots.release()
+
+    def get_status(self) -> Dict:
+        """Slots, queue depth and wait-time statistics"""
+        with self._lock:
+            running = int(self._state[_RUNNING])
+            completed = int(self._state[_COMPLETED])
+            started = running + completed
+            return {
+                'workers': self.workers,
+                'running': running,
+                'waiting': int(self._state[_WAITING]),
+                'completed': completed,
+                'avg_wait': round(self._state[_TOTAL_WAIT] / started, 2) if started else 0.0,
+                'max_wait': round(self._state[_MAX_WAIT], 2),
+            }
@@ -0,0 +1,196 @@
+"""
+Process Download Executor
+
+Runs YTBulkDownloader.download_video in worker processes from a bounded pool,
+so yt-dlp's Python-heavy work (extraction, signature deciphering, fragment
+bookkeeping, hooks) does not share the GIL with the FastAPI event loop.
+
+Progress entries come back over a multiprocessing queue and are written into
+the parent downloader's progress map. Cancellation uses per-slot flags in
+shared memory, so request_cancel() in the parent reaches the child directly;
+the bandwidth limiter's bucket, the post-processing scheduler's slots and
+the fragment tuner's connection budget are shared the same way.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 동시에 진행 가능한 다운로드 수 상한 (공유 메모리 취소 플래그 슬롯 수)
+CANCEL_SLOTS = 64
+
+# --- 워커 프로세스 측 상태 (initializer에서 설정) ---
+_worker_downloader = None
+_worker_cancel_flags = None
+
+
+class _SharedCancelFlag:
+    """공유 메모리 슬롯 기반 취소 토큰 (threading.Event와 같은 set/is_set 인터페이스)"""
+
+    def __init__(self, flags, slot: int):
+        self._flags = flags
+        self._slot = slot
+
+    def set(self):
+        self._flags[self._slot] = 1
+
+    def is_set(self) -> bool:
+        return bool(self._flags[self._slot])
+
+
+def _init_worker(progress_queue, cancel_flags, bandwidth_shared, postprocess_shared, fragment_shared):
+    """워커 프로세스 초기화: 진행률을 부모로 보내고 부모와 대역폭 버킷을 공유하는 다운로더 생성"""
+    global _worker_downloader, _worker_cancel_flags
+    from utils.logger import setup_logger
+    from services.bandwidth import BandwidthLimiter
+    from services.downloader import YTBulkDownloader
+    from services.fragment_tuner import FragmentConcurrencyTuner
+    from services.postprocess import PostProcessScheduler
+
+    setup_logger("DownloadWorker", logging.INFO)
+    _worker_cancel_flags = cancel_flags
+    _worker_downloader = YTBulkDownloader(
+        progress_listener=lambda video_id, entry: progress_queue.put((video_id, entry)),
+        bandwidth_limiter=BandwidthLimiter(shared=bandwidth_shared) if bandwidth_shared else None,
+        postprocess_scheduler=PostProcessScheduler(shared=postprocess_shared),
+        fragment_tuner=FragmentConcurrencyTuner(shared=fragment_shared),
+    )
+
+
+def _run_download(video_id: str, quality: str, output_dir: Optional[str], slot: int,
+                  info: Optional[Dict] = None, permissive: bool = False):
+    """워커 프로세스에서 실행되는 다운로드 작업"""
+    cancel_flag = _SharedCancelFlag(_worker_cancel_flags, slot)
+    return _worker_downloader.download_video(
+        video_id, quality, output_dir, cancel_event=cancel_flag, info=info, permissive=permissive
+    )
+
+
+def _run_extract(video_id: str, quality: str, permissive: bool = False):
+    """워커 프로세스에서 실행되는 추출(선행) 작업"""
+    return _worker_downloader.extract_video_info(video_id, quality, permissive)
+
+
+class ProcessDownloadExecutor:
+    """Bounded process pool with the same download_video interface as YTBulkDownloader"""
+
+    def __init__(self, downloader, workers: Optional[int] = None):
+        """
+        Initialize executor (processes start lazily on first download)
+
+        Args:
+            downloader: Parent YTBulkDownloader (progress map + cancel handles)
+            workers: Process pool size (default: Config.DOWNLOAD_PROCESS_WORKERS)
+        """
+        self.downloader = downloader
+        self.worker_count = max(1, workers or Config.DOWNLOAD_PROCESS_WORKERS)
+        self._ctx = multiprocessing.get_context('spawn')
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._cancel_flags = None
+        self._free_slots = list(range(CANCEL_SLOTS))
+        self._slot_cond = threading.Condition()
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the process pool and the progress listener thread (idempotent)"""
+        with self._start_lock:
+            if self._pool:
+                return
+            self._progress_queue = self._ctx.Queue()
+            self._cancel_flags = self._ctx.RawArray('b', CANCEL_SLOTS)
+            limiter = self.downloader.bandwidth_limiter
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.worker_count,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(self._progress_queue, self._cancel_flags,
+                          limiter.shared_state() if limiter else None,
+                          self.downloader.postprocess_scheduler.shared_state(),
+                          self.downloader.fragment_tuner.shared_state()),
+            )
+            threading.Thread(target=self._progress_listener, name="download-progress-listener", daemon=True).start()
+        logger.info(f"Process download executor started with {self.worker_count} worker process(es)")
+
+    def shutdown(self):
+        """Stop worker processes"""
+        with self._start_lock:
+            if not self._pool:
+                return
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._progress_queue.put(None)
+            self._pool = None
+
+    def _progress_listener(self):
+        """자식 프로세스의 진행률을 부모 다운로더의 진행률 맵에 반영"""
+        progress_queue = self._progress_queue
+        while True:
+            try:
+                message = progress_queue.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            video_id, entry = message
+            self.downloader.set_progress(video_id, entry)
+
+    def _acquire_slot(self) -> int:
+        with self._slot_cond:
+            while not self._free_slots:
+                self._slot_cond.wait()
+            slot = self._free_slots.pop()
+        self._cancel_flags[slot] = 0
+        return slot
+
+    def _release_slot(self, slot: int):
+        with self._slot_cond:
+            self._free_slots.append(slot)
+            self._slot_cond.notify()
+
+    def extract_video_info(self, video_id: str, quality: str = '720p',
+                           permissive: bool = False) -> Optional[Dict]:
+        """Run the extraction stage in a worker process (same contract as YTBulkDownloader)"""
+        self.start()
+        try:
+            return self._pool.submit(_run_extract, video_id, quality, permissive).result()
+        except Exception as e:
+            logger.error(f"Worker process extraction failed for {video_id}: {e}")
+            return None
+
+    def download_video(self, video_id: str, quality: str = '720p', output_dir: str = None,
+                       cancel_event: Optional[threading.Event] = None,
+                       info: Optional[Dict] = None, permissive: bool = False) -> Optional[str]:
+        """
+        Download a video in a worker process (blocks the calling thread only)
+
+        Same arguments and return values as YTBulkDownloader.download_video.
+        """
+        self.start()
+        slot = self._acquire_slot()
+        cancel_flag = _SharedCancelFlag(self._cancel_flags, slot)
+        if cancel_event is not None and cancel_event.is_set():
+            cancel_flag.set()
+
+        try:
+            # 부모 다운로더에 등록 → /download/cancel/{video_id}가 공유 플래그를 set
+            with self.downloader.track_download(video_id, cancel_flag):
+                future = self._pool.submit(_run_download, video_id, quality, output_dir, slot, info, permissive)
+                while True:
+                    try:
+                        return future.result(timeout=0.2)
+                    except FutureTimeoutError:
+                        # 작업/항목 단위 취소 토큰을 자식 프로세스로 전달
+                        if cancel_event is not None and cancel_event.is_set():
+                            cancel_flag.set()
+        except Exception as e:
+            logger.error(f"Worker process failed for {video_id}: {e}")
+            return None
+        finally:
+            self._release_slot(slot)
@@ -0,0 +1,113 @@
+"""
+Retry Scheduler
+
+Backoff for failed download items without blocking download workers.
+A failed item is handed to the RetryScheduler with its error class; a single
+timer thread re-queues it when its backoff expires, and the worker that
+reported the failure moves straight on to the next ready item.
+
+Backoff is exponential per error class (with jitter). An item that
+exhausts its class's retries goes to the dead-letter list instead.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 오류 분류별 재시도 정책: 최대 재시도 횟수, 첫 대기(초), 최대 대기(초)
+RETRY_POLICIES = {
+    'format': {'max_retries': 1, 'base_delay': 3, 'max_delay': 3},        # 관대한 포맷으로 재시도
+    'rename': {'max_retries': 2, 'base_delay': 3, 'max_delay': 30},       # 임시 파일 정리 후 재시도
+    'network': {'max_retries': 4, 'base_delay': 10, 'max_delay': 300},
+    'throttled': {'max_retries': 3, 'base_delay': 120, 'max_delay': 1800},
+}
+
+# 실패 사유 표시 이름 (작업 항목 reason)
+ERROR_CLASS_LABELS = {
+    'format': 'Format',
+    'rename': 'Rename',
+    'network': 'Network',
+    'throttled': 'Throttled',
+}
+
+
+def backoff_delay(error_class: str, attempt: int) -> Optional[float]:
+    """
+    Delay before retry number `attempt` (1-based) for an error class
+
+    Returns:
+        Seconds to wait, or None if the class is not retryable or its
+        retries are exhausted
+    """
+    policy = RETRY_POLICIES.get(error_class)
+    if not policy or attempt > policy['max_retries']:
+        return None
+    delay = min(policy['max_delay'], policy['base_delay'] * 2 ** (attempt - 1))
+    # 동시에 실패한 항목들이 한꺼번에 재시도하지 않도록 ±20% 분산
+    return delay * random.uniform(0.8, 1.2)
+
+
+class RetryScheduler:
+    """Single timer thread that fires callbacks when retry backoffs expire"""
+
+    def __init__(self, callback: Callable[[str, int], None]):
+        """
+        Initialize scheduler
+
+        Args:
+            callback: Called with (job_id, index) when an item's backoff expires
+        """
+        self._callback = callback
+        self._heap = []                   # [(due, seq, job_id, index)]
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the timer thread (idempotent)"""
+        with self._cond:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._run, name="download-retry-timer", daemon=True)
+            self._thread.start()
+
+    def schedule(self, job_id: str, index: int, retry_at: float):
+        """
+        Re-queue an item at wall-clock time `retry_at`
+
+        Args:
+            job_id: Job ID
+            index: Item index
+            retry_at: time.time() value when the item should be retried
+        """
+        with self._cond:
+            heapq.heappush(self._heap, (retry_at, next(self._counter), job_id, index))
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        """Number of items waiting for their backoff to expire"""
+        with self._cond:
+            return len(self._heap)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                due = self._heap[0][0]
+                now = time.time()
+                if due > now:
+                    # 새 항목이 더 이른 시각으로 들어오면 notify로 깨어남
+                    self._cond.wait(due - now)
+                    continue
+                _, _, job_id, index = heapq.heappop(self._heap)
+            try:
+                self._callback(job_id, index)
+            except Exception as e:
+                logger.error(f"Retry callback failed for job {job_id} item {index}: {e}")
@@ -0,0 +1,154 @@
+"""
+Download Scheduler
+
+Ordering of queued download items, used by DownloadJobQueue in place of a
+plain FIFO queue. Items are grouped into priority tiers (higher first); the
+policy decides the order inside a tier:
+
+- fifo: submission order (previous behavior)
+- shortest: shortest duration first, to maximize finished items per hour
+  (items without a known duration go last)
+- fair: round-robin across groups (channel/playlist folders), so one huge
+  batch cannot starve the others queued behind it
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('fifo', 'shortest', 'fair')
+
+
+class DownloadScheduler:
+    """Blocking priority queue of (job_id, item_index) with a selectable policy"""
+
+    def __init__(self, policy: str = 'fifo'):
+        """
+        Initialize scheduler
+
+        Args:
+            policy: One of POLICIES
+        """
+        if policy not in POLICIES:
+            logger.warning(f"Unknown scheduling policy '{policy}', using fifo")
+            policy = 'fifo'
+        self.policy = policy
+        self._cond = threading.Condition()
+        self._counter = itertools.count()  # 제출 순서 (동일 키 정렬 + fifo 기준)
+        self._tiers: Dict[int, Dict[str, list]] = {}   # {priority: {group: heap}}
+        self._rotation: Dict[int, deque] = {}          # {priority: 라운드로빈 순서의 group}
+        self._size = 0
+
+    def put(self, job_id: str, index: int, priority: int = 0,
+            duration: Optional[int] = None, group: str = ''):
+        """
+        Queue an item
+
+        Args:
+            job_id: Job ID
+            index: Item index within the job
+            priority: Higher runs first, under every policy
+            duration: Video length in seconds (used by 'shortest')
+            group: Fair-share group, e.g. the output folder (used by 'fair')
+        """
+        entry = {
+            'seq': next(self._counter),
+            'job_id': job_id,
+            'index': index,
+            'priority': priority or 0,
+            'duration': duration,
+            'group': group,
+        }
+        self.requeue(entry)
+
+    def requeue(self, entry: Dict):
+        """Put an entry from take() back; it keeps its original submission position"""
+        with self._cond:
+            self._push(entry)
+            self._size += 1
+            self._cond.notify()
+
+    def get(self) -> Tuple[str, int]:
+        """Block until an item is available and return (job_id, index)"""
+        entry = self.take()
+        return entry['job_id'], entry['index']
+
+    def take(self) -> Dict:
+        """Block until an item is available and return its entry (job_id, index, priority ...)"""
+        with self._cond:
+            while not self._size:
+                self._cond.wait()
+            entry = self._pop()
+            self._size -= 1
+            return entry
+
+    def set_policy(self, policy: str):
+        """
+        Switch policy; already queued items are reordered
+
+        Raises:
+            ValueError: Unknown policy
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+        with self._cond:
+            entries = [entry for groups in self._tiers.values()
+                       for heap in groups.values() for _, entry in heap]
+            self.policy = policy
+            self._tiers = {}
+            self._rotation = {}
+            for entry in entries:
+                self._push(entry)
+        logger.info(f"Download scheduling policy set to '{policy}' ({len(entries)} queued item(s) reordered)")
+
+    def get_status(self) -> Dict:
+        """Current policy and number of queued items per priority tier"""
+        with self._cond:
+            return {
+                'policy': self.policy,
+                'policies': list(POLICIES),
+                'queued': self._size,
+                'tiers': {
+                    priority: sum(len(heap) for heap in groups.values())
+                    for priority, groups in sorted(self._tiers.items(), reverse=True)
+                },
+            }
+
+    def _sort_key(self, entry: Dict) -> tuple:
+        if self.policy == 'shortest':
+            duration = entry['duration']
+            return (duration is None, duration or 0, entry['seq'])
+        return (entry['seq'],)
+
+    def _push(self, entry: Dict):
+        """Add entry to its tier/group heap (caller holds lock)"""
+        group = entry['group'] if self.policy == 'fair' else ''
+        groups = self._tiers.setdefault(entry['priority'], {})
+        if group not in groups:
+            groups[group] = []
+            self._rotation.setdefault(entry['priority'], deque()).append(group)
+        heapq.heappush(groups[group], (self._sort_key(entry), entry))
+
+    def _pop(self) -> Dict:
+        """Take the next entry from the highest non-empty tier (caller holds lock)"""
+        priority = max(self._tiers)
+        groups = self._tiers[priority]
+        rotation = self._rotation[priority]
+
+        # 라운드로빈: 맨 앞 그룹에서 하나 꺼내고 뒤로 보냄
+        group = rotation.popleft()
+        heap = groups[group]
+        _, entry = heapq.heappop(heap)
+        if heap:
+            rotation.append(group)
+        else:
+            del groups[group]
+        if not groups:
+            del self._tiers[priority]
+            del self._rotation[priority]
+        return entry
@@ -0,0 +1,136 @@
+"""
+Subscription Store
+
+SQLite persistence for registered channels / playlists and their sync
+state (last sync, next sync, last result, last queued job). Same layout as
+JobStore: scheduling columns plus a JSON data column.
+
+The database lives next to the download archives
+(Config.DOWNLOADS_DIR/.subscriptions.db).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    enabled INTEGER NOT NULL,
+    next_sync_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# 컬럼으로 저장되는 필드 (나머지는 data JSON)
+_COLUMNS = ('id', 'url', 'enabled', 'next_sync_at')
+
+
+class SubscriptionStore:
+    """SQLite store for subscriptions and their per-source sync state"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (or create) the subscription database
+
+        Args:
+            path: Database file (default: Config.SUBSCRIPTION_DB_PATH)
+        """
+        self.path = Path(path or Config.SUBSCRIPTION_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _data(sub: Dict) -> str:
+        return json.dumps({k: v for k, v in sub.items() if k not in _COLUMNS}, ensure_ascii=False)
+
+    @staticmethod
+    def _row(row) -> Dict:
+        sub_id, url, enabled, next_sync_at, data = row
+        return {**json.loads(data), 'id': sub_id, 'url': url, 'enabled': bool(enabled),
+                'next_sync_at': next_sync_at}
+
+    def add(self, sub: Dict) -> int:
+        """
+        Insert a new subscription
+
+        Returns:
+            Subscription ID
+
+        Raises:
+            ValueError: URL is already registered
+        """
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO subscriptions (url, enabled, next_sync_at, data) VALUES (?, ?, ?, ?)",
+                    (sub['url'], int(sub['enabled']), sub['next_sync_at'], self._data(sub))
+                )
+                return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            raise ValueError("이미 등록된 URL입니다.")
+
+    def update(self, sub: Dict):
+        """Write a subscription's settings and sync state"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE subscriptions SET enabled = ?, next_sync_at = ?, data = ? WHERE id = ?",
+                    (int(sub['enabled']), sub['next_sync_at'], self._data(sub), sub['id'])
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to persist subscription {sub['id']}: {e}")
+
+    def get(self, sub_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, url, enabled, next_sync_at, data FROM subscriptions WHERE id = ?", (sub_id,)
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def list(self) -> List[Dict]:
+        """All subscriptions in registration order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, url, enabled, next_sync_at, data FROM subscriptions ORDER BY id"
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def due(self, now: float) -> List[Dict]:
+        """Enabled subscriptions whose next sync time has passed, most overdue first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, url, enabled, next_sync_at, data FROM subscriptions "
+                "WHERE enabled = 1 AND next_sync_at <= ? ORDER BY next_sync_at", (now,)
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def next_due_at(self) -> Optional[float]:
+        """Earliest next sync time among enabled subscriptions (None = nothing scheduled)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_sync_at) FROM subscriptions WHERE enabled = 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def remove(self, sub_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM subscriptions WHERE id = ?", (sub_id,))
+            return cursor.rowcount > 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,283 @@
+"""
+Subscription Sync Scheduler
+
+Registered channels / playlists are re-analyzed on their interval by a
+background thread inside the server. Each sync runs the same analysis as
+the UI (SourceAnalyzer: dedup + per-folder archive + file scan), so only
+uploads that are not downloaded yet are submitted to the DownloadJobQueue.
+Videos still pending in the subscription's previous job are not queued
+twice.
+
+Syncs run one at a time to keep API quota and extraction load flat when
+dozens of channels fall due together. Sync state (last run, result, error,
+last job) is stored per source in the SubscriptionStore.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from services.analyzer import SourceAnalyzer, source_kind
+from services.download_queue import FINAL_STATUSES
+from services.subscription_store import SubscriptionStore
+from utils.config import Config
+from utils.validators import is_valid_youtube_url, normalize_input, validate_quality
+
+logger = logging.getLogger(__name__)
+
+# 수정 가능한 구독 설정
+SUBSCRIPTION_SETTINGS = ('quality', 'include_shorts', 'interval', 'max_videos', 'enabled')
+
+
+class SubscriptionSyncer:
+    """Background scheduler that re-analyzes subscriptions and queues new uploads"""
+
+    def __init__(self, store: Optional[SubscriptionStore], download_queue,
+                 analyzer_factory: Callable[[], SourceAnalyzer]):
+        """
+        Initialize syncer
+
+        Args:
+            store: SubscriptionStore for settings and sync state (may be
+                attached later, but before start())
+            download_queue: DownloadJobQueue that receives new uploads
+            analyzer_factory: Returns a SourceAnalyzer bound to the current
+                API client (the API key can change while the server runs)
+        """
+        self.store = store
+        self.download_queue = download_queue
+        self.analyzer_factory = analyzer_factory
+        self._cond = threading.Condition()
+        self._syncing: Optional[int] = None   # 현재 동기화 중인 구독 ID
+        self._woken = False                   # 대기 전에 들어온 깨우기 요청 (놓치지 않도록)
+        self._thread = None
+
+    def start(self):
+        """Start the scheduler thread (idempotent)"""
+        with self._cond:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._run, name="subscription-sync", daemon=True)
+            self._thread.start()
+        logger.info(f"Subscription sync started: {len(self.store.list())} subscription(s)")
+
+    def add(self, url: str, quality: str = "720p", include_shorts: bool = False,
+            interval: Optional[float] = None, max_videos: Optional[int] = None) -> Dict:
+        """
+        Register a channel or playlist (first sync runs right away)
+
+        Args:
+            url: Channel or playlist URL
+            quality: Download quality for new uploads
+            include_shorts: Keep videos ≤180s (channels)
+            interval: Seconds between syncs (default: Config.SUBSCRIPTION_SYNC_INTERVAL)
+            max_videos: Videos fetched per sync (default: Config.MAX_VIDEOS_PER_REQUEST)
+
+        Returns:
+            Subscription dictionary
+
+        Raises:
+            ValueError: Invalid URL / quality, single video URL or already registered
+        """
+        url = normalize_input(url)
+        if not is_valid_youtube_url(url):
+            raise ValueError("Invalid YouTube URL")
+        kind = source_kind(url)
+        if kind == 'video':
+            raise ValueError("채널 또는 재생목록 URL만 등록할 수 있습니다.")
+
+        sub = {
+            'url': url,
+            'kind': kind,
+            'title': None,                    # 첫 동기화 때 채널/재생목록 이름으로 채움
+            'enabled': True,
+            'created_at': time.time(),
+            'next_sync_at': time.time(),
+            'last_sync_at': None,
+            'last_status': None,              # 'ok' / 'error'
+            'last_error': None,
+            'last_found': 0,                  # 마지막 동기화에서 찾은 미다운로드 영상 수
+            'last_queued': 0,
+            'total_queued': 0,
+            'last_job_id': None,
+            'active_job_ids': [],             # 미완료 영상이 남은 동기화 작업
+            'download_path': None,
+        }
+        sub.update(self._validate_settings({
+            'quality': quality,
+            'include_shorts': include_shorts,
+            'interval': interval or Config.SUBSCRIPTION_SYNC_INTERVAL,
+            'max_videos': max_videos or Config.MAX_VIDEOS_PER_REQUEST,
+        }))
+        sub['id'] = self.store.add(sub)
+        logger.info(f"Subscription {sub['id']} added: {url} (every {sub['interval'] / 3600:.1f}h)")
+        self._wake()
+        return sub
+
+    @staticmethod
+    def _validate_settings(settings: Dict) -> Dict:
+        if 'quality' in settings:
+            valid, quality = validate_quality(settings['quality'])
+            if not valid:
+                raise ValueError(f"Invalid quality: {settings['quality']}")
+            settings['quality'] = quality
+        if 'interval' in settings and settings['interval'] < Config.SUBSCRIPTION_MIN_INTERVAL:
+            raise ValueError(f"동기화 간격은 최소 {Config.SUBSCRIPTION_MIN_INTERVAL}초입니다.")
+        if 'max_videos' in settings and settings['max_videos'] < 1:
+            raise ValueError("max_videos must be at least 1")
+        return settings
+
+    def update(self, sub_id: int, **settings) -> Optional[Dict]:
+        """
+        Change a subscription's settings (None values are ignored)
+
+        Returns:
+            Updated subscription, or None if it does not exist
+
+        Raises:
+            ValueError: Invalid setting
+        """
+        sub = self.store.get(sub_id)
+        if not sub:
+            return None
+        changes = self._validate_settings(
+            {k: v for k, v in settings.items() if k in SUBSCRIPTION_SETTINGS and v is not None}
+        )
+        if 'interval' in changes and sub['last_sync_at']:
+            sub['next_sync_at'] = sub['last_sync_at'] + changes['interval']
+        sub.update(changes)
+        self.store.update(sub)
+        self._wake()
+        return sub
+
+    def remove(self, sub_id: int) -> bool:
+        """Unregister a subscription (already queued downloads keep running)"""
+        return self.store.remove(sub_id)
+
+    def list(self) -> List[Dict]:
+        """All subscriptions with their sync state"""
+        subs = self.store.list()
+        for sub in subs:
+            sub['syncing'] = sub['id'] == self._syncing
+        return subs
+
+    def get(self, sub_id: int) -> Optional[Dict]:
+        return self.store.get(sub_id)
+
+    def sync_now(self, sub_id: int) -> bool:
+        """Move a subscription's next sync to now (runs on the scheduler thread)"""
+        sub = self.store.get(sub_id)
+        if not sub:
+            return False
+        sub['next_sync_at'] = time.time()
+        self.store.update(sub)
+        self._wake()
+        return True
+
+    def _wake(self):
+        with self._cond:
+            self._woken = True
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            for sub in self.store.due(time.time()):
+                self._syncing = sub['id']
+                try:
+                    self._sync(sub)
+                except Exception as e:
+                    logger.error(f"Unexpected error syncing subscription {sub['id']}: {e}")
+                finally:
+                    self._syncing = None
+
+            next_due = self.store.next_due_at()
+            timeout = None if next_due is None else max(1.0, next_due - time.time())
+            with self._cond:
+                # 새 구독/설정 변경/즉시 동기화 요청은 notify로 깨어남
+                if not self._woken:
+                    self._cond.wait(timeout)
+                self._woken = False
+
+    def _pending_video_ids(self, job_ids: List[str]) -> Dict[str, set]:
+        """Unfinished videos per earlier sync job (finished jobs are left out)"""
+        pending = {}
+        for job_id in job_ids:
+            state = self.download_queue.get_job_state(job_id)
+            if not state:
+                continue
+            video_ids = {video_id for video_id, status, _ in state['items'] if status not in FINAL_STATUSES}
+            if video_ids:
+                pending[job_id] = video_ids
+        return pending
+
+    def _save_state(self, sub_id: int, started: float, state: Dict, retry: bool = False):
+        """
+        Write sync results onto the stored subscription
+
+        Settings are re-read so changes made while the sync ran are kept.
+        Failed syncs are retried sooner than the full interval.
+        """
+        sub = self.store.get(sub_id)
+        if not sub:
+            return  # 동기화 중 삭제됨
+        interval = min(sub['interval'], Config.SUBSCRIPTION_RETRY_INTERVAL) if retry else sub['interval']
+        sub.update(state)
+        sub['last_sync_at'] = started
+        # 동기화 중에 즉시 동기화 요청이 들어왔으면 그 시각을 유지
+        if sub['next_sync_at'] <= started:
+            sub['next_sync_at'] = started + interval
+        self.store.update(sub)
+
+    def _sync(self, sub: Dict):
+        """Re-analyze one subscription and queue its new uploads"""
+        started = time.time()
+        logger.info(f"Syncing subscription {sub['id']}: {sub['url']}")
+        try:
+            result = self.analyzer_factory().analyze(sub['url'], sub['max_videos'], sub['include_shorts'])
+        except Exception as e:
+            logger.warning(f"Subscription {sub['id']} sync failed: {e}")
+            self._save_state(sub['id'], started, {
+                'last_status': 'error',
+                'last_error': str(e),
+            }, retry=True)
+            return
+
+        # 이전 동기화 작업에서 아직 끝나지 않은 영상은 다시 넣지 않음
+        pending_jobs = self._pending_video_ids(sub.get('active_job_ids') or [])
+        pending = set().union(*pending_jobs.values())
+        new_videos = [v for v in result['videos'] if v['id'] not in pending]
+        active_job_ids = list(pending_jobs)
+        job_id = sub.get('last_job_id')
+        if new_videos:
+            job = self.download_queue.submit(
+                [
+                    {
+                        'video_id': v['id'],
+                        'title': v.get('title') or '',
+                        'output_dir': result['download_path'],
+                        'duration': v.get('duration'),
+                    }
+                    for v in new_videos
+                ],
+                sub['quality'],
+                priority=Config.SUBSCRIPTION_PRIORITY,
+            )
+            job_id = job['id']
+            active_job_ids.append(job_id)
+
+        self._save_state(sub['id'], started, {
+            'title': result['playlist_name'] or result['channel_name'] or sub.get('title'),
+            'last_status': 'ok',
+            'last_error': None,
+            'last_found': len(result['videos']),
+            'last_queued': len(new_videos),
+            'total_queued': sub.get('total_queued', 0) + len(new_videos),
+            'last_job_id': job_id,
+            'active_job_ids': active_job_ids,
+            'download_path': result['download_path'],
+        })
+        logger.info(
+            f"Subscription {sub['id']} synced in {time.time() - started:.1f}s: "
+            f"{len(new_videos)} new upload(s) queued ({len(pending)} still pending from earlier syncs)"
+        )
@@ -0,0 +1,159 @@
+"""
+YoutubeDL Session Pool
+
+Long-lived yt_dlp.YoutubeDL instances, keyed by option profile, that calls
+check out and return instead of building a fresh instance per video. Reusing
+a session keeps its extractor instances (player JS / signature caches), its
+cookie jar and its HTTP connection pool across a whole batch.
+
+Per-call settings that must not leak between videos are applied at checkout:
+- progress / postprocessor hooks go through a per-session dispatcher
+- the output template is set on the session's params
+- other per-call params (e.g. concurrent_fragment_downloads) are set on the
+  session's params and restored when it is returned
+"""
+
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import yt_dlp
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledSession:
+    """YoutubeDL instance whose hooks are swapped per checkout"""
+
+    def __init__(self, opts: Dict, ydl_class=yt_dlp.YoutubeDL):
+        self.progress_hook: Optional[Callable] = None
+        self.postprocessor_hook: Optional[Callable] = None
+        self.uses = 0
+        self.ydl = ydl_class({
+            **opts,
+            'progress_hooks': [self._dispatch_progress],
+            'postprocessor_hooks': [self._dispatch_postprocessor],
+        })
+
+    def _dispatch_progress(self, d):
+        if self.progress_hook:
+            self.progress_hook(d)
+
+    def _dispatch_postprocessor(self, d):
+        if self.postprocessor_hook:
+            self.postprocessor_hook(d)
+
+    def close(self):
+        try:
+            self.ydl.close()
+        except Exception as e:
+            logger.debug(f"Error closing YoutubeDL session: {e}")
+
+
+class YoutubeDLPool:
+    """Per-profile pool of reusable YoutubeDL sessions (one thread per session at a time)"""
+
+    def __init__(self, max_idle_per_profile: int = 8, max_uses: int = 500, ydl_class=yt_dlp.YoutubeDL):
+        """
+        Initialize pool
+
+        Args:
+            max_idle_per_profile: Idle sessions kept per option profile
+            max_uses: Checkouts before a session is closed and replaced
+                (bounds memory held by long-lived extractor caches)
+            ydl_class: YoutubeDL (sub)class to instantiate
+        """
+        self.max_idle_per_profile = max_idle_per_profile
+        self.max_uses = max_uses
+        self.ydl_class = ydl_class
+        self._idle: Dict[str, List[_PooledSession]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+
+    @staticmethod
+    def _profile_key(opts: Dict) -> str:
+        """옵션 딕셔너리 → 프로필 키 (logger 등 객체는 repr로 구분)"""
+        return json.dumps(opts, sort_keys=True, default=repr)
+
+    @contextmanager
+    def session(self, opts: Dict, outtmpl: Optional[str] = None,
+                progress_hook: Optional[Callable] = None,
+                postprocessor_hook: Optional[Callable] = None,
+                params: Optional[Dict] = None):
+        """
+        Check out a YoutubeDL session for the given option profile
+
+        Args:
+            opts: yt-dlp options without hooks/outtmpl (the profile)
+            outtmpl: Output template for this call
+            progress_hook: Progress hook for this call
+            postprocessor_hook: Postprocessor hook for this call
+            params: yt-dlp params overridden for this call only
+
+        Yields:
+            yt_dlp.YoutubeDL instance (do not use it outside the with block)
+        """
+        key = self._profile_key(opts)
+        with self._lock:
+            idle = self._idle[key]
+            pooled = idle.pop() if idle else None
+            if pooled:
+                self._reused += 1
+            else:
+                self._created += 1
+        if pooled is None:
+            pooled = _PooledSession(opts, self.ydl_class)
+
+        pooled.uses += 1
+        pooled.progress_hook = progress_hook
+        pooled.postprocessor_hook = postprocessor_hook
+        if outtmpl is not None:
+            pooled.ydl.params['outtmpl'] = {'default': outtmpl}
+            pooled.ydl._parse_outtmpl()  # 기본 템플릿 키 채움 (YoutubeDL.__init__과 동일)
+        saved = {}
+        for name, value in (params or {}).items():
+            saved[name] = pooled.ydl.params.get(name)
+            pooled.ydl.params[name] = value
+
+        try:
+            yield pooled.ydl
+        finally:
+            pooled.progress_hook = None
+            pooled.postprocessor_hook = None
+            # 프로필 원래 값으로 복원 (다음 체크아웃에 새지 않도록)
+            for name, value in saved.items():
+                if value is None:
+                    pooled.ydl.params.pop(name, None)
+                else:
+                    pooled.ydl.params[name] = value
+            self._return(key, pooled)
+
+    def _return(self, key: str, pooled: _PooledSession):
+        with self._lock:
+            idle = self._idle[key]
+            if pooled.uses < self.max_uses and len(idle) < self.max_idle_per_profile:
+                idle.append(pooled)
+                return
+        pooled.close()
+
+    def get_status(self) -> Dict:
+        """Session counts for diagnostics"""
+        with self._lock:
+            return {
+                'profiles': len([k for k, v in self._idle.items() if v]),
+                'idle': sum(len(v) for v in self._idle.values()),
+                'created': self._created,
+                'reused': self._reused,
+            }
+
+    def close_all(self):
+        """Close every idle session"""
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+        for pooled in sessions:
+            pooled.close()
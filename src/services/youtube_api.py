@@ -5,16 +5,57 @@ Handles all interactions with YouTube Data API:
 - Get channel videos
 - Get playlist videos
 - Extract video information
+
+Blocking facade over AsyncYouTubeAPIClient for the analysis threads. All
+instances share one event loop on a background thread, so every analysis
+uses the same connection pool and concurrency limit, and independent
+requests (per-playlist fetches, duration batches) run in parallel.
+Responses go through the shared on-disk APIResponseCache
+(Config.API_CACHE_ENABLED).
 """
 
+import asyncio
+import concurrent.futures
 import logging
 import re
-from typing import List, Dict, Optional, Set
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import threading
+from typing import List, Dict, Optional
+
+from services.api_cache import APIResponseCache
+from services.youtube_api_async import AsyncYouTubeAPIClient
+from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_cache: Optional[APIResponseCache] = None
+
+
+def _api_loop() -> asyncio.AbstractEventLoop:
+    """Event loop that runs all Data API requests (started on first use)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="youtube-api", daemon=True).start()
+        return _loop
+
+
+def _response_cache() -> Optional[APIResponseCache]:
+    """Shared response cache (None if disabled or the database can't be opened)"""
+    global _cache
+    if not Config.API_CACHE_ENABLED:
+        return None
+    with _loop_lock:
+        if _cache is None:
+            try:
+                _cache = APIResponseCache()
+            except Exception as e:
+                logger.warning(f"API response cache disabled: {e}")
+                return None
+        return _cache
+
 
 class YouTubeAPIService:
     """YouTube Data API v3 wrapper"""
@@ -27,19 +68,28 @@ class YouTubeAPIService:
             api_key: YouTube Data API key (optional, can be set later)
         """
         self.api_key = api_key
-        self.youtube = None
+        self.client: Optional[AsyncYouTubeAPIClient] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[AsyncYouTubeAPIClient, int] = {}   # 클라이언트별 진행 중인 호출 수
 
         if api_key:
             self._initialize_client()
 
     def _initialize_client(self):
         """Initialize YouTube API client"""
-        try:
-            self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-            logger.info("YouTube API client initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize YouTube API client: {e}")
-            raise
+        client = AsyncYouTubeAPIClient(self.api_key, cache=_response_cache())
+        with self._lock:
+            old, self.client = self.client, client
+            # 진행 중인 분석이 이전 클라이언트를 쓰고 있으면 마지막 호출이 끝날 때 닫음 (_run)
+            idle = old is not None and not self._inflight.get(old)
+        if idle:
+            self._close_client(old)
+        logger.info("YouTube API client initialized")
+
+    @staticmethod
+    def _close_client(client: AsyncYouTubeAPIClient):
+        """Close a replaced client's connection pool on the API loop (without waiting)"""
+        asyncio.run_coroutine_threadsafe(client.aclose(), _api_loop())
 
     def set_api_key(self, api_key: str):
         """
@@ -51,6 +101,35 @@ class YouTubeAPIService:
         self.api_key = api_key
         self._initialize_client()
 
+    def _run(self, method: str, *args, default=None):
+        """
+        Run one AsyncYouTubeAPIClient coroutine on the API loop and wait for it
+
+        Must not be called from the API loop itself.
+        """
+        with self._lock:
+            client = self.client
+            if not client:
+                logger.error("YouTube API client not initialized")
+                return default
+            self._inflight[client] = self._inflight.get(client, 0) + 1
+        try:
+            future = asyncio.run_coroutine_threadsafe(getattr(client, method)(*args), _api_loop())
+            try:
+                return future.result(timeout=Config.API_CALL_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                logger.error(f"YouTube API call {method} timed out after {Config.API_CALL_TIMEOUT:.0f}s")
+                return default
+        finally:
+            with self._lock:
+                self._inflight[client] -= 1
+                retired = not self._inflight[client] and client is not self.client
+                if not self._inflight[client]:
+                    del self._inflight[client]
+            if retired:
+                self._close_client(client)
+
     @staticmethod
     def extract_channel_id(url: str) -> Optional[str]:
         """
@@ -115,37 +194,7 @@ class YouTubeAPIService:
         Returns:
             Channel ID or None
         """
-        if not self.youtube:
-            logger.error("YouTube API client not initialized")
-            return None
-
-        try:
-            # Remove @ if present
-            username = username.lstrip('@')
-
-            # Search for channel
-            request = self.youtube.search().list(
-                part='snippet',
-                q=username,
-                type='channel',
-                maxResults=1
-            )
-            response = request.execute()
-
-            if response.get('items'):
-                channel_id = response['items'][0]['id']['channelId']
-                logger.info(f"Found channel ID for @{username}: {channel_id}")
-                return channel_id
-
-            logger.warning(f"No channel found for username: {username}")
-            return None
-
-        except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error getting channel ID: {e}")
-            return None
+        return self._run('get_channel_id_from_username', username)
 
     def get_channel_title(self, channel_id: str) -> Optional[str]:
         """
@@ -157,30 +206,7 @@ class YouTubeAPIService:
         Returns:
             Channel title or None
         """
-        if not self.youtube:
-            logger.error("YouTube API client not initialized")
-            return None
-
-        try:
-            request = self.youtube.channels().list(
-                part='snippet',
-                id=channel_id
-            )
-            response = request.execute()
-
-            if response.get('items'):
-                title = response['items'][0]['snippet']['title']
-                logger.info(f"Channel title for {channel_id}: {title}")
-                return title
-
-            return None
-
-        except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error getting channel title: {e}")
-            return None
+        return self._run('get_channel_title', channel_id)
 
     def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         """
@@ -192,31 +218,7 @@ class YouTubeAPIService:
         Returns:
             Uploads playlist ID or None
         """
-        if not self.youtube:
-            logger.error("YouTube API client not initialized")
-            return None
-
-        try:
-            request = self.youtube.channels().list(
-                part='contentDetails',
-                id=channel_id
-            )
-            response = request.execute()
-
-            if response.get('items'):
-                uploads_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-                logger.info(f"Uploads playlist ID: {uploads_id}")
-                return uploads_id
-
-            logger.warning(f"No channel found with ID: {channel_id}")
-            return None
-
-        except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error getting uploads playlist: {e}")
-            return None
+        return self._run('get_uploads_playlist_id', channel_id)
 
     def get_playlist_info(self, playlist_id: str) -> Optional[Dict]:
         """
@@ -228,31 +230,7 @@ class YouTubeAPIService:
         Returns:
             Dict containing playlist title and channel title, or None
         """
-        if not self.youtube:
-            logger.error("YouTube API client not initialized")
-            return None
-
-        try:
-            request = self.youtube.playlists().list(
-                part='snippet',
-                id=playlist_id
-            )
-            response = request.execute()
-
-            if response.get('items'):
-                snippet = response['items'][0]['snippet']
-                return {
-                    'title': snippet.get('title', ''),
-                    'channelTitle': snippet.get('channelTitle', '')
-                }
-            return None
-
-        except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error getting playlist info: {e}")
-            return None
+        return self._run('get_playlist_info', playlist_id)
 
     def get_playlist_videos(self, playlist_id: str, max_results: int = 2000) -> List[Dict]:
         """
@@ -260,96 +238,26 @@ class YouTubeAPIService:
 
         Args:
             playlist_id: YouTube playlist ID
-            max_results: Maximum number of videos to fetch (default: 500)
+            max_results: Maximum number of videos to fetch
 
         Returns:
-            List of video dictionaries with id, title, publishedAt
+            List of video dictionaries with id, title, publishedAt, duration
         """
-        if not self.youtube:
-            logger.error("YouTube API client not initialized")
-            return []
-
-        videos = []
-        next_page_token = None
+        return self._run('get_playlist_videos', playlist_id, max_results, default=[])
 
-        try:
-            while len(videos) < max_results:
-                request = self.youtube.playlistItems().list(
-                    part='snippet',
-                    playlistId=playlist_id,
-                    maxResults=min(50, max_results - len(videos)),
-                    pageToken=next_page_token
-                )
-                response = request.execute()
-
-                for item in response.get('items', []):
-                    snippet = item['snippet']
-                    videos.append({
-                        'id': snippet['resourceId']['videoId'],
-                        'title': snippet['title'],
-                        'publishedAt': snippet['publishedAt']
-                    })
-
-                next_page_token = response.get('nextPageToken')
-
-                if not next_page_token:
-                    break
-
-            logger.info(f"Retrieved {len(videos)} videos from playlist {playlist_id}")
-
-            # Fetch duration info for all videos
-            self._enrich_with_duration(videos)
-
-            return videos
-
-        except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
-            return videos
-        except Exception as e:
-            logger.error(f"Error getting playlist videos: {e}")
-            return videos
-
-    def _enrich_with_duration(self, videos: List[Dict]):
-        """
-        Fetch duration (in seconds) for a list of videos and add 'duration' key.
-        Uses videos().list(part='contentDetails') in batches of 50.
+    def get_playlists_videos(self, playlist_ids: List[str], max_results: int = 2000) -> List[List[Dict]]:
         """
-        if not self.youtube or not videos:
-            return
-
-        video_ids = [v['id'] for v in videos]
-        duration_map = {}
-
-        try:
-            for i in range(0, len(video_ids), 50):
-                batch = video_ids[i:i + 50]
-                request = self.youtube.videos().list(
-                    part='contentDetails',
-                    id=','.join(batch)
-                )
-                response = request.execute()
-
-                for item in response.get('items', []):
-                    vid_id = item['id']
-                    duration_str = item['contentDetails']['duration']
-                    duration_map[vid_id] = self._parse_iso8601_duration(duration_str)
+        Get the videos of several playlists concurrently
 
-            for v in videos:
-                v['duration'] = duration_map.get(v['id'])
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch video durations: {e}")
+        Args:
+            playlist_ids: YouTube playlist IDs
+            max_results: Maximum number of videos to fetch per playlist
 
-    @staticmethod
-    def _parse_iso8601_duration(duration: str) -> int:
-        """Parse ISO 8601 duration (e.g. PT1H2M30S) to seconds"""
-        match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration)
-        if not match:
-            return 0
-        hours = int(match.group(1) or 0)
-        minutes = int(match.group(2) or 0)
-        seconds = int(match.group(3) or 0)
-        return hours * 3600 + minutes * 60 + seconds
+        Returns:
+            One video list per playlist ID, in the same order
+        """
+        return self._run('get_playlists_videos', playlist_ids, max_results,
+                         default=[[] for _ in playlist_ids])
 
     def get_channel_videos(self, channel_id: str, max_results: int = 2000) -> List[Dict]:
         """
@@ -362,15 +270,7 @@ class YouTubeAPIService:
         Returns:
             List of video dictionaries
         """
-        # Get uploads playlist ID
-        uploads_id = self.get_uploads_playlist_id(channel_id)
-
-        if not uploads_id:
-            logger.error("Could not get uploads playlist ID")
-            return []
-
-        # Get videos from uploads playlist
-        return self.get_playlist_videos(uploads_id, max_results)
+        return self._run('get_channel_videos', channel_id, max_results, default=[])
 
     def get_channel_playlists(self, channel_id: str) -> List[Dict]:
         """
@@ -382,43 +282,7 @@ class YouTubeAPIService:
         Returns:
             List of playlist dictionaries with id, title
         """
-        if not self.youtube:
-            logger.error("YouTube API client not initialized")
-            return []
-
-        playlists = []
-        next_page_token = None
-
-        try:
-            while True:
-                request = self.youtube.playlists().list(
-                    part='snippet',
-                    channelId=channel_id,
-                    maxResults=50,
-                    pageToken=next_page_token
-                )
-                response = request.execute()
-
-                for item in response.get('items', []):
-                    playlists.append({
-                        'id': item['id'],
-                        'title': item['snippet']['title']
-                    })
-
-                next_page_token = response.get('nextPageToken')
-
-                if not next_page_token:
-                    break
-
-            logger.info(f"Retrieved {len(playlists)} playlists from channel {channel_id}")
-            return playlists
-
-        except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
-            return playlists
-        except Exception as e:
-            logger.error(f"Error getting channel playlists: {e}")
-            return playlists
+        return self._run('get_channel_playlists', channel_id, default=[])
 
 
 # Example usage
@@ -0,0 +1,496 @@
+"""
+Async YouTube Data API v3 Client
+
+asyncio-native client for the endpoints the analyzer uses (search,
+channels, playlists, playlistItems, videos). Every request goes through one
+pooled httpx.AsyncClient - HTTP/2 when the h2 package is installed,
+HTTP/1.1 keep-alive otherwise - and a semaphore caps how many requests are
+in flight, so independent calls (per-playlist fetches, duration batches)
+run in parallel without bursting the API.
+
+With an APIResponseCache, fresh responses are served from disk and stale
+ones are revalidated by ETag (If-None-Match → 304 reuses the stored body).
+Cache reads and writes run in worker threads so SQLite never blocks the
+event loop, and recently parsed bodies are kept in memory per ETag so a
+revalidated response is not parsed again.
+
+Return values and error handling match YouTubeAPIService: lookups return
+None on failure, listings return what was fetched before the error.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from services.api_cache import APIResponseCache
+from utils.config import Config
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3/"
+# videos.list / playlistItems.list 한 번에 받을 수 있는 최대 개수
+MAX_PAGE_SIZE = 50
+# 파싱된 캐시 응답을 메모리에 유지할 개수 (ETag별, 최근 사용 순)
+PARSED_CACHE_SIZE = 256
+
+
+class YouTubeAPIError(Exception):
+    """Error response from the Data API (quota, bad key, not found ...)"""
+
+    def __init__(self, status: int, reason: str, message: str):
+        super().__init__(f"{status} {reason}: {message}")
+        self.status = status
+        self.reason = reason
+
+
+def parse_iso8601_duration(duration: str) -> int:
+    """Parse ISO 8601 duration (e.g. PT1H2M30S) to seconds"""
+    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration)
+    if not match:
+        return 0
+    hours = int(match.group(1) or 0)
+    minutes = int(match.group(2) or 0)
+    seconds = int(match.group(3) or 0)
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class AsyncYouTubeAPIClient:
+    """Pooled, concurrency-bounded YouTube Data API v3 client"""
+
+    def __init__(self, api_key: str, max_concurrency: int = Config.API_CONCURRENCY,
+                 timeout: float = Config.API_TIMEOUT, cache: Optional[APIResponseCache] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize client (the connection pool is opened on first request)
+
+        Args:
+            api_key: YouTube Data API key
+            max_concurrency: Requests in flight at once (also the pool size)
+            timeout: Per-request timeout in seconds
+            cache: On-disk response cache (None = always fetch)
+            transport: httpx transport (default: network; tests pass a mock)
+        """
+        self.api_key = api_key
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._parsed: 'OrderedDict[str, Tuple[Optional[str], Dict]]' = OrderedDict()  # {cache_key: (etag, data)}
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        # 연결 풀과 세마포어는 사용하는 이벤트 루프 안에서 생성해야 함
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=API_BASE_URL,
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _parse_cached(self, cache_key: str, etag: Optional[str], body: str) -> Dict:
+        """Parsed body of a cache entry (memory if the ETag matches, else parsed off the loop)"""
+        entry = self._parsed.get(cache_key)
+        if entry is not None and entry[0] == etag:
+            self._parsed.move_to_end(cache_key)
+            return entry[1]
+        data = await asyncio.to_thread(json.loads, body)
+        self._remember(cache_key, etag, data)
+        return data
+
+    def _remember(self, cache_key: str, etag: Optional[str], data: Dict):
+        self._parsed[cache_key] = (etag, data)
+        self._parsed.move_to_end(cache_key)
+        while len(self._parsed) > PARSED_CACHE_SIZE:
+            self._parsed.popitem(last=False)
+
+    async def _get(self, resource: str, **params) -> Dict:
+        """
+        GET one Data API resource
+
+        Args:
+            resource: Endpoint name (e.g. 'playlistItems')
+            **params: Query parameters (None values are dropped)
+
+        Returns:
+            Parsed JSON response (possibly from the cache; shared between
+            callers, so it must not be modified)
+
+        Raises:
+            YouTubeAPIError: Non-2xx response
+            httpx.HTTPError: Network error / timeout
+        """
+        client = self._ensure_client()
+        query = {k: v for k, v in params.items() if v is not None}
+        headers = {}
+        cache_key = cached = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(resource, query)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached:
+                etag, body, fetched_at = cached
+                if time.time() - fetched_at < self.cache.ttl(resource):
+                    return await self._parse_cached(cache_key, etag, body)
+                if etag:
+                    headers['If-None-Match'] = etag
+
+        query['key'] = self.api_key
+        async with self._semaphore:
+            response = await client.get(resource, params=query, headers=headers)
+        if response.status_code == 304 and cached:
+            logger.debug(f"API cache revalidated: {resource}")
+            await asyncio.to_thread(self.cache.touch, cache_key)
+            return await self._parse_cached(cache_key, cached[0], cached[1])
+        if response.is_error:
+            reason, message = 'error', response.reason_phrase
+            try:
+                error = response.json().get('error', {})
+                message = error.get('message', message)
+                reason = (error.get('errors') or [{}])[0].get('reason', reason)
+            except ValueError:
+                pass
+            raise YouTubeAPIError(response.status_code, reason, message)
+
+        data = response.json()
+        if self.cache is not None:
+            # Data API는 ETag를 헤더와 본문 양쪽에 넣음
+            etag = response.headers.get('etag') or data.get('etag')
+            await asyncio.to_thread(self.cache.put, cache_key, etag, response.text)
+            self._remember(cache_key, etag, data)
+        return data
+
+    async def get_channel_id_from_username(self, username: str) -> Optional[str]:
+        """
+        Get channel ID from username/handle
+
+        Args:
+            username: YouTube username or handle (without @)
+
+        Returns:
+            Channel ID or None
+        """
+        username = username.lstrip('@')
+        try:
+            response = await self._get('search', part='snippet', q=username, type='channel', maxResults=1)
+            if response.get('items'):
+                channel_id = response['items'][0]['id']['channelId']
+                logger.info(f"Found channel ID for @{username}: {channel_id}")
+                return channel_id
+
+            logger.warning(f"No channel found for username: {username}")
+            return None
+
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting channel ID: {e}")
+            return None
+
+    async def get_channel_title(self, channel_id: str) -> Optional[str]:
+        """
+        Get channel title from channel ID
+
+        Returns:
+            Channel title or None
+        """
+        try:
+            response = await self._get('channels', part='snippet', id=channel_id)
+            if response.get('items'):
+                title = response['items'][0]['snippet']['title']
+                logger.info(f"Channel title for {channel_id}: {title}")
+                return title
+            return None
+
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting channel title: {e}")
+            return None
+
+    async def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """
+        Get the uploads playlist ID for a channel
+
+        Returns:
+            Uploads playlist ID or None
+        """
+        try:
+            response = await self._get('channels', part='contentDetails', id=channel_id)
+            if response.get('items'):
+                uploads_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+                logger.info(f"Uploads playlist ID: {uploads_id}")
+                return uploads_id
+
+            logger.warning(f"No channel found with ID: {channel_id}")
+            return None
+
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting uploads playlist: {e}")
+            return None
+
+    async def get_playlist_info(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Get playlist metadata (title, channel)
+
+        Returns:
+            Dict containing playlist title and channel title, or None
+        """
+        try:
+            response = await self._get('playlists', part='snippet', id=playlist_id)
+            if response.get('items'):
+                snippet = response['items'][0]['snippet']
+                return {
+                    'title': snippet.get('title', ''),
+                    'channelTitle': snippet.get('channelTitle', '')
+                }
+            return None
+
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting playlist info: {e}")
+            return None
+
+    async def get_playlist_videos(self, playlist_id: str, max_results: int = 2000) -> List[Dict]:
+        """
+        Get all videos from a playlist
+
+        Pages are fetched one after another (each needs the previous page
+        token); every page's IDs are sent for duration lookup as soon as the
+        page arrives, so those batches overlap with the remaining pagination.
+
+        Args:
+            playlist_id: YouTube playlist ID
+            max_results: Maximum number of videos to fetch
+
+        Returns:
+            List of video dictionaries with id, title, publishedAt, duration
+        """
+        return (await self._fetch_playlist(playlist_id, max_results))['videos']
+
+    async def _fetch_playlist(self, playlist_id: str, max_results: int,
+                              watermark: Optional[Dict] = None) -> Dict:
+        """
+        Page through a playlist, optionally stopping at a watermark
+
+        Args:
+            playlist_id: YouTube playlist ID
+            max_results: Maximum number of videos to fetch
+            watermark: {'newest_id', 'newest_published_at'} of a newest-first
+                playlist; paging stops at that video, or at the first older
+                one if it was deleted
+
+        Returns:
+            Dict with videos (before the watermark), ok (no error),
+            exhausted (reached the end of the playlist) and reached (hit
+            the watermark)
+        """
+        videos = []
+        duration_tasks = []
+        next_page_token = None
+        ok = exhausted = reached = False
+
+        try:
+            while len(videos) < max_results and not reached:
+                response = await self._get(
+                    'playlistItems',
+                    part='snippet',
+                    playlistId=playlist_id,
+                    maxResults=min(MAX_PAGE_SIZE, max_results - len(videos)),
+                    pageToken=next_page_token,
+                )
+
+                page = []
+                for item in response.get('items', []):
+                    snippet = item['snippet']
+                    video = {
+                        'id': snippet['resourceId']['videoId'],
+                        'title': snippet['title'],
+                        'publishedAt': snippet['publishedAt']
+                    }
+                    if watermark and (video['id'] == watermark['newest_id']
+                                      or video['publishedAt'] < watermark['newest_published_at']):
+                        reached = True
+                        break
+                    page.append(video)
+                if page:
+                    duration_tasks.append(asyncio.create_task(self._fetch_durations([v['id'] for v in page])))
+                videos.extend(page)
+
+                next_page_token = response.get('nextPageToken')
+                if not next_page_token:
+                    exhausted = not reached
+                    break
+
+            ok = True
+            logger.info(f"Retrieved {len(videos)} videos from playlist {playlist_id}")
+
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error: {e}")
+        except Exception as e:
+            logger.error(f"Error getting playlist videos: {e}")
+        finally:
+            # 이미 보낸 길이 조회는 페이지 조회가 실패해도 끝까지 받음
+            await self._apply_durations(videos, duration_tasks)
+
+        return {'videos': videos, 'ok': ok, 'exhausted': exhausted, 'reached': reached}
+
+    async def get_playlists_videos(self, playlist_ids: List[str], max_results: int = 2000) -> List[List[Dict]]:
+        """
+        Fetch several playlists concurrently
+
+        Returns:
+            One video list per playlist ID, in the same order
+        """
+        return list(await asyncio.gather(
+            *(self.get_playlist_videos(playlist_id, max_results) for playlist_id in playlist_ids)
+        ))
+
+    async def _fetch_durations(self, video_ids: List[str]) -> Dict[str, int]:
+        """Durations in seconds for up to 50 video IDs (one videos.list call)"""
+        response = await self._get('videos', part='contentDetails', id=','.join(video_ids))
+        return {
+            item['id']: parse_iso8601_duration(item['contentDetails']['duration'])
+            for item in response.get('items', [])
+        }
+
+    @staticmethod
+    async def _apply_durations(videos: List[Dict], duration_tasks: List[asyncio.Task]):
+        """Wait for the duration batches and add a 'duration' key (None if its batch failed)"""
+        if not duration_tasks:
+            return
+        duration_map = {}
+        failed = 0
+        for result in await asyncio.gather(*duration_tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                failed += 1
+                logger.warning(f"Failed to fetch video durations: {result}")
+            else:
+                duration_map.update(result)
+        if failed:
+            logger.warning(f"{failed}/{len(duration_tasks)} duration batch(es) failed")
+
+        for v in videos:
+            v['duration'] = duration_map.get(v['id'])
+
+    async def get_channel_videos(self, channel_id: str, max_results: int = 2000,
+                                 incremental: bool = Config.INCREMENTAL_ANALYSIS) -> List[Dict]:
+        """
+        Get all uploaded videos from a channel
+
+        In incremental mode (needs the response cache) the uploads playlist
+        (newest first) is only paged until the newest upload seen last time;
+        the stored list is merged back in behind the new uploads.
+
+        Args:
+            channel_id: YouTube channel ID
+            max_results: Maximum number of videos to fetch
+            incremental: Stop at the stored watermark when possible
+
+        Returns:
+            List of video dictionaries
+        """
+        uploads_id = await self.get_uploads_playlist_id(channel_id)
+        if not uploads_id:
+            logger.error("Could not get uploads playlist ID")
+            return []
+
+        if not incremental or self.cache is None:
+            return await self.get_playlist_videos(uploads_id, max_results)
+
+        # 저장 목록(최대 수천 개)의 JSON 변환이 이벤트 루프를 막지 않도록 스레드에서 처리
+        known = await asyncio.to_thread(self.cache.get_channel_uploads, channel_id)
+        # 저장된 목록이 요청 개수보다 짧거나 오래됐으면 전체를 다시 받음
+        if known and not (
+            (known['exhausted'] or len(known['videos']) >= max_results)
+            and time.time() - known['refreshed_at'] < Config.INCREMENTAL_FULL_REFRESH
+        ):
+            known = None
+
+        fetched = await self._fetch_playlist(uploads_id, max_results, watermark=known)
+        new_videos = fetched['videos']
+        if not fetched['ok']:
+            return new_videos
+
+        if known and fetched['reached']:
+            new_ids = {v['id'] for v in new_videos}
+            videos = new_videos + [v for v in known['videos'] if v['id'] not in new_ids]
+            await asyncio.to_thread(self.cache.put_channel_uploads, channel_id, videos,
+                                    known['exhausted'], known['refreshed_at'])
+            logger.info(f"Incremental fetch for channel {channel_id}: "
+                        f"{len(new_videos)} new, {len(videos) - len(new_videos)} from watermark")
+            return videos[:max_results]
+
+        # 전체 조회 (또는 워터마크 전에 max_results를 채움)
+        await asyncio.to_thread(self.cache.put_channel_uploads, channel_id, new_videos,
+                                fetched['exhausted'], time.time())
+        return new_videos
+
+    async def get_channel_playlists(self, channel_id: str) -> List[Dict]:
+        """
+        Get all playlists from a channel
+
+        Returns:
+            List of playlist dictionaries with id, title
+        """
+        playlists = []
+        next_page_token = None
+
+        try:
+            while True:
+                response = await self._get(
+                    'playlists',
+                    part='snippet',
+                    channelId=channel_id,
+                    maxResults=MAX_PAGE_SIZE,
+                    pageToken=next_page_token,
+                )
+
+                for item in response.get('items', []):
+                    playlists.append({
+                        'id': item['id'],
+                        'title': item['snippet']['title']
+                    })
+
+                next_page_token = response.get('nextPageToken')
+                if not next_page_token:
+                    break
+
+            logger.info(f"Retrieved {len(playlists)} playlists from channel {channel_id}")
+            return playlists
+
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error: {e}")
+            return playlists
+        except Exception as e:
+            logger.error(f"Error getting channel playlists: {e}")
+            return playlists
@@ -37,6 +37,11 @@ class Config:
 
     # YouTube API
     YOUTUBE_API_KEY: Optional[str] = os.getenv("YOUTUBE_API_KEY", None)
+    # Data API 동시 요청 수 (모든 분석이 연결 풀 하나를 공유, 재생목록별 조회/길이 조회가 병렬 실행)
+    API_CONCURRENCY = int(os.getenv("YTCHITA_API_CONCURRENCY", "8"))
+    API_TIMEOUT = float(os.getenv("YTCHITA_API_TIMEOUT", "30"))  # 요청당 제한 시간 (초)
+    # 호출 하나(페이지 전체 조회 포함)를 기다리는 최대 시간 (초)
+    API_CALL_TIMEOUT = float(os.getenv("YTCHITA_API_CALL_TIMEOUT", "600"))
 
     # Paths
     BASE_DIR = get_base_path()
@@ -46,6 +51,81 @@ class Config:
     # Download settings
     DEFAULT_QUALITY = "720p"
     MAX_VIDEOS_PER_REQUEST = 5000
+    # 채널/재생목록 분석 동시 실행 수 (분석 전용 스레드 풀, 이벤트 루프와 다운로드 스레드와 분리)
+    ANALYSIS_WORKERS = int(os.getenv("YTCHITA_ANALYSIS_WORKERS", "4"))
+
+    # Download queue (서버 측 워커 풀)
+    DOWNLOAD_WORKERS = int(os.getenv("YTCHITA_DOWNLOAD_WORKERS", "2"))  # 시작 동시 다운로드 수
+    DOWNLOAD_WORKERS_MIN = 1
+    DOWNLOAD_WORKERS_MAX = int(os.getenv("YTCHITA_DOWNLOAD_WORKERS_MAX", "8"))
+    # 완료/취소된 작업을 메모리에 유지하는 수 / 시간(초). 그 이후 조회는 작업 저장소(JobStore)에서 읽음
+    FINISHED_JOBS_IN_MEMORY = int(os.getenv("YTCHITA_FINISHED_JOBS_IN_MEMORY", "50"))
+    FINISHED_JOB_MEMORY_TTL = int(os.getenv("YTCHITA_FINISHED_JOB_MEMORY_TTL", "3600"))
+    # 처리량/에러 신호에 따라 동시 다운로드 수 자동 조절 (AIMD)
+    ADAPTIVE_CONCURRENCY = os.getenv("YTCHITA_ADAPTIVE_CONCURRENCY", "1") == "1"
+    ADAPTIVE_CONCURRENCY_INTERVAL = 10  # 평가 주기(초)
+    # 파이프라인 단계별 동시 실행 수: 추출(선행) → 전송(위 동시 다운로드 수) → 후처리(ffmpeg 병합/변환)
+    PIPELINE_EXTRACT_WORKERS = int(os.getenv("YTCHITA_EXTRACT_WORKERS", "2"))
+    PIPELINE_PREFETCH = int(os.getenv("YTCHITA_PREFETCH", "4"))  # 추출 완료 후 전송 대기 최대 수
+    # ffmpeg 후처리 동시 실행 수 (CPU 코어 수 기반) / 후처리 대기 중에도 전송을 이어갈 여유 스레드 수 (대기열 길이 상한)
+    POSTPROCESS_WORKERS = int(os.getenv("YTCHITA_POSTPROCESS_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+    POSTPROCESS_QUEUE_MAX = int(os.getenv("YTCHITA_POSTPROCESS_QUEUE_MAX", str(POSTPROCESS_WORKERS * 2)))
+    # DASH/HLS 조각 동시 연결 수: 다운로드별로 측정 처리량 기반 자동 선택, 전체 연결 수는 예산 이내
+    DOWNLOAD_SOCKET_BUDGET = int(os.getenv("YTCHITA_SOCKET_BUDGET", "32"))
+    FRAGMENT_CONCURRENCY_MAX = int(os.getenv("YTCHITA_FRAGMENT_CONCURRENCY_MAX", "16"))
+    FRAGMENT_CONCURRENCY_DEFAULT = int(os.getenv("YTCHITA_FRAGMENT_CONCURRENCY_DEFAULT", "4"))  # 측정 전 기본값
+    # 단일 URL(비DASH) 형식 전송 백엔드: "segmented" (Range 요청 다중 연결, 미지원 서버는 자동 폴백) / "native" (yt-dlp 기본)
+    TRANSFER_BACKEND = os.getenv("YTCHITA_TRANSFER_BACKEND", "segmented")
+    # 다운로드 실행 방식: "thread" (기본, 서버 프로세스 내 스레드) / "process" (워커 프로세스 풀)
+    DOWNLOAD_EXECUTOR = os.getenv("YTCHITA_DOWNLOAD_EXECUTOR", "thread")
+    DOWNLOAD_PROCESS_WORKERS = int(os.getenv(
+        "YTCHITA_DOWNLOAD_PROCESS_WORKERS",
+        str(DOWNLOAD_WORKERS_MAX + PIPELINE_EXTRACT_WORKERS + POSTPROCESS_WORKERS + POSTPROCESS_QUEUE_MAX)
+    ))
+    # 대기열 순서: "fifo" (제출 순) / "shortest" (짧은 영상 먼저) / "fair" (채널·재생목록 폴더별 라운드로빈)
+    DOWNLOAD_SCHEDULING_POLICY = os.getenv("YTCHITA_SCHEDULING_POLICY", "fifo")
+    # 대기열 상태 저장 DB (재시작 시 미완료 작업 자동 재개)
+    QUEUE_DB_PATH = DOWNLOADS_DIR / ".download_queue.db"
+
+    # 구독(채널/재생목록 자동 동기화): 기본 동기화 간격(초) / 최소 간격 / 실패 시 재시도 간격 / 대기열 우선순위 (수동 다운로드보다 뒤)
+    SUBSCRIPTION_DB_PATH = DOWNLOADS_DIR / ".subscriptions.db"
+    SUBSCRIPTION_SYNC_INTERVAL = int(os.getenv("YTCHITA_SUBSCRIPTION_INTERVAL", str(24 * 3600)))
+    SUBSCRIPTION_MIN_INTERVAL = 600
+    SUBSCRIPTION_RETRY_INTERVAL = 3600
+    SUBSCRIPTION_PRIORITY = -1
+
+    # Data API 응답 캐시 (ETag 저장, 유효 시간이 지나면 If-None-Match로 재검증 - 304면 저장된 응답 재사용)
+    API_CACHE_ENABLED = os.getenv("YTCHITA_API_CACHE", "1") == "1"
+    API_CACHE_DB_PATH = DOWNLOADS_DIR / ".api_cache.db"
+    # 엔드포인트별 유효 시간(초): 채널 제목/업로드 재생목록 ID, 영상 길이는 길게, 재생목록 페이지는 짧게
+    API_CACHE_TTL = {
+        'search': int(os.getenv("YTCHITA_API_CACHE_TTL_SEARCH", str(30 * 86400))),
+        'channels': int(os.getenv("YTCHITA_API_CACHE_TTL_CHANNELS", str(7 * 86400))),
+        'videos': int(os.getenv("YTCHITA_API_CACHE_TTL_VIDEOS", str(30 * 86400))),
+        'playlists': int(os.getenv("YTCHITA_API_CACHE_TTL_PLAYLISTS", "3600")),
+        'playlistItems': int(os.getenv("YTCHITA_API_CACHE_TTL_PLAYLIST_ITEMS", "600")),
+    }
+    API_CACHE_MAX_AGE = 90 * 86400  # 이보다 오래 재검증되지 않은 항목은 시작 시 삭제
+    # 증분 채널 분석: 채널별로 마지막으로 본 최신 업로드(워터마크)까지만 페이지를 읽고 나머지는 저장된 목록과 병합
+    # 삭제/비공개 전환된 영상을 반영하도록 일정 기간마다 전체 목록을 다시 받음
+    INCREMENTAL_ANALYSIS = os.getenv("YTCHITA_INCREMENTAL_ANALYSIS", "1") == "1"
+    INCREMENTAL_FULL_REFRESH = int(os.getenv("YTCHITA_INCREMENTAL_FULL_REFRESH", str(7 * 86400)))
+
+    # 디스크 여유 공간: 항상 남겨 둘 여유(bytes) / 크기를 알 수 없을 때 예약량 / 일시 정지 중 재확인 간격(초)
+    DISK_FREE_MARGIN = int(os.getenv("YTCHITA_DISK_FREE_MARGIN", str(1024 ** 3)))
+    DISK_FALLBACK_ESTIMATE = int(os.getenv("YTCHITA_DISK_FALLBACK_ESTIMATE", str(512 * 1024 ** 2)))
+    DISK_CHECK_INTERVAL = 10
+
+    # 다운로드별 작업 폴더 위치 (미설정 시 출력 폴더 안 .incomplete/). 빠른 볼륨 지정 가능
+    DOWNLOAD_TEMP_DIR = os.getenv("YTCHITA_TEMP_DIR") or None
+
+    # Bandwidth (bytes/s, 0 = 무제한) — 전체 합계 상한 / 다운로드별 상한
+    BANDWIDTH_LIMIT = int(os.getenv("YTCHITA_BANDWIDTH_LIMIT", "0"))
+    PER_DOWNLOAD_BANDWIDTH_LIMIT = int(os.getenv("YTCHITA_PER_DOWNLOAD_BANDWIDTH_LIMIT", "0"))
+
+    # Progress stream (SSE) — 변경분 전송 최소 간격(초), keep-alive 간격(초)
+    PROGRESS_STREAM_INTERVAL = 0.5
+    PROGRESS_STREAM_KEEPALIVE = 15
 
     # Performance
     CHUNK_SIZE = 8192  # For file operations
@@ -0,0 +1,115 @@
+"""
+AdaptiveConcurrencyController AIMD steps (evaluated directly, no timer thread)
+
+Run from the repository root:
+
+    python -m pytest tests/test_concurrency.py
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.concurrency import AdaptiveConcurrencyController  # noqa: E402
+
+MB = 1024 ** 2
+
+
+class StubDownloader:
+    def get_transferred_bytes(self) -> int:
+        return 0
+
+
+class AdaptiveConcurrencyTest(unittest.TestCase):
+
+    def controller(self, initial=4, min_limit=1, max_limit=8) -> AdaptiveConcurrencyController:
+        return AdaptiveConcurrencyController(StubDownloader(), initial=initial, min_limit=min_limit,
+                                             max_limit=max_limit, adaptive=False, interval=1)
+
+    @staticmethod
+    def saturate(controller):
+        for _ in range(controller.target - controller.active):
+            controller.acquire()
+
+    def test_initial_target_is_clamped(self):
+        self.assertEqual(self.controller(initial=20).target, 8)
+        self.assertEqual(self.controller(initial=1, min_limit=2).target, 2)
+
+    def test_throttled_result_halves_target(self):
+        c = self.controller(initial=8)
+        c.record_result({'status': 'failed', 'reason': 'Throttled'})
+        c._evaluate(10 * MB)
+        self.assertEqual(c.target, 4)
+        self.assertIn('throttled', c.get_status()['history'][-1]['reason'])
+
+    def test_decrease_stops_at_floor(self):
+        c = self.controller(initial=3, min_limit=2)
+        for _ in range(3):
+            c.record_result({'status': 'failed', 'reason': 'Throttled'})
+            c._evaluate(MB)
+        self.assertEqual(c.target, 2)
+
+    def test_high_error_rate_halves_target(self):
+        c = self.controller(initial=6)
+        for status in ('failed', 'failed', 'done'):
+            c.record_result({'status': status})
+        c._evaluate(MB)
+        self.assertEqual(c.target, 3)
+
+    def test_single_failure_is_not_an_error_rate(self):
+        c = self.controller(initial=6)
+        c.record_result({'status': 'failed'})
+        c._evaluate(0)
+        self.assertEqual(c.target, 6)
+
+    def test_increases_by_one_when_saturated(self):
+        c = self.controller(initial=4)
+        self.saturate(c)
+        c._evaluate(10 * MB)
+        self.assertEqual(c.target, 5)
+
+    def test_steps_back_when_increase_did_not_help(self):
+        c = self.controller(initial=4)
+        self.saturate(c)
+        c._evaluate(10 * MB)
+        self.saturate(c)
+        c._evaluate(10 * MB)      # 5로 늘렸지만 처리량 그대로
+        self.assertEqual(c.target, 4)
+        self.assertIn('no throughput gain', c.get_status()['history'][-1]['reason'])
+
+    def test_keeps_increasing_while_throughput_grows(self):
+        c = self.controller(initial=4)
+        for throughput in (10, 12, 14):
+            self.saturate(c)
+            c._evaluate(throughput * MB)
+        self.assertEqual(c.target, 7)
+
+    def test_increase_stops_at_ceiling(self):
+        c = self.controller(initial=8, max_limit=8)
+        self.saturate(c)
+        c._evaluate(10 * MB)
+        self.assertEqual(c.target, 8)
+
+    def test_no_change_when_slots_are_idle(self):
+        c = self.controller(initial=4)
+        c.acquire()
+        c.release()
+        c._evaluate(10 * MB)
+        self.assertEqual(c.target, 4)
+
+    def test_acquire_blocks_at_target(self):
+        c = self.controller(initial=1)
+        c.acquire()
+        acquired = threading.Event()
+        t = threading.Thread(target=lambda: (c.acquire(), acquired.set()), daemon=True)
+        t.start()
+        self.assertFalse(acquired.wait(0.1))
+        c.release()
+        self.assertTrue(acquired.wait(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+DiskSpaceGuard admission with a stubbed shutil.disk_usage
+
+Run from the repository root:
+
+    python -m pytest tests/test_disk_space.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import disk_space  # noqa: E402
+from services.disk_space import DiskFullError, DiskSpaceGuard  # noqa: E402
+
+
+def never() -> bool:
+    return False
+
+
+def once() -> bool:
+    """is_cancelled that lets one check through, then aborts (admitted only without waiting)"""
+    calls = []
+
+    def is_cancelled():
+        calls.append(1)
+        return len(calls) > 1
+    return is_cancelled
+
+
+class DiskSpaceGuardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+        self.free = 100
+        patcher = mock.patch.object(disk_space.shutil, 'disk_usage',
+                                    side_effect=lambda path: SimpleNamespace(free=self.free))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.guard = DiskSpaceGuard(margin=0, fallback_estimate=10, interval=0.02)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def workspace(self, name: str, written: int = 0) -> str:
+        path = os.path.join(self.path, name)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'media.part'), 'wb') as f:
+            f.write(b'\0' * written)
+        return path
+
+    def start_reserve(self, key, nbytes, admitted):
+        def run():
+            if self.guard.reserve(key, self.path, nbytes, never):
+                admitted.append(key)
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        return t
+
+    def wait_for(self, condition, timeout=2.0):
+        deadline = time.time() + timeout
+        while not condition():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+
+    def test_reserve_and_release(self):
+        self.assertTrue(self.guard.reserve('a', self.path, 60, never))
+        self.assertEqual(self.guard.get_status()['reserved'], 60)
+        self.guard.release('a')
+        self.guard.release('a')  # 두 번 반납해도 무시
+        self.assertEqual(self.guard.get_status()['reservations'], 0)
+
+    def test_unknown_size_uses_fallback_estimate(self):
+        self.assertTrue(self.guard.reserve('a', self.path, None, never))
+        self.assertEqual(self.guard.get_status()['reserved'], 10)
+
+    def test_waits_in_order_and_resumes_on_release(self):
+        self.assertTrue(self.guard.reserve('a', self.path, 60, never))
+        admitted = []
+        b = self.start_reserve('b', 60, admitted)
+        self.wait_for(lambda: self.guard.get_status()['paused'])
+        # c는 들어갈 공간이 있어도 먼저 기다리던 b를 앞지르지 않음
+        c = self.start_reserve('c', 10, admitted)
+        self.wait_for(lambda: self.guard.get_status()['waiting'] == 2)
+        time.sleep(0.1)
+        self.assertEqual(admitted, [])
+
+        self.guard.release('a')
+        b.join(2)
+        c.join(2)
+        self.assertEqual(admitted, ['b', 'c'])
+        self.assertFalse(self.guard.get_status()['paused'])
+
+    def test_cancel_while_waiting(self):
+        self.assertTrue(self.guard.reserve('a', self.path, 60, never))
+        self.assertFalse(self.guard.reserve('b', self.path, 60, once()))
+        self.assertEqual(self.guard.get_status()['waiting'], 0)
+
+    def test_item_that_can_never_fit_fails(self):
+        with self.assertRaises(DiskFullError):
+            self.guard.reserve('a', self.path, 150, never)
+        status = self.guard.get_status()
+        self.assertEqual((status['waiting'], status['reservations'], status['paused']), (0, 0, False))
+
+    def test_written_workspace_bytes_are_not_counted_twice(self):
+        ws = self.workspace('a')
+        self.assertTrue(self.guard.reserve('a', self.path, 80, never, workspace=ws))
+        # a가 50바이트를 기록 → 여유 공간 50, a의 남은 예약 30
+        self.workspace('a', written=50)
+        self.free = 50
+        time.sleep(self.guard.interval)  # 기록량은 interval마다 다시 확인
+        self.assertTrue(self.guard.reserve('b', self.path, 20, once()))
+
+    def test_workspace_scans_are_cached_per_interval(self):
+        self.guard.interval = 60
+        self.assertTrue(self.guard.reserve('a', self.path, 60, never, workspace=self.workspace('a')))
+        volume = os.stat(self.path).st_dev
+        with mock.patch.object(disk_space, '_dir_size', wraps=disk_space._dir_size) as scan:
+            for _ in range(5):
+                self.assertEqual(self.guard._reserved_on(volume), 60)
+        # 대기 중 재확인마다 작업 폴더를 다시 훑지 않음
+        self.assertEqual(scan.call_count, 0)
+
+    def test_resumed_bytes_of_the_item_itself_count_as_written(self):
+        ws = self.workspace('a', written=40)
+        self.free = 60
+        self.assertTrue(self.guard.reserve('a', self.path, 90, never, workspace=ws))
+
+
+if __name__ == '__main__':
+    unittest.main()
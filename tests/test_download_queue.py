@@ -0,0 +1,140 @@
+"""
+DownloadJobQueue pipeline ordering with stub downloader / executor
+
+Run from the repository root:
+
+    python -m pytest tests/test_download_queue.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.concurrency import AdaptiveConcurrencyController  # noqa: E402
+from services.download_queue import DownloadJobQueue  # noqa: E402
+from utils.config import Config  # noqa: E402
+
+
+class StubDownloader:
+    """Downloader + executor: records extractions and downloads, first download waits for `gate`"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.postprocess_scheduler = SimpleNamespace(workers=0, get_status=dict)
+        self.fragment_tuner = SimpleNamespace(get_status=dict)
+        self.gate = threading.Event()
+        self.extracted = []
+        self.downloaded = []
+
+    def add_progress_listener(self, listener):
+        pass
+
+    def get_progress(self, video_id):
+        return {}
+
+    def set_progress(self, video_id, entry):
+        pass
+
+    def report_error(self, video_id, error_msg):
+        pass
+
+    @staticmethod
+    def workspace_dir(video_id, output_dir):
+        return os.path.join(output_dir, '.incomplete', video_id)
+
+    def get_transferred_bytes(self):
+        return 0
+
+    def extract_video_info(self, video_id, quality, permissive=False):
+        self.extracted.append(video_id)
+        return {'id': video_id}
+
+    def download_video(self, video_id, quality, output_dir, cancel_event=None, info=None, permissive=False):
+        self.downloaded.append(video_id)
+        self.gate.wait(5)
+        return os.path.join(output_dir, f'{video_id}.mp4')
+
+
+class CountingController(AdaptiveConcurrencyController):
+    def __init__(self, downloader):
+        super().__init__(downloader, initial=1, min_limit=1, max_limit=1, adaptive=False, interval=1)
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        super().acquire()
+
+
+class DownloadQueueOrderingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        for name, value in (('PIPELINE_PREFETCH', 4), ('PIPELINE_EXTRACT_WORKERS', 1),
+                            ('POSTPROCESS_QUEUE_MAX', 0)):
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.downloader = StubDownloader(self.tmpdir.name)
+        self.controller = CountingController(self.downloader)
+        guard = SimpleNamespace(reserve=lambda *args, **kwargs: True, release=lambda key: None, get_status=dict)
+        duplicate_filter = SimpleNamespace(is_file_downloaded=lambda video_id, output_dir: False)
+        # 전송 스레드 1개: 첫 항목이 gate에서 멈춘 동안 나머지는 추출 후 대기
+        self.queue = DownloadJobQueue(self.downloader, duplicate_filter, controller=self.controller,
+                                      policy='fifo', disk_guard=guard)
+
+    def submit(self, prefix: str, count: int, priority: int = 0) -> str:
+        items = [{'video_id': f'{prefix}{n}', 'output_dir': self.tmpdir.name} for n in range(count)]
+        return self.queue.submit(items, '720p', priority=priority)['id']
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.time() + timeout
+        while not condition():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+
+    def finished(self, job_id) -> bool:
+        return self.queue.get_job(job_id)['status'] in ('completed', 'cancelled')
+
+    def test_higher_priority_job_overtakes_prefetched_items(self):
+        low = self.submit('a', 4)
+        self.wait_for(lambda: self.downloader.downloaded == ['a0'] and self.queue._ready.qsize() == 3)
+
+        high = self.submit('b', 1, priority=5)
+        self.downloader.gate.set()
+        self.wait_for(lambda: self.finished(low) and self.finished(high))
+        self.assertEqual(self.downloader.downloaded, ['a0', 'b0', 'a1', 'a2', 'a3'])
+        # 되돌린 항목은 다시 추출하지 않음
+        self.assertEqual(sorted(self.downloader.extracted), ['a0', 'a1', 'a2', 'a3', 'b0'])
+
+    def test_policy_change_reorders_prefetched_items(self):
+        items = [{'video_id': f'v{n}', 'output_dir': self.tmpdir.name, 'duration': duration}
+                 for n, duration in enumerate((10, 300, 200, 100))]
+        job_id = self.queue.submit(items, '720p')['id']
+        self.wait_for(lambda: self.queue._ready.qsize() == 3)
+
+        self.queue.set_policy('shortest')
+        self.downloader.gate.set()
+        self.wait_for(lambda: self.finished(job_id))
+        self.assertEqual(self.downloader.downloaded, ['v0', 'v3', 'v2', 'v1'])
+
+    def test_cancelled_items_do_not_take_transfer_slots(self):
+        job_id = self.submit('a', 3)
+        self.wait_for(lambda: self.downloader.downloaded == ['a0'] and self.queue._ready.qsize() == 2)
+
+        self.assertTrue(self.queue.cancel_item(job_id, 1))
+        self.downloader.gate.set()
+        self.wait_for(lambda: self.finished(job_id))
+        self.assertEqual(self.downloader.downloaded, ['a0', 'a2'])
+        self.assertEqual(self.controller.acquired, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Retry backoff policy and RetryScheduler
+
+Run from the repository root:
+
+    python -m pytest tests/test_retry.py
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import retry  # noqa: E402
+from services.retry import RETRY_POLICIES, RetryScheduler, backoff_delay  # noqa: E402
+
+
+class BackoffDelayTest(unittest.TestCase):
+
+    def test_delay_stays_within_jitter_bounds(self):
+        for error_class, policy in RETRY_POLICIES.items():
+            for attempt in range(1, policy['max_retries'] + 1):
+                base = min(policy['max_delay'], policy['base_delay'] * 2 ** (attempt - 1))
+                for _ in range(50):
+                    delay = backoff_delay(error_class, attempt)
+                    self.assertGreaterEqual(delay, base * 0.8, (error_class, attempt))
+                    self.assertLessEqual(delay, base * 1.2, (error_class, attempt))
+
+    def test_jitter_extremes(self):
+        with mock.patch.object(retry.random, 'uniform', side_effect=lambda low, high: low):
+            self.assertAlmostEqual(backoff_delay('network', 2), 16)
+        with mock.patch.object(retry.random, 'uniform', side_effect=lambda low, high: high):
+            self.assertAlmostEqual(backoff_delay('network', 2), 24)
+
+    def test_exponential_growth_is_capped_per_class(self):
+        policy = {'max_retries': 10, 'base_delay': 10, 'max_delay': 50}
+        with mock.patch.dict(RETRY_POLICIES, {'test': policy}), \
+                mock.patch.object(retry.random, 'uniform', return_value=1.0):
+            self.assertEqual([backoff_delay('test', n) for n in range(1, 6)], [10, 20, 40, 50, 50])
+
+    def test_exhausted_or_unknown_class_is_not_retried(self):
+        for error_class, policy in RETRY_POLICIES.items():
+            self.assertIsNone(backoff_delay(error_class, policy['max_retries'] + 1))
+        self.assertIsNone(backoff_delay('unknown', 1))
+
+
+class RetrySchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fired = []
+        self.done = threading.Event()
+        self.expected = 0
+
+    def callback(self, job_id, index):
+        self.fired.append((job_id, index))
+        if len(self.fired) >= self.expected:
+            self.done.set()
+
+    def test_fires_in_due_order(self):
+        scheduler = RetryScheduler(self.callback)
+        scheduler.start()
+        now = time.time()
+        self.expected = 3
+        scheduler.schedule('late', 0, now + 0.3)
+        scheduler.schedule('early', 1, now + 0.1)   # 대기 중인 타이머보다 이른 항목 → 먼저 실행
+        scheduler.schedule('overdue', 2, now - 1)
+        self.assertEqual(scheduler.pending_count(), 3)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.fired, [('overdue', 2), ('early', 1), ('late', 0)])
+        self.assertEqual(scheduler.pending_count(), 0)
+
+    def test_does_not_fire_before_due(self):
+        scheduler = RetryScheduler(self.callback)
+        scheduler.start()
+        self.expected = 1
+        scheduler.schedule('job', 0, time.time() + 0.3)
+        self.assertFalse(self.done.wait(0.1))
+        self.assertTrue(self.done.wait(2))
+
+    def test_callback_error_does_not_stop_the_timer(self):
+        calls = []
+
+        def callback(job_id, index):
+            calls.append(job_id)
+            if job_id == 'bad':
+                raise RuntimeError('boom')
+            self.done.set()
+
+        scheduler = RetryScheduler(callback)
+        scheduler.start()
+        scheduler.schedule('bad', 0, time.time())
+        scheduler.schedule('good', 1, time.time() + 0.05)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(calls, ['bad', 'good'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+DownloadScheduler ordering policies and priority tiers
+
+Run from the repository root:
+
+    python -m pytest tests/test_scheduler.py
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.scheduler import DownloadScheduler  # noqa: E402
+
+
+def drain(scheduler: DownloadScheduler) -> list:
+    order = []
+    while scheduler.get_status()['queued']:
+        order.append(scheduler.get()[1])
+    return order
+
+
+class DownloadSchedulerTest(unittest.TestCase):
+
+    def test_fifo_keeps_submission_order(self):
+        s = DownloadScheduler('fifo')
+        for index, duration in enumerate((300, 60, None, 120)):
+            s.put('job', index, duration=duration)
+        self.assertEqual(drain(s), [0, 1, 2, 3])
+
+    def test_shortest_first_with_unknown_durations_last(self):
+        s = DownloadScheduler('shortest')
+        for index, duration in enumerate((300, None, 60, 120, 60)):
+            s.put('job', index, duration=duration)
+        self.assertEqual(drain(s), [2, 4, 3, 0, 1])
+
+    def test_fair_round_robins_across_groups(self):
+        s = DownloadScheduler('fair')
+        for index in range(4):
+            s.put('big', index, group='A')
+        for index in range(4, 6):
+            s.put('small', index, group='B')
+        self.assertEqual(drain(s), [0, 4, 1, 5, 2, 3])
+
+    def test_higher_priority_tier_runs_first_under_every_policy(self):
+        for policy in ('fifo', 'shortest', 'fair'):
+            s = DownloadScheduler(policy)
+            s.put('low', 0, priority=0, duration=10, group='A')
+            s.put('low', 1, priority=0, duration=20, group='B')
+            s.put('high', 2, priority=5, duration=900, group='A')
+            s.put('mid', 3, priority=1, duration=30, group='C')
+            self.assertEqual(drain(s)[:2], [2, 3], policy)
+
+    def test_set_policy_reorders_queued_items(self):
+        s = DownloadScheduler('fifo')
+        for index, duration in enumerate((300, 60, 120)):
+            s.put('job', index, duration=duration)
+        s.set_policy('shortest')
+        self.assertEqual(drain(s), [1, 2, 0])
+
+    def test_status_counts_items_per_tier(self):
+        s = DownloadScheduler('fifo')
+        s.put('a', 0, priority=1)
+        s.put('a', 1, priority=0)
+        s.put('a', 2, priority=0)
+        self.assertEqual(s.get_status()['tiers'], {1: 1, 0: 2})
+        self.assertEqual(s.get_status()['queued'], 3)
+
+    def test_unknown_policy(self):
+        self.assertEqual(DownloadScheduler('random').policy, 'fifo')
+        with self.assertRaises(ValueError):
+            DownloadScheduler().set_policy('random')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+"""
+SegmentedHTTPBackend against a local HTTP Range server
+
+Run from the repository root:
+
+    python -m pytest tests/test_segmented_backend.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import yt_dlp  # noqa: E402
+
+from services import downloader  # noqa: E402
+from services.downloader import NETWORK_ERROR_KEYWORDS, SegmentedHTTPBackend, TransferNotSupported  # noqa: E402
+
+CONTENT = bytes(range(256)) * (4 * 1024 * 4)   # 4 MB
+CHUNK = 256 * 1024
+
+
+class RangeServer:
+    """Serves CONTENT with Range support; can cut connections or ignore Range"""
+
+    def __init__(self):
+        self.served = 0               # 보낸 본문 바이트
+        self.drop_after = None        # 이만큼 보낸 뒤 모든 응답을 중간에 끊음
+        self.ignore_range = False
+        self.delay = 0.0              # 64KB마다 대기 (전송 속도 제한)
+        self.active = 0               # 응답 중인 요청 수
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server.lock:
+                    server.active += 1
+                try:
+                    self.respond()
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+            def respond(self):
+                header = self.headers.get('Range')
+                if server.ignore_range or not header:
+                    start, end = 0, len(CONTENT) - 1
+                    self.send_response(200)
+                else:
+                    first, _, last = header.split('=', 1)[1].partition('-')
+                    start, end = int(first), min(int(last or len(CONTENT) - 1), len(CONTENT) - 1)
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{len(CONTENT)}')
+                self.send_header('Content-Length', str(end - start + 1))
+                self.end_headers()
+                pos = start
+                while pos <= end:
+                    block = CONTENT[pos:min(pos + 64 * 1024, end + 1)]
+                    with server.lock:
+                        if server.drop_after is not None and server.served >= server.drop_after:
+                            return    # Content-Length보다 적게 보내고 연결 종료
+                        server.served += len(block)
+                    try:
+                        self.wfile.write(block)
+                    except OSError:
+                        return
+                    pos += len(block)
+                    if server.delay:
+                        time.sleep(server.delay)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}/media.mp4'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class SegmentedBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = RangeServer()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'media.mp4.part')
+        self.backend = SegmentedHTTPBackend(retries=0)
+
+    def tearDown(self):
+        self.server.close()
+        self.tmpdir.cleanup()
+
+    def transfer(self, connections=4, on_progress=None, throttle=None):
+        return self.backend.transfer(self.server.url, {}, self.filename, connections,
+                                     on_progress or (lambda downloaded, total: None), CHUNK,
+                                     throttle=throttle)
+
+    def read_file(self):
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
+    def test_downloads_all_ranges(self):
+        result = self.transfer()
+        self.assertEqual(result, {'bytes': len(CONTENT), 'connections': 4})
+        self.assertEqual(self.read_file(), CONTENT)
+        self.assertFalse(os.path.exists(self.filename + SegmentedHTTPBackend.PROGRESS_SUFFIX))
+
+    def test_dropped_connection_is_network_error_and_resumes(self):
+        self.server.drop_after = len(CONTENT) // 2
+        with self.assertRaises(Exception) as ctx:
+            self.transfer()
+        # yt-dlp가 감싸는 형태 그대로 분류 확인
+        message = f"ERROR: unable to download video data: {ctx.exception}".lower()
+        self.assertTrue(any(kw in message for kw in NETWORK_ERROR_KEYWORDS), message)
+        self.assertTrue(os.path.exists(self.filename + SegmentedHTTPBackend.PROGRESS_SUFFIX))
+
+        with open(self.filename + SegmentedHTTPBackend.PROGRESS_SUFFIX) as f:
+            saved = json.load(f)
+        resumed = sum(pos - int(start) for start, pos in saved['ranges'].items())
+        self.assertGreater(resumed, 0)
+
+        # 첫 실행의 남은 응답이 끝난 뒤부터 집계
+        deadline = time.time() + 5
+        while self.server.active and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.active, 0)
+        self.server.served = 0
+        self.server.drop_after = None
+        self.transfer()
+        self.assertEqual(self.read_file(), CONTENT)
+        # 남은 바이트 + 크기 확인용 1바이트만 다시 받음
+        self.assertEqual(self.server.served, len(CONTENT) - resumed + 1)
+
+    def test_no_range_support_leaves_no_partial_file(self):
+        self.server.ignore_range = True
+        with self.assertRaises(TransferNotSupported):
+            self.transfer()
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_slow_progress_callback_does_not_block_other_segments(self):
+        self.server.delay = 0.005
+        during = {}
+
+        def on_progress(downloaded, total):
+            if not during:
+                during['before'] = self.server.served
+                time.sleep(0.5)
+                during['after'] = self.server.served
+
+        self.transfer(on_progress=on_progress)
+        self.assertEqual(self.read_file(), CONTENT)
+        self.assertGreater(during['after'], during['before'])
+
+    def test_throttle_is_called_per_segment_block(self):
+        seen = []
+        lock = threading.Lock()
+
+        def throttle(nbytes):
+            with lock:
+                seen.append((threading.current_thread().name, nbytes))
+
+        self.transfer(throttle=throttle)
+        self.assertEqual(sum(n for _, n in seen), len(CONTENT))
+        self.assertGreater(len({name for name, _ in seen}), 1)
+
+
+class BackendYoutubeDLTest(unittest.TestCase):
+    """_BackendYoutubeDL.dl against the installed yt-dlp"""
+
+    def setUp(self):
+        self.server = RangeServer()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'media.mp4')
+        self.finished = []
+
+    def tearDown(self):
+        self.server.close()
+        self.tmpdir.cleanup()
+
+    def download(self, **params):
+        def hook(d):
+            if d['status'] == 'finished':
+                self.finished.append(d)
+
+        ydl = downloader._BackendYoutubeDL({
+            'quiet': True, 'noprogress': True, 'progress_hooks': [hook],
+            'transfer_backend': SegmentedHTTPBackend(retries=0), 'concurrent_fragment_downloads': 4,
+            'http_chunk_size': CHUNK,
+            **params,
+        })
+        info = {'id': 'media', 'url': self.server.url, 'protocol': 'http', 'ext': 'mp4'}
+        self.assertTrue(ydl.dl(self.filename, info))
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_yt_dlp_still_has_the_internals_dl_relies_on(self):
+        # 실패하면 yt-dlp가 YoutubeDL.dl 내부를 바꾼 것 → _BackendYoutubeDL.dl과 requirements 상한 재검토
+        ydl = yt_dlp.YoutubeDL({'quiet': True})
+        for attr in downloader.YDL_INTERNALS:
+            self.assertTrue(hasattr(ydl, attr), attr)
+
+    def test_routes_http_formats_to_the_backend(self):
+        self.download()
+        self.assertEqual(self.finished[-1].get('connections'), 4)
+
+    def test_falls_back_to_native_without_the_internals(self):
+        with mock.patch.object(downloader, 'YDL_INTERNALS', downloader.YDL_INTERNALS + ('_missing',)):
+            self.download()
+        self.assertNotIn('connections', self.finished[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
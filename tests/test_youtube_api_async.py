@@ -0,0 +1,176 @@
+"""
+AsyncYouTubeAPIClient against a mock transport and a temporary cache DB
+
+Run from the repository root:
+
+    python -m pytest tests/test_youtube_api_async.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import youtube_api_async  # noqa: E402
+from services.api_cache import APIResponseCache  # noqa: E402
+from services.youtube_api_async import AsyncYouTubeAPIClient  # noqa: E402
+
+
+class CachedResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # TTL 0 → 매 요청마다 ETag 재검증
+        self.cache = APIResponseCache(os.path.join(self.tmpdir.name, 'cache.db'), ttls={})
+        self.requests = []
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={'ETag': '"v1"'}, json={'items': [{'id': 'UC1'}]})
+
+    def client(self) -> AsyncYouTubeAPIClient:
+        return AsyncYouTubeAPIClient('key', cache=self.cache, transport=httpx.MockTransport(self.handler))
+
+    def test_revalidated_response_is_not_parsed_again(self):
+        client = self.client()
+
+        async def run():
+            first = await client._get('channels', id='UC1')
+            with mock.patch.object(youtube_api_async.json, 'loads', side_effect=AssertionError('re-parsed')):
+                second = await client._get('channels', id='UC1')
+            await client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertIs(second, first)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1].headers['If-None-Match'], '"v1"')
+
+    def test_new_client_parses_stored_body_once(self):
+        asyncio.run(self._fetch_and_close(self.client()))
+        client = self.client()
+        loads = mock.Mock(side_effect=json.loads)
+
+        async def run():
+            with mock.patch.object(youtube_api_async.json, 'loads', loads):
+                a = await client._get('channels', id='UC1')
+                b = await client._get('channels', id='UC1')
+            await client.aclose()
+            return a, b
+
+        a, b = asyncio.run(run())
+        self.assertEqual(a, {'items': [{'id': 'UC1'}]})
+        self.assertIs(a, b)
+        self.assertEqual(loads.call_count, 1)
+
+    @staticmethod
+    async def _fetch_and_close(client):
+        await client._get('channels', id='UC1')
+        await client.aclose()
+
+
+def upload(n: int) -> dict:
+    return {'id': f'v{n}', 'title': f'Video {n}', 'publishedAt': f'2024-01-{n:02d}T00:00:00Z'}
+
+
+class IncrementalChannelTest(unittest.TestCase):
+    """Watermark stop, date fallback, merge and full refresh of get_channel_videos"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = APIResponseCache(os.path.join(self.tmpdir.name, 'cache.db'), ttls={})
+        self.uploads = [upload(n) for n in range(5, 0, -1)]   # 최신 순
+        self.pages = 0
+        # 페이지를 작게 해서 어디서 멈췄는지 확인
+        patcher = mock.patch.object(youtube_api_async, 'MAX_PAGE_SIZE', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        resource = request.url.path.rsplit('/', 1)[-1]
+        params = request.url.params
+        if resource == 'channels':
+            return httpx.Response(200, json={'items': [
+                {'contentDetails': {'relatedPlaylists': {'uploads': 'UU1'}}}
+            ]})
+        if resource == 'videos':
+            return httpx.Response(200, json={'items': [
+                {'id': vid, 'contentDetails': {'duration': 'PT1M'}} for vid in params['id'].split(',')
+            ]})
+        self.pages += 1
+        start = int(params.get('pageToken') or 0)
+        end = start + int(params['maxResults'])
+        body = {'items': [
+            {'snippet': {'resourceId': {'videoId': v['id']}, 'title': v['title'],
+                         'publishedAt': v['publishedAt']}}
+            for v in self.uploads[start:end]
+        ]}
+        if end < len(self.uploads):
+            body['nextPageToken'] = str(end)
+        return httpx.Response(200, json=body)
+
+    def channel_videos(self, max_results: int = 100) -> list:
+        client = AsyncYouTubeAPIClient('key', cache=self.cache, transport=httpx.MockTransport(self.handler))
+
+        async def run():
+            try:
+                return await client.get_channel_videos('UC1', max_results, incremental=True)
+            finally:
+                await client.aclose()
+
+        self.pages = 0
+        return [v['id'] for v in asyncio.run(run())]
+
+    def test_stops_at_known_newest_upload(self):
+        self.assertEqual(self.channel_videos(), ['v5', 'v4', 'v3', 'v2', 'v1'])
+        self.assertEqual(self.pages, 3)
+
+        self.uploads[:0] = [upload(7), upload(6)]
+        self.assertEqual(self.channel_videos(), ['v7', 'v6', 'v5', 'v4', 'v3', 'v2', 'v1'])
+        self.assertEqual(self.pages, 2)   # v7 v6 | v5 ← 워터마크에서 멈춤
+        self.assertEqual(self.cache.get_channel_uploads('UC1')['newest_id'], 'v7')
+
+    def test_falls_back_to_date_when_watermark_video_was_removed(self):
+        self.channel_videos()
+        self.uploads = [upload(6)] + [upload(n) for n in range(4, 0, -1)]   # v5 삭제됨
+        videos = self.channel_videos()
+        self.assertEqual(self.pages, 1)   # v6 v4 ← v5보다 오래된 v4에서 멈춤
+        self.assertEqual(videos[0], 'v6')
+        self.assertEqual(videos[-4:], ['v4', 'v3', 'v2', 'v1'])
+
+    def test_merges_and_truncates_to_max_results(self):
+        self.channel_videos()
+        self.uploads[:0] = [upload(7), upload(6)]
+        self.assertEqual(self.channel_videos(max_results=4), ['v7', 'v6', 'v5', 'v4'])
+        # 저장 목록은 잘리지 않음
+        self.assertEqual([v['id'] for v in self.cache.get_channel_uploads('UC1')['videos']],
+                         ['v7', 'v6', 'v5', 'v4', 'v3', 'v2', 'v1'])
+
+    def test_full_refresh_after_refresh_interval(self):
+        self.channel_videos()
+        known = self.cache.get_channel_uploads('UC1')
+        self.cache.put_channel_uploads('UC1', known['videos'], True, known['refreshed_at'] - 8 * 86400)
+        with mock.patch.object(youtube_api_async.Config, 'INCREMENTAL_FULL_REFRESH', 7 * 86400):
+            self.assertEqual(self.channel_videos(), ['v5', 'v4', 'v3', 'v2', 'v1'])
+        self.assertEqual(self.pages, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()